@@ -0,0 +1,86 @@
+"""
+Reusable MockMate crews.
+
+Building a MockInterviewCrew parses the YAML configs and creates every agent,
+and the old code did that on every call. Here each kind of crew (task plus
+interviewer agent) is built once and kept in a per-process pool. A crew is
+checked out for one kickoff at a time, since Crew and Task objects carry
+per-run state, and returned afterwards; the pool only grows under concurrent
+requests. Interview state lives in the session store, so pooled crews are
+stateless between turns.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+from crewai import Crew
+
+from crews.mock_mate.crew import MockInterviewCrew
+
+# Crew kind -> (agent method, task method) of MockInterviewCrew
+CREW_KINDS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("start_interview", "technical"): ("technical_interviewer", "start_interview_task"),
+    ("start_interview", "behavioral"): ("behavioral_interviewer", "start_interview_task"),
+    ("respond_to_answer", "technical"): ("technical_interviewer", "respond_to_answer_task"),
+    ("respond_to_answer", "behavioral"): ("behavioral_interviewer", "respond_to_answer_task"),
+    ("review_interview", "coach"): ("feedback_coach", "review_interview_task"),
+    ("prepare_custom_interview", "technical"): ("technical_interviewer", "prepare_custom_interview_task"),
+}
+
+
+class MockMateCrewPool:
+    """
+    Per-process pool of ready-built MockMate crews
+    """
+
+    def __init__(self, factory: Callable[[], MockInterviewCrew] = MockInterviewCrew):
+        self._factory = factory
+        self._idle: Dict[Tuple[str, str], List[Crew]] = {kind: [] for kind in CREW_KINDS}
+        self._lock = threading.Lock()
+        self._counters = {"built": 0, "reused": 0}
+
+    @contextmanager
+    def checkout(self, task_name: str, agent_kind: str):
+        """
+        Borrow a crew for one kickoff
+
+        Args:
+            task_name: start_interview, respond_to_answer, review_interview or prepare_custom_interview
+            agent_kind: technical, behavioral or coach
+
+        Yields:
+            A crew that runs only this task with the selected agent
+        """
+        kind = (task_name, agent_kind)
+        with self._lock:
+            crew = self._idle[kind].pop() if self._idle[kind] else None
+            self._counters["reused" if crew is not None else "built"] += 1
+        if crew is None:
+            crew = self._build(kind)
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                self._idle[kind].append(crew)
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many crews were built and how often one was reused"""
+        with self._lock:
+            return {**self._counters, "idle": sum(len(crews) for crews in self._idle.values())}
+
+    def _build(self, kind: Tuple[str, str]) -> Crew:
+        """Build a crew with only the agent and task of this kind"""
+        agent_method, task_method = CREW_KINDS[kind]
+        # A separate MockInterviewCrew per pooled crew, so no two crews share
+        # Task objects (CrewBase memoizes agents and tasks per instance)
+        mock_crew = self._factory()
+        return Crew(
+            agents=[getattr(mock_crew, agent_method)()],
+            tasks=[getattr(mock_crew, task_method)()],
+            verbose=True
+        )
+
+
+# Create a singleton instance
+crew_pool = MockMateCrewPool()
@@ -0,0 +1,113 @@
+"""
+Bounded interview history for MockMate prompts.
+
+Only the last MOCKMATE_HISTORY_WINDOW messages are sent verbatim. Older
+messages are folded into a rolling summary that is stored in the session
+metadata and updated incrementally, in batches of MOCKMATE_SUMMARY_BATCH
+messages, so the prompt stays roughly the same size however long the
+interview runs.
+"""
+
+import os
+import logging
+from typing import Any, Dict, List, Tuple
+
+import litellm
+
+from services.llm_cache import llm_cache
+from services.session_manager import get_session, set_session_metadata
+
+logger = logging.getLogger(__name__)
+
+HISTORY_WINDOW = int(os.getenv("MOCKMATE_HISTORY_WINDOW", "6"))
+SUMMARY_BATCH = int(os.getenv("MOCKMATE_SUMMARY_BATCH", "4"))
+SUMMARY_MAX_CHARS = int(os.getenv("MOCKMATE_SUMMARY_MAX_CHARS", "1500"))
+SUMMARY_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+
+# Session metadata keys
+SUMMARY_KEY = "history_summary"
+SUMMARIZED_COUNT_KEY = "history_summarized_count"
+
+
+def compact_history(session_id: str) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Get the rolling summary and the recent messages of an interview
+
+    Messages older than the window are folded into the summary once at least
+    SUMMARY_BATCH of them have accumulated, so the summary LLM call runs only
+    every few turns.
+
+    Args:
+        session_id: The interview session
+
+    Returns:
+        Tuple of (summary of older messages, recent messages verbatim)
+    """
+    session = get_session(session_id)
+    history = session.get("conversation_history", [])
+    metadata = session.get("metadata", {})
+    summary = metadata.get(SUMMARY_KEY, "")
+    summarized = min(metadata.get(SUMMARIZED_COUNT_KEY, 0), len(history))
+
+    foldable = len(history) - HISTORY_WINDOW - summarized
+    if foldable >= SUMMARY_BATCH:
+        fold_until = len(history) - HISTORY_WINDOW
+        summary = _update_summary(summary, history[summarized:fold_until], metadata)
+        summarized = fold_until
+        set_session_metadata(session_id, SUMMARY_KEY, summary)
+        set_session_metadata(session_id, SUMMARIZED_COUNT_KEY, summarized)
+
+    return summary, history[summarized:]
+
+
+def format_history(summary: str, recent: List[Dict[str, str]]) -> str:
+    """
+    Render the compacted history for the task prompt
+
+    Args:
+        summary: Summary of older messages
+        recent: Recent messages
+
+    Returns:
+        Prompt text
+    """
+    lines = []
+    if summary:
+        lines.append(f"Summary of the earlier interview: {summary}")
+        lines.append("")
+        lines.append("Most recent exchange:")
+    lines.extend(f"{message.get('role', 'user')}: {message.get('content', '')}" for message in recent)
+    return "\n".join(lines)
+
+
+def _update_summary(summary: str, messages: List[Dict[str, str]], metadata: Dict[str, Any]) -> str:
+    """Fold messages into the summary with the LLM; falls back to plain truncation"""
+    transcript = "\n".join(f"{m.get('role', 'user')}: {m.get('content', '')}" for m in messages)
+    prompt = (
+        f"You are keeping notes on a mock {metadata.get('interview_type', 'technical')} interview "
+        f"for a {metadata.get('job_title', 'candidate')} position.\n"
+        f"Current notes:\n{summary or '(none)'}\n\n"
+        f"New part of the interview:\n{transcript}\n\n"
+        f"Update the notes. Keep the questions asked, the key points of the candidate's answers "
+        f"and your assessment. Answer with the notes only, at most {SUMMARY_MAX_CHARS} characters."
+    )
+    messages_for_llm = [{"role": "user", "content": prompt}]
+    try:
+        content = llm_cache.get_or_compute(
+            f"ollama/{SUMMARY_MODEL}",
+            messages_for_llm,
+            lambda: litellm.completion(
+                model=f"ollama/{SUMMARY_MODEL}",
+                api_base=os.getenv("OLLAMA_BASE_URL", "http://ollama:11434"),
+                messages=messages_for_llm,
+                timeout=60
+            ).choices[0].message.content
+        )
+        if content:
+            return content.strip()[:SUMMARY_MAX_CHARS]
+    except Exception as e:
+        logger.warning(f"Summarizing the interview history failed: {str(e)}")
+
+    # Without the LLM keep the most recent part of the plain transcript
+    combined = f"{summary}\n{transcript}".strip()
+    return combined[-SUMMARY_MAX_CHARS:]
@@ -0,0 +1,119 @@
+"""
+Token streaming for MockMate interview turns.
+
+A crew kickoff only returns the finished answer, so the streaming variant
+renders the same agent and task prompts from the MockMate YAML configs and
+streams the completion from Ollama directly. The full message is written to
+the session history once the stream ends.
+"""
+
+import os
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List
+
+import yaml
+import litellm
+
+from crews.mock_mate.history import compact_history, format_history
+from services.dispatch import dispatcher
+from services.session_manager import add_message_to_history, get_session_metadata
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "config")
+MODEL = "ollama/llama3.2"
+
+
+@lru_cache(maxsize=None)
+def _load_config(name: str) -> Dict[str, Any]:
+    """Read agents.yaml or tasks.yaml once per process"""
+    with open(os.path.join(CONFIG_DIR, name), "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _render(template: str, inputs: Dict[str, Any]) -> str:
+    """Fill {name} and {{name}} placeholders like the crew does"""
+    for key, value in inputs.items():
+        template = template.replace(f"{{{{{key}}}}}", str(value)).replace(f"{{{key}}}", str(value))
+    return template
+
+
+def build_respond_messages(user_response: str, session_id: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for one respond_to_answer turn
+
+    Args:
+        user_response: The candidate's answer
+        session_id: The interview session
+
+    Returns:
+        System and user messages for the completion
+    """
+    summary, recent = compact_history(session_id)
+    metadata = get_session_metadata(session_id)
+    interview_type = metadata.get("interview_type", "Technical") or "Technical"
+    agent_name = "technical_interviewer" if interview_type.lower() == "technical" else "behavioral_interviewer"
+
+    agent = _load_config("agents.yaml")[agent_name]
+    task = _load_config("tasks.yaml")["respond_to_answer"]
+    inputs = {
+        "interview_history": format_history(summary, recent),
+        "user_response": user_response,
+        "job_title": metadata.get("job_title"),
+        "current_phase": metadata.get("current_phase", "technical_assessment")
+    }
+
+    system_prompt = (
+        f"{agent['role'].strip()}\n\nYour goal: {agent['goal'].strip()}\n\n"
+        f"{agent['backstory'].strip()}\n\n{agent.get('instructions', '').strip()}"
+    )
+    user_prompt = (
+        f"{_render(task['description'], inputs).strip()}\n\n"
+        f"Expected output:\n{task['expected_output'].strip()}"
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+async def stream_respond_to_answer(user_response: str, session_id: str) -> AsyncIterator[str]:
+    """
+    Stream the interviewer's next message token by token
+
+    The candidate's answer is added to the history before the prompt is built,
+    and the full reply after the stream has finished.
+
+    Args:
+        user_response: The candidate's answer
+        session_id: The interview session
+
+    Yields:
+        Text chunks as Ollama produces them
+    """
+    # Session writes go to MongoDB with SESSION_STORE=mongo, keep them off the event loop too
+    await dispatcher.run("io", add_message_to_history, session_id, "user", user_response)
+    # May run a summary LLM call, keep it off the event loop
+    messages = await dispatcher.run("llm", build_respond_messages, user_response, session_id)
+
+    chunks: List[str] = []
+    try:
+        stream = await litellm.acompletion(
+            model=MODEL,
+            api_base=os.getenv("OLLAMA_BASE_URL", "http://ollama:11434"),
+            messages=messages,
+            stream=True,
+            timeout=120
+        )
+        async for chunk in stream:
+            token = chunk.choices[0].delta.content
+            if token:
+                chunks.append(token)
+                yield token
+    finally:
+        # Also keep a partial answer if the client disconnected mid-stream;
+        # shielded so the write still runs when the stream was cancelled
+        if chunks:
+            await asyncio.shield(dispatcher.run("io", add_message_to_history, session_id, "assistant", "".join(chunks)))
@@ -0,0 +1,199 @@
+"""
+HTTP client for the Adzuna job search API.
+
+All requests go through one pooled requests.Session, so connections to
+api.adzuna.com are kept alive instead of doing a TCP and TLS handshake per
+call. Searches over several query variants and result pages are fanned out
+on a small thread pool and the jobs are yielded as the pages arrive, so a
+pool of a few hundred jobs costs roughly one round trip of wall time.
+Full result pages are cached in the shared job search cache.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.job_search_cache import job_search_cache
+
+API_URL = "https://api.adzuna.com/v1/api/jobs/{location}/search/{page}"
+# Adzuna returns at most 100 results per page
+PAGE_SIZE = 100
+
+
+class AdzunaClient:
+    """
+    Pooled, concurrent access to the Adzuna search endpoint
+    """
+
+    def __init__(self):
+        """
+        Initialize the client. The session and thread pool are created on first use.
+        """
+        self.pool_size = int(os.getenv("ADZUNA_POOL_SIZE", "10"))
+        self.fetch_workers = int(os.getenv("ADZUNA_FETCH_WORKERS", "8"))
+        self.max_pages = int(os.getenv("ADZUNA_MAX_PAGES", "3"))
+        self.timeout = float(os.getenv("ADZUNA_TIMEOUT", "10"))
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session with a connection pool and retries on 429/5xx"""
+        with self._lock:
+            if self._session is None:
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET",)
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.headers.update({"Accept": "application/json"})
+                self._session = session
+            return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="adzuna")
+            return self._executor
+
+    def pages_for(self, num_results: int, queries: int = 1) -> int:
+        """
+        Number of pages to request per query for a candidate pool
+
+        Args:
+            num_results: Size of the candidate pool
+            queries: Number of query variants sharing the pool
+
+        Returns:
+            Pages per query, between 1 and ADZUNA_MAX_PAGES
+        """
+        per_query = -(-num_results // max(1, queries))
+        return max(1, min(self.max_pages, -(-per_query // PAGE_SIZE)))
+
+    def fetch_page(self, query: str, location: str = "de", page: int = 1,
+                   results_per_page: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Fetch one result page
+
+        Args:
+            query: Search query (job title and keywords)
+            location: Adzuna country code
+            page: Page number, starting at 1
+            results_per_page: Results on the page, at most 100
+
+        Returns:
+            The raw Adzuna results of the page; empty on errors
+        """
+        app_id = os.environ.get("ADZUNA_APP_ID")
+        api_key = os.environ.get("ADZUNA_API_KEY")
+        if not app_id or not api_key:
+            print("Error: Adzuna API credentials not found in environment variables")
+            print("Please set ADZUNA_APP_ID and ADZUNA_API_KEY environment variables")
+            return []
+
+        params = {
+            "app_id": app_id,
+            "app_key": api_key,
+            "results_per_page": min(results_per_page, PAGE_SIZE),
+            "what": query,
+            "content-type": "application/json"
+        }
+        try:
+            response = self.session.get(API_URL.format(location=location, page=page), params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Error in Adzuna request for '{query}' (page {page}): {e}")
+            return []
+
+        if response.status_code != 200:
+            print(f"Error: Adzuna API returned status code {response.status_code} for '{query}' (page {page})")
+            print(f"Response: {response.text[:500]}")
+            return []
+
+        data = response.json()
+        print(f"Adzuna '{query}' page {page}: count={len(data.get('results', []))}, total={data.get('count', 0)}")
+        return data.get("results", [])
+
+    def search_page(self, query: str, location: str = "de", page: int = 1) -> List[Dict[str, Any]]:
+        """
+        Fetch one full result page through the shared cache
+
+        Args:
+            query: Search query (job title and keywords)
+            location: Adzuna country code
+            page: Page number, starting at 1
+
+        Returns:
+            The raw Adzuna results of the page
+        """
+        # Equivalent queries share a cache entry, so also send the normalized form
+        query = job_search_cache.normalize_query(query)
+        return job_search_cache.get_or_fetch(query, location, page, lambda: self.fetch_page(query, location, page))
+
+    def refresh_page(self, query: str, location: str = "de", page: int = 1) -> List[Dict[str, Any]]:
+        """
+        Fetch one full result page, bypassing but updating the shared cache
+
+        Args:
+            query: Search query (job title and keywords)
+            location: Adzuna country code
+            page: Page number, starting at 1
+
+        Returns:
+            The raw Adzuna results of the page
+        """
+        query = job_search_cache.normalize_query(query)
+        results = self.fetch_page(query, location, page)
+        if results:
+            job_search_cache.set(job_search_cache.make_key(query, location, page), results)
+        return results
+
+    def iter_results(self, pages: Iterable[Tuple[str, str, int]]) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch several pages concurrently and yield results as they arrive
+
+        Pages that have not started yet are cancelled when the caller stops
+        iterating early.
+
+        Args:
+            pages: (query, location, page) tuples
+
+        Yields:
+            Raw Adzuna results in arrival order
+        """
+        futures = [self.executor.submit(self.search_page, *page) for page in pages]
+        try:
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"Error in Adzuna job search: {e}")
+                    continue
+                yield from results
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the fetch threads"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Create a singleton instance
+adzuna_client = AdzunaClient()
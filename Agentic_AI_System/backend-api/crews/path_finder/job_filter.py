@@ -6,12 +6,16 @@ using Ollama for semantic matching.
 """
 
 import os
+import re
 import json
+import time
 import requests
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Callable, Tuple
 import logging
 
 from services.mongodb.global_state_service import global_state
+from services.llm_cache import llm_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +31,11 @@ class JobFilterAgent:
         """Initialize the JobFilterAgent"""
         self.ollama_url = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
         self.model = os.getenv("OLLAMA_MODEL", "llama3.2")
+        # Scoring mode and limits for the parallel Ollama fan-out
+        self.scoring_mode = os.getenv("JOB_FILTER_MODE", "concurrent")
+        self.max_concurrency = int(os.getenv("JOB_FILTER_CONCURRENCY", "8"))
+        self.deadline = float(os.getenv("JOB_FILTER_DEADLINE", "30"))
+        self.batch_size = int(os.getenv("JOB_FILTER_BATCH_SIZE", "5"))
         logger.info(f"JobFilterAgent initialized with Ollama URL: {self.ollama_url}, Model: {self.model}")
     
     def get_resume_data(self, user_id: str = "default_user") -> Dict[str, Any]:
@@ -39,14 +48,14 @@ class JobFilterAgent:
         Returns:
             The resume data or None if not found
         """
-        state = global_state.get_state(user_id)
-        resume_id = state.get("agent_knowledge", {}).get("resume", {}).get("current_resume_id")
+        # Projected reads: only the current resume, not every stored resume
+        resume_id = global_state.get_field("agent_knowledge.resume.current_resume_id", user_id)
         
         if not resume_id:
             logger.warning(f"No resume found for user {user_id}")
             return None
             
-        resume_data = state.get("agent_knowledge", {}).get("resume", {}).get("resumes", {}).get(resume_id)
+        resume_data = global_state.get_field(f"agent_knowledge.resume.resumes.{resume_id}", user_id)
         
         if not resume_data:
             logger.warning(f"Resume data not found for ID {resume_id}")
@@ -54,7 +63,8 @@ class JobFilterAgent:
             
         return resume_data
     
-    def filter_jobs(self, jobs: List[Dict[str, Any]], user_id: str = "default_user", top_n: int = 10) -> List[Dict[str, Any]]:
+    def filter_jobs(self, jobs: List[Dict[str, Any]], user_id: str = "default_user", top_n: int = 10,
+                    scoring_mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Filter job listings based on resume data using Ollama
         
@@ -62,6 +72,7 @@ class JobFilterAgent:
             jobs: List of job listings to filter
             user_id: The user ID to get resume data for
             top_n: Number of top jobs to return
+            scoring_mode: "sequential", "concurrent" or "batched" (defaults to JOB_FILTER_MODE)
             
         Returns:
             List of top N job listings filtered by relevance to resume
@@ -77,13 +88,42 @@ class JobFilterAgent:
             logger.warning("No resume data found, returning unfiltered jobs")
             return jobs[:top_n]
             
+        base_prompt = self._build_base_prompt(resume_data)
+        mode = scoring_mode or self.scoring_mode
+        
+        if mode == "batched":
+            self._score_jobs_batched(jobs, resume_data)
+        elif mode == "concurrent":
+            self._score_jobs_concurrently(jobs, base_prompt)
+        else:
+            for job in jobs:
+                score = self._score_job(base_prompt + self._build_job_description(job), timeout=30)
+                job["resume_match_score"] = score if score is not None else job.get("match_score", 0)
+        
+        filtered_jobs = list(jobs)
+        
+        # Sort by resume match score (descending)
+        filtered_jobs.sort(key=lambda x: x.get("resume_match_score", 0), reverse=True)
+        
+        # Return top N jobs
+        return filtered_jobs[:top_n]
+    
+    def _build_resume_context(self, resume_data: Dict[str, Any]) -> str:
+        """
+        Build the resume description that every scoring prompt starts with
+        
+        Args:
+            resume_data: The parsed resume data
+            
+        Returns:
+            The prompt prefix describing the resume
+        """
         # Extract key information from resume
         skills = resume_data.get("sections", {}).get("skills", "")
         experience = resume_data.get("sections", {}).get("experience", "")
         profile = resume_data.get("sections", {}).get("profile", "")
         
-        # Create a prompt for Ollama to evaluate each job
-        base_prompt = f"""
+        return f"""
         I have a resume with the following information:
         
         Skills: {skills}
@@ -91,70 +131,285 @@ class JobFilterAgent:
         Experience: {experience}
         
         Profile: {profile}
+        """
+    
+    def _build_base_prompt(self, resume_data: Dict[str, Any]) -> str:
+        """
+        Build the single-job scoring prompt prefix (resume context plus instructions)
         
+        Args:
+            resume_data: The parsed resume data
+            
+        Returns:
+            The prompt prefix; the job description is appended to it
+        """
+        # Create a prompt for Ollama to evaluate each job
+        return self._build_resume_context(resume_data) + """
         I need to evaluate how well the following job matches my resume.
         Rate the match on a scale from 0 to 100, where 100 is a perfect match.
         Only return the numeric score, nothing else.
         
         Job: 
         """
+    
+    def _build_batch_prompt(self, resume_context: str, batch: List[Dict[str, Any]]) -> str:
+        """
+        Build one prompt that scores several jobs against the resume at once
         
-        filtered_jobs = []
+        Args:
+            resume_context: The resume description from _build_resume_context
+            batch: The jobs to score; their position in the batch is used as id
+            
+        Returns:
+            The batch scoring prompt
+        """
+        job_blocks = "".join(
+            f"\n        Job {i}:{self._build_job_description(job)}" for i, job in enumerate(batch)
+        )
+        return resume_context + f"""
+        I need to evaluate how well each of the following {len(batch)} jobs matches my resume.
+        Rate every job on a scale from 0 to 100, where 100 is a perfect match.
+        {job_blocks}
         
-        for job in jobs:
-            # Create job description
-            job_desc = f"""
+        Respond only with JSON in this format, with one entry per job:
+        {{"scores": [{{"id": 0, "score": 75}}, {{"id": 1, "score": 40}}]}}
+        """
+    
+    def _build_job_description(self, job: Dict[str, Any]) -> str:
+        """Format a single job listing for the scoring prompt"""
+        return f"""
             Title: {job.get('title', '')}
             Company: {job.get('company_name', '')}
             Description: {job.get('description', '')}
             Requirements: {job.get('requirements', '')}
             """
+    
+    def _generate(self, prompt: str, timeout: float, json_format: bool = False) -> Optional[str]:
+        """
+        Send a prompt to the Ollama generate endpoint, answering from the
+        shared LLM cache when the same prompt was scored before
+        
+        Args:
+            prompt: The prompt to send
+            timeout: Request timeout in seconds
+            json_format: Ask Ollama to constrain the output to valid JSON
             
-            # Create full prompt
-            prompt = base_prompt + job_desc
-            
+        Returns:
+            The response text, or None if the call failed
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False
+        }
+        if json_format:
+            payload["format"] = "json"
+        
+        def call_ollama() -> Optional[str]:
             try:
                 # Call Ollama API
                 response = requests.post(
                     f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=30
+                    json=payload,
+                    timeout=timeout
                 )
                 
                 if response.status_code != 200:
                     logger.error(f"Ollama API error: {response.status_code}, {response.text}")
-                    # Add default score if API call fails
-                    job["resume_match_score"] = job.get("match_score", 0)
-                else:
-                    # Extract score from response
-                    result = response.json()
-                    response_text = result.get("response", "0").strip()
-                    
-                    # Try to parse the score
-                    try:
-                        # Extract just the number from the response
-                        score_text = ''.join(c for c in response_text if c.isdigit() or c == '.')
-                        score = float(score_text) if score_text else 0
-                        job["resume_match_score"] = min(max(score, 0), 100)  # Clamp between 0-100
-                    except ValueError:
-                        logger.warning(f"Failed to parse score from Ollama response: {response_text}")
-                        job["resume_match_score"] = job.get("match_score", 0)
+                    return None
+                
+                return response.json().get("response", "").strip()
             
             except Exception as e:
                 logger.error(f"Error calling Ollama API: {str(e)}")
-                job["resume_match_score"] = job.get("match_score", 0)
+                return None
+        
+        return llm_cache.get_or_compute(f"ollama/{self.model}", prompt, call_ollama,
+                                        format=payload.get("format"))
+    
+    def _score_job(self, prompt: str, timeout: float) -> Optional[float]:
+        """
+        Ask Ollama to score a single job prompt
+        
+        Args:
+            prompt: The full scoring prompt (resume preamble plus job)
+            timeout: Request timeout in seconds
             
-            filtered_jobs.append(job)
+        Returns:
+            The score clamped to 0-100, or None if the call or parsing failed
+        """
+        response_text = self._generate(prompt, timeout)
+        if response_text is None:
+            return None
         
-        # Sort by resume match score (descending)
-        filtered_jobs.sort(key=lambda x: x.get("resume_match_score", 0), reverse=True)
+        # Try to parse the score
+        try:
+            # Extract just the number from the response
+            score_text = ''.join(c for c in response_text if c.isdigit() or c == '.')
+            score = float(score_text) if score_text else 0
+            return min(max(score, 0), 100)  # Clamp between 0-100
+        except ValueError:
+            logger.warning(f"Failed to parse score from Ollama response: {response_text}")
+            return None
+    
+    def _parse_batch_scores(self, response_text: str, batch_size: int) -> Optional[Dict[int, float]]:
+        """
+        Parse the {id, score} array returned for a batch prompt
         
-        # Return top N jobs
-        return filtered_jobs[:top_n]
+        Args:
+            response_text: Raw Ollama response
+            batch_size: Number of jobs in the batch
+            
+        Returns:
+            Mapping of batch index to clamped score, or None if the output
+            is not valid JSON or does not cover every job in the batch
+        """
+        try:
+            data = json.loads(response_text)
+        except (TypeError, json.JSONDecodeError):
+            # Models sometimes wrap the JSON in prose, try the outermost object/array
+            match = re.search(r'\{[\s\S]*\}|\[[\s\S]*\]', response_text or "")
+            if not match:
+                return None
+            try:
+                data = json.loads(match.group(0))
+            except json.JSONDecodeError:
+                return None
+        
+        entries = data.get("scores") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return None
+        
+        scores = {}
+        for entry in entries:
+            try:
+                job_index = int(entry["id"])
+                score = float(entry["score"])
+            except (TypeError, KeyError, ValueError):
+                continue
+            if 0 <= job_index < batch_size:
+                scores[job_index] = min(max(score, 0), 100)
+        
+        if len(scores) != batch_size:
+            return None
+        return scores
+    
+    def _score_batch(self, resume_context: str, base_prompt: str,
+                     batch: List[Dict[str, Any]], ends_at: float) -> List[Optional[float]]:
+        """
+        Score a batch of jobs with one prompt, falling back to per-job prompts
+        when the batch output cannot be parsed
+        
+        All calls share the time left until ends_at, so the fallback never
+        keeps sending Ollama requests after the deadline. If the batch call
+        itself failed or timed out, there is no fallback.
+        
+        Args:
+            resume_context: The resume description from _build_resume_context
+            base_prompt: The single-job prompt prefix used for the fallback
+            batch: The jobs to score
+            ends_at: time.monotonic() value of the overall deadline
+            
+        Returns:
+            One score (or None on failure) per job in the batch
+        """
+        response_text = self._generate(self._build_batch_prompt(resume_context, batch),
+                                       max(ends_at - time.monotonic(), 0.1), json_format=True)
+        if response_text is None:
+            return [None] * len(batch)
+        
+        scores = self._parse_batch_scores(response_text, len(batch))
+        if scores is not None:
+            return [scores[i] for i in range(len(batch))]
+        
+        logger.warning(f"Could not parse batch scores for {len(batch)} jobs, falling back to per-job scoring")
+        results = []
+        for job in batch:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                results.append(None)
+                continue
+            results.append(self._score_job(base_prompt + self._build_job_description(job), remaining))
+        return results
+    
+    def _run_with_deadline(self, calls: List[Tuple[Callable, tuple]]) -> Dict[int, Any]:
+        """
+        Run calls on a thread pool capped at max_concurrency and wait at most
+        deadline seconds for them.
+        
+        Args:
+            calls: (function, args) pairs to execute
+            
+        Returns:
+            Mapping of call index to result for the calls that finished in time
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_concurrency),
+                                      thread_name_prefix="job-filter")
+        futures = {executor.submit(fn, *args): i for i, (fn, args) in enumerate(calls)}
+        
+        done, not_done = wait(futures, timeout=self.deadline)
+        
+        if not_done:
+            logger.warning(f"{len(not_done)} of {len(calls)} Ollama calls missed the {self.deadline}s deadline, "
+                           f"using heuristic match_score")
+        
+        # Don't block on stragglers; queued calls are dropped, running ones time out on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        return {futures[future]: future.result() for future in done}
+    
+    def _score_jobs_concurrently(self, jobs: List[Dict[str, Any]], base_prompt: str) -> None:
+        """
+        Score jobs with parallel Ollama calls, bounded by max_concurrency and deadline.
+        
+        Every job gets a "resume_match_score". Jobs whose call fails or does not
+        finish before the deadline keep their heuristic "match_score" instead.
+        
+        Args:
+            jobs: List of job listings to score (updated in place)
+            base_prompt: The shared resume preamble
+        """
+        # Pre-fill the fallback so jobs that miss the deadline are still ranked
+        for job in jobs:
+            job["resume_match_score"] = job.get("match_score", 0)
+        
+        results = self._run_with_deadline([
+            (self._score_job, (base_prompt + self._build_job_description(job), self.deadline))
+            for job in jobs
+        ])
+        
+        for i, score in results.items():
+            if score is not None:
+                jobs[i]["resume_match_score"] = score
+    
+    def _score_jobs_batched(self, jobs: List[Dict[str, Any]], resume_data: Dict[str, Any]) -> None:
+        """
+        Score jobs batch_size at a time, stating the resume context once per prompt.
+        
+        Batches run in parallel under the same concurrency cap and deadline as
+        the concurrent mode. Jobs that cannot be scored keep their "match_score".
+        
+        Args:
+            jobs: List of job listings to score (updated in place)
+            resume_data: The parsed resume data
+        """
+        for job in jobs:
+            job["resume_match_score"] = job.get("match_score", 0)
+        
+        resume_context = self._build_resume_context(resume_data)
+        base_prompt = self._build_base_prompt(resume_data)
+        batch_size = max(1, self.batch_size)
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+        
+        ends_at = time.monotonic() + self.deadline
+        results = self._run_with_deadline([
+            (self._score_batch, (resume_context, base_prompt, batch, ends_at)) for batch in batches
+        ])
+        
+        for batch_index, scores in results.items():
+            for job, score in zip(batches[batch_index], scores):
+                if score is not None:
+                    job["resume_match_score"] = score
 
 # Create a singleton instance
 job_filter = JobFilterAgent()
@@ -4,11 +4,14 @@ import random
 import string
 import re
 import time
+import threading
 import requests
+import numpy as np
 from bs4 import BeautifulSoup
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Bestimme den Pfad zur .env-Datei (im Hauptverzeichnis des Projekts)
 base_dir = Path(__file__).parent.parent.parent
@@ -24,11 +27,111 @@ api_key = os.environ.get("ADZUNA_API_KEY")
 print(f"ADZUNA_APP_ID loaded: {'Yes' if app_id else 'No'}")
 print(f"ADZUNA_API_KEY loaded: {'Yes' if api_key else 'No'}")
 
+# Imported after load_dotenv, the client reads its ADZUNA_* settings on creation
+from crews.path_finder.adzuna_client import adzuna_client
+from services.job_search_cache import job_search_cache
+from services.job_catalog import job_catalog
+
+# Number of unique jobs fetched per search before scoring
+CANDIDATE_POOL = int(os.getenv("ADZUNA_CANDIDATE_POOL", "300"))
+# Catalog matches needed to answer a search without calling Adzuna
+CATALOG_MIN_RESULTS = int(os.getenv("JOB_CATALOG_MIN_RESULTS", "100"))
+
+# Background refreshes of searches answered from an outdated catalog
+_catalog_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-catalog-refresh")
+_refreshing_queries = set()
+_refreshing_lock = threading.Lock()
+
 # Helper functions for job scraping
+def _presence(terms: List[str], texts: np.ndarray, contains: Callable[[str], List[bool]]) -> np.ndarray:
+    """Term x job matrix, True where the term occurs as a substring of the job's text
+    
+    NumPy strings drop trailing \x00 characters, so terms containing \x00
+    are checked with contains(term) on the original strings instead.
+    """
+    if not terms or texts.size == 0:
+        return np.zeros((len(terms), texts.size), dtype=bool)
+    return np.stack([
+        np.array(contains(term), dtype=bool) if "\x00" in term else np.char.find(texts, term) >= 0
+        for term in terms
+    ])
+
+def score_jobs(jobs: List[Dict[str, Any]], job_title: str, education_level: str,
+               years_experience: int, interest_points: List[str]) -> np.ndarray:
+    """Calculate the match scores of a whole candidate pool in one pass
+    
+    Every job's fields are lowercased once into arrays, and the title words
+    and interest points are matched against all jobs at once as term x job
+    presence matrices. calculate_match_score is the single-job form.
+    
+    Args:
+        jobs: Job listing dictionaries
+        job_title: The job title from search criteria
+        education_level: Education level from search criteria
+        years_experience: Years of experience from search criteria
+        interest_points: List of interest points from search criteria
+        
+    Returns:
+        Array with a score between 0 and 100 per job
+    """
+    if not jobs:
+        return np.zeros(0)
+
+    title_list = [job.get("title", "").lower() for job in jobs]
+    education_list = [(job.get("education_required") or "").lower() for job in jobs]
+    description_list = [job.get("description", "").lower() for job in jobs]
+    skill_lists = [[skill.lower() for skill in job.get("skills", [])] for job in jobs]
+    titles = np.array(title_list)
+    educations = np.array(education_list)
+    descriptions = np.array(description_list)
+    # Terms without \x00 cannot match across two skills
+    skills = np.array(["\x00".join(job_skills) for job_skills in skill_lists])
+
+    def in_texts(texts: List[str]) -> Callable[[str], List[bool]]:
+        return lambda term: [term in text for text in texts]
+
+    def in_skills(term: str) -> List[bool]:
+        return [any(term in skill for skill in job_skills) for job_skills in skill_lists]
+
+    # Title match (max 30 points)
+    job_title = job_title.lower()
+    full_title = _presence([job_title], titles, in_texts(title_list))[0]
+    title_word = _presence(job_title.split(), titles, in_texts(title_list)).any(axis=0)
+    scores = np.where(full_title, 30.0, np.where(title_word, 15.0, 0.0))
+
+    # Experience match (max 20 points); non-numeric requirements score nothing
+    required = [job.get("experience_required", 0) for job in jobs]
+    numeric = np.array([isinstance(value, (int, float)) for value in required], dtype=bool)
+    experience = np.array([value if is_numeric else 0 for value, is_numeric in zip(required, numeric)], dtype=float)
+    exp_diff = np.abs(experience - years_experience)
+    # A NaN difference fails every comparison and scores 5 points, like in the per-job rules
+    scores += np.where(numeric, np.select(
+        [exp_diff == 0, exp_diff <= 2, exp_diff <= 4],
+        [20.0, 15.0, 10.0],
+        default=5.0
+    ), 0.0)
+
+    # Education match (max 15 points)
+    scores += np.where(_presence([education_level.lower()], educations, in_texts(education_list))[0], 15.0, 0.0)
+
+    # Interest points match (max 35 points)
+    if interest_points:
+        points = [point.lower() for point in interest_points]
+        points_per_interest = 35.0 / len(interest_points)
+        matched = _presence(points, descriptions, in_texts(description_list)) | _presence(points, skills, in_skills)
+        # Add point by point, which keeps the float sums of the per-point rules
+        for row in matched:
+            scores += np.where(row, points_per_interest, 0.0)
+
+    # Normalize score to be between 0 and 100
+    return np.minimum(scores, 100.0)
+
 def calculate_match_score(job: Dict[str, Any], job_title: str, education_level: str, 
                          years_experience: int, interest_points: List[str]) -> float:
     """Calculate a match score for a job based on search criteria
     
+    Use score_jobs to score many jobs at once.
+    
     Args:
         job: Job listing dictionary
         job_title: The job title from search criteria
@@ -39,45 +142,142 @@ def calculate_match_score(job: Dict[str, Any], job_title: str, education_level:
     Returns:
         A score between 0 and 100 indicating how well the job matches the criteria
     """
-    score = 0.0
-    max_score = 100.0
+    return float(score_jobs([job], job_title, education_level, years_experience, interest_points)[0])
+
+def _normalize_adzuna_job(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one raw Adzuna result into our standardized job object"""
+    # Extract job details
+    job_id = job_data.get("id", "")
+    title = job_data.get("title", "")
+    company = job_data.get("company", {}).get("display_name", "Unbekanntes Unternehmen")
+    description = job_data.get("description", "")
+    location = job_data.get("location", {}).get("display_name", "")
+
+    # Extract salary if available
+    salary_min = job_data.get("salary_min", 0)
+    salary_max = job_data.get("salary_max", 0)
+    salary = ""
+    if salary_min > 0 and salary_max > 0:
+        salary = f"€{int(salary_min // 1000)}K - €{int(salary_max // 1000)}K"
+
+    # Extract application link
+    application_link = job_data.get("redirect_url", "")
+
+    # Create standardized job object
+    job = {
+        "id": job_id,
+        "title": title,
+        "company_name": company,
+        "location": location,
+        "description": description,
+        "requirements": "",  # Adzuna doesn't provide structured requirements
+        "salary": salary,
+        "application_link": application_link,
+        "experience_required": 0,  # Not provided by Adzuna
+        "education_required": "",  # Not provided by Adzuna
+        "distance": 0,  # Not provided by Adzuna
+        "source": "Adzuna",
+        "skills": []  # Not provided by Adzuna
+    }
+
+    # Try to extract experience and education from description
+    if "erfahrung" in description.lower():
+        # Look for patterns like "3 Jahre Erfahrung" or "3+ Jahre Erfahrung"
+        exp_match = re.search(r'(\d+)(?:\+)?\s*(?:jahre|jahr)\s*erfahrung', description.lower())
+        if exp_match:
+            job["experience_required"] = int(exp_match.group(1))
+
+    if any(edu in description.lower() for edu in ["bachelor", "master", "diplom", "ausbildung", "studium"]):
+        for edu in ["bachelor", "master", "diplom", "ausbildung", "studium"]:
+            if edu in description.lower():
+                job["education_required"] = edu.capitalize()
+                break
+
+    # Try to extract skills from description
+    common_skills = ["python", "java", "javascript", "react", "angular", "vue", "node", "sql", 
+                    "aws", "azure", "docker", "kubernetes", "git", "agile", "scrum"]
+    job["skills"] = [skill for skill in common_skills if skill in description.lower()]
+
+    return job
+
+def collect_adzuna_jobs(queries: List[str], location: str = "de", num_results: int = 100) -> List[Dict[str, Any]]:
+    """Fetch several queries and result pages from Adzuna concurrently
     
-    # Title match (max 30 points)
-    if job_title.lower() in job.get("title", "").lower():
-        score += 30.0
-    elif any(word.lower() in job.get("title", "").lower() for word in job_title.lower().split()):
-        score += 15.0
+    All pages are requested at once over the pooled session, or served from
+    the shared job search cache. Results are deduplicated by job ID as they
+    arrive, and fetching stops once num_results unique jobs have been
+    collected.
     
-    # Experience match (max 20 points)
-    job_exp = job.get("experience_required", 0)
-    if isinstance(job_exp, (int, float)):
-        exp_diff = abs(job_exp - years_experience)
-        if exp_diff == 0:
-            score += 20.0
-        elif exp_diff <= 2:
-            score += 15.0
-        elif exp_diff <= 4:
-            score += 10.0
-        else:
-            score += 5.0
+    Args:
+        queries: Query variants (job title and keywords)
+        location: Location to search in (default: de for Germany)
+        num_results: Maximum number of unique jobs to return
+        
+    Returns:
+        List of job listings
+    """
+    # Queries with the same keywords share one cached page
+    queries = [query for query in dict.fromkeys(job_search_cache.normalize_query(q) for q in queries) if query]
+    if not queries or num_results <= 0:
+        return []
+
+    pages = adzuna_client.pages_for(num_results, len(queries))
+    # Page 1 of every query first, so the first results cover all variants
+    fetches = [(query, location, page) for page in range(1, pages + 1) for query in queries]
+    print(f"Fetching {len(fetches)} Adzuna pages for {len(queries)} queries in {location}")
+
+    jobs = []
+    seen_ids = set()
+    results = adzuna_client.iter_results(fetches)
+    try:
+        for job_data in results:
+            job_id = job_data.get("id", "")
+            if job_id and job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
+            jobs.append(_normalize_adzuna_job(job_data))
+            if len(jobs) >= num_results:
+                break
+    finally:
+        # Cancels the pages that have not been fetched yet
+        results.close()
     
-    # Education match (max 15 points)
-    job_edu = job.get("education_required", "").lower()
-    if education_level.lower() in job_edu:
-        score += 15.0
+    # Keep everything we fetched searchable in the local catalog
+    job_catalog.add_jobs(jobs, location)
+    return jobs
+
+def refresh_adzuna_pages(fetches: List[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+    """Fetch result pages from Adzuna, whether or not they are cached
     
-    # Interest points match (max 35 points)
-    if interest_points:
-        points_per_interest = 35.0 / len(interest_points)
-        for point in interest_points:
-            # Check if interest point is in job description or skills
-            if point.lower() in job.get("description", "").lower():
-                score += points_per_interest
-            elif any(point.lower() in skill.lower() for skill in job.get("skills", [])):
-                score += points_per_interest
+    Every page is fetched exactly once and stored in the shared job search
+    cache, and its jobs are added to the local catalog. Used by the job
+    prefetcher, which decides itself which pages are missing or stale.
     
-    # Normalize score to be between 0 and 100
-    return min(score, max_score)
+    Args:
+        fetches: (query, location, page) tuples
+        
+    Returns:
+        List of job listings, deduplicated by job ID
+    """
+    jobs = []
+    seen_ids = set()
+    futures = [(fetch[1], adzuna_client.executor.submit(adzuna_client.refresh_page, *fetch)) for fetch in fetches]
+    for location, future in futures:
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Error in Adzuna job search: {e}")
+            continue
+        page_jobs = []
+        for job_data in results:
+            job_id = job_data.get("id", "")
+            if job_id and job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
+            page_jobs.append(_normalize_adzuna_job(job_data))
+        job_catalog.add_jobs(page_jobs, location)
+        jobs.extend(page_jobs)
+    return jobs
 
 def search_adzuna_jobs(query: str, location: str = "de", num_results: int = 100) -> List[Dict[str, Any]]:
     """Search for jobs using the Adzuna API
@@ -85,113 +285,14 @@ def search_adzuna_jobs(query: str, location: str = "de", num_results: int = 100)
     Args:
         query: Search query (job title and keywords)
         location: Location to search in (default: de for Germany)
-        num_results: Maximum number of results to return
+        num_results: Maximum number of results to return; more than 100 are fetched as parallel pages
         
     Returns:
         List of job listings
     """
     try:
-        # Get API credentials from environment variables
-        app_id = os.environ.get("ADZUNA_APP_ID")
-        api_key = os.environ.get("ADZUNA_API_KEY")
-        
-        if not app_id or not api_key:
-            print("Error: Adzuna API credentials not found in environment variables")
-            print("Please set ADZUNA_APP_ID and ADZUNA_API_KEY environment variables")
-            return []
-        
-        # Construct the Adzuna API URL
-        base_url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
-        
-        # Füge Debugging-Ausgabe hinzu
-        print(f"Using Adzuna API with APP_ID: {app_id[:4]}...{app_id[-4:] if len(app_id) > 8 else ''}")
-        print(f"API URL: {base_url}")
-        print(f"Search query: '{query}'")
-        
-        params = {
-            "app_id": app_id,
-            "app_key": api_key,
-            "results_per_page": min(num_results, 100),  # API limit is 100 per page
-            "what": query,
-            "content-type": "application/json"
-        }
-        
         print(f"Searching Adzuna jobs for query: '{query}' in {location}")
-        response = requests.get(base_url, params=params)
-        
-        # Zeige vollständige Antwort für Debugging
-        print(f"API response status code: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"Error: Adzuna API returned status code {response.status_code}")
-            print(f"Response: {response.text}")
-            return []
-        
-        data = response.json()
-        
-        # Zeige Antwortdaten für Debugging
-        print(f"API response data: count={data.get('count', 0)}, total={data.get('__META__', {}).get('total_count', 0)}")
-        
-        if "results" not in data:
-            print("Error: No results found in Adzuna API response")
-            return []
-        
-        jobs = []
-        for job_data in data["results"]:
-            # Extract job details
-            job_id = job_data.get("id", "")
-            title = job_data.get("title", "")
-            company = job_data.get("company", {}).get("display_name", "Unbekanntes Unternehmen")
-            description = job_data.get("description", "")
-            location = job_data.get("location", {}).get("display_name", "")
-            
-            # Extract salary if available
-            salary_min = job_data.get("salary_min", 0)
-            salary_max = job_data.get("salary_max", 0)
-            salary = ""
-            if salary_min > 0 and salary_max > 0:
-                salary = f"€{int(salary_min // 1000)}K - €{int(salary_max // 1000)}K"
-            
-            # Extract application link
-            application_link = job_data.get("redirect_url", "")
-            
-            # Create standardized job object
-            job = {
-                "id": job_id,
-                "title": title,
-                "company_name": company,
-                "location": location,
-                "description": description,
-                "requirements": "",  # Adzuna doesn't provide structured requirements
-                "salary": salary,
-                "application_link": application_link,
-                "experience_required": 0,  # Not provided by Adzuna
-                "education_required": "",  # Not provided by Adzuna
-                "distance": 0,  # Not provided by Adzuna
-                "source": "Adzuna",
-                "skills": []  # Not provided by Adzuna
-            }
-            
-            # Try to extract experience and education from description
-            if "erfahrung" in description.lower():
-                # Look for patterns like "3 Jahre Erfahrung" or "3+ Jahre Erfahrung"
-                exp_match = re.search(r'(\d+)(?:\+)?\s*(?:jahre|jahr)\s*erfahrung', description.lower())
-                if exp_match:
-                    job["experience_required"] = int(exp_match.group(1))
-            
-            if any(edu in description.lower() for edu in ["bachelor", "master", "diplom", "ausbildung", "studium"]):
-                for edu in ["bachelor", "master", "diplom", "ausbildung", "studium"]:
-                    if edu in description.lower():
-                        job["education_required"] = edu.capitalize()
-                        break
-            
-            # Try to extract skills from description
-            common_skills = ["python", "java", "javascript", "react", "angular", "vue", "node", "sql", 
-                            "aws", "azure", "docker", "kubernetes", "git", "agile", "scrum"]
-            job["skills"] = [skill for skill in common_skills if skill in description.lower()]
-            
-            jobs.append(job)
-        
+        jobs = collect_adzuna_jobs([query], location, num_results)
         print(f"Found {len(jobs)} jobs from Adzuna")
         return jobs
         
@@ -199,10 +300,69 @@ def search_adzuna_jobs(query: str, location: str = "de", num_results: int = 100)
         print(f"Error in Adzuna job search: {e}")
         return []
 
+def adzuna_queries(job_title: str, interest_points: List[str]) -> List[str]:
+    """Adzuna queries of a job search
+    
+    The main query is the job title with the top two interest points; the
+    next two interest points get a query of their own with the job title.
+    
+    Args:
+        job_title: The job title to search for
+        interest_points: List of interest points
+        
+    Returns:
+        The queries, main query first
+    """
+    # Build search query with job title and interest points
+    query = job_title
+    if interest_points:
+        # Add top interest points to the query (up to 2)
+        query += " " + " ".join(interest_points[:2])
+    
+    # Additional queries with the next interest points, fetched in parallel with the main query
+    return [query] + [f"{job_title} {point}" for point in interest_points[2:4]]
+
+def _refresh_catalog_in_background(queries: List[str], location: str, num_results: int) -> None:
+    """Fetch the queries of a search again without blocking it, at most one refresh per query set at a time
+    
+    Listings that are seen again get a new seen_at in the catalog, and new
+    listings are added, so the next catalog answer is up to date.
+    """
+    key = (tuple(sorted(job_search_cache.normalize_query(query) for query in queries)), location)
+    with _refreshing_lock:
+        if key in _refreshing_queries:
+            return
+        _refreshing_queries.add(key)
+
+    def refresh():
+        try:
+            # Fetch the pages that are missing or stale in the cache; a stale
+            # cache hit would only hand the outdated listings back to the catalog
+            normalized = [query for query in dict.fromkeys(key[0]) if query]
+            pages = adzuna_client.pages_for(num_results, len(normalized))
+            fetches = [(query, location, page) for page in range(1, pages + 1) for query in normalized]
+            outdated = [fetch for fetch in fetches if not job_search_cache.is_fresh(*fetch)]
+            refresh_adzuna_pages(outdated)
+            if len(outdated) < len(fetches):
+                # Pages another worker refreshed come from the cache
+                collect_adzuna_jobs(queries, location, num_results)
+        except Exception as e:
+            print(f"Error refreshing the job catalog from Adzuna: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing_queries.discard(key)
+
+    try:
+        _catalog_refresher.submit(refresh)
+    except RuntimeError:
+        # Interpreter shutting down
+        with _refreshing_lock:
+            _refreshing_queries.discard(key)
+
 def search_jobs_online(job_title: str, education_level: str, years_experience: int,
                      location_radius: int, interest_points: List[str], limit: int = 100) -> Dict[str, Any]:
     """
-    Search for jobs online based on user criteria using only Adzuna API
+    Search for jobs based on user criteria, from the local job catalog and the Adzuna API
     
     Args:
         job_title: The job title to search for
@@ -218,57 +378,48 @@ def search_jobs_online(job_title: str, education_level: str, years_experience: i
     print(f"Searching for jobs with title: {job_title}, education: {education_level}, experience: {years_experience} years")
     
     all_jobs = []
+    pool_size = max(limit, CANDIDATE_POOL)
     
-    # Try to search for jobs using Adzuna API
+    # Zuerst im lokalen Job-Katalog suchen; listings must contain every word of the job title
     try:
-        # Build search query with job title and interest points
-        query = job_title
-        if interest_points:
-            # Add top interest points to the query (up to 2)
-            query += " " + " ".join(interest_points[:2])
-        
-        # Search for jobs using Adzuna API
-        adzuna_jobs = search_adzuna_jobs(query, "de", limit)
-        
-        if adzuna_jobs:
-            print(f"Successfully found {len(adzuna_jobs)} jobs from Adzuna")
-            all_jobs.extend(adzuna_jobs)
-            
-            # If we need more jobs, try with a more specific query
-            if len(all_jobs) < limit and len(interest_points) > 2:
-                # Try with different interest points
-                for i in range(2, min(len(interest_points), 4)):
-                    if len(all_jobs) >= limit:
-                        break
-                        
-                    additional_query = f"{job_title} {interest_points[i]}"
-                    print(f"Searching for more jobs with query: '{additional_query}'")
-                    
-                    additional_jobs = search_adzuna_jobs(additional_query, "de", limit - len(all_jobs))
-                    if additional_jobs:
-                        print(f"Found {len(additional_jobs)} additional jobs")
-                        # Filter out duplicates by ID
-                        existing_ids = {job["id"] for job in all_jobs}
-                        new_jobs = [job for job in additional_jobs if job["id"] not in existing_ids]
-                        all_jobs.extend(new_jobs)
-                        print(f"Added {len(new_jobs)} unique jobs")
+        all_jobs = job_catalog.search(" ".join([job_title] + interest_points), "de", pool_size, required=job_title)
+        print(f"Found {len(all_jobs)} jobs in the local job catalog")
     except Exception as e:
-        print(f"Error in Adzuna job search: {e}")
+        print(f"Error in job catalog search: {e}")
+    
+    queries = adzuna_queries(job_title, interest_points)
+    
+    # Only go to Adzuna if the catalog has too few matches
+    if len(all_jobs) >= max(limit, CATALOG_MIN_RESULTS):
+        # Catalog listings are not refreshed when they are served; refetch the
+        # search in the background once its newest listing is older than the cache TTL
+        if time.time() - job_catalog.newest_seen_at(job["id"] for job in all_jobs) > job_search_cache.ttl_seconds:
+            _refresh_catalog_in_background(queries, "de", pool_size)
+    else:
+        try:
+            # Fetch a larger candidate pool and keep the best matches after scoring
+            adzuna_jobs = collect_adzuna_jobs(queries, "de", pool_size)
+            
+            if adzuna_jobs:
+                print(f"Successfully found {len(adzuna_jobs)} jobs from Adzuna")
+                # Filter out duplicates by ID
+                existing_ids = {job["id"] for job in all_jobs}
+                all_jobs.extend(job for job in adzuna_jobs if job["id"] not in existing_ids)
+        except Exception as e:
+            print(f"Error in Adzuna job search: {e}")
     
     # Wenn wir Jobs gefunden haben
     if all_jobs:
         print(f"Using {len(all_jobs)} job listings from Adzuna")
         
-        # Füge Match-Score hinzu, basierend auf den Suchkriterien
-        for job in all_jobs:
-            match_score = calculate_match_score(job, job_title, education_level, years_experience, interest_points)
-            job["match_score"] = match_score
-        
-        # Sortiere nach Match-Score (absteigend)
-        all_jobs.sort(key=lambda x: x.get("match_score", 0), reverse=True)
+        # Füge Match-Score hinzu, basierend auf den Suchkriterien (alle Jobs in einem Durchgang)
+        scores = score_jobs(all_jobs, job_title, education_level, years_experience, interest_points)
+        for job, match_score in zip(all_jobs, scores):
+            job["match_score"] = float(match_score)
         
-        # Begrenze die Anzahl der zurückgegebenen Jobs
-        all_jobs = all_jobs[:limit]
+        # Sortiere nach Match-Score (absteigend) und begrenze die Anzahl der zurückgegebenen Jobs
+        best = np.argsort(-scores, kind="stable")[:limit]
+        all_jobs = [all_jobs[i] for i in best]
         
         # Create the response with jobs
         response = {
@@ -6,8 +6,13 @@ from services.mongodb.mongodb_pathfinder_utils import (
     get_saved_jobs_for_user,
     add_search_history,
     get_search_history_for_user,
-    is_job_saved
+    is_job_saved,
+    get_saved_job_ids,
+    save_job_for_user_async,
+    unsave_job_for_user_async,
+    get_saved_jobs_for_user_async
 )
+from services.llm_cache import llm_cache
 import litellm
 import json
 import uuid
@@ -85,7 +90,10 @@ def search_jobs_online(job_title: str = "", degree: str = "", hard_skills_rating
         for job in ai_filtered_jobs:
             if "id" not in job or not job["id"]:
                 job["id"] = f"AI-GEN-{str(uuid.uuid4())[:8]}"
-            job["is_saved"] = is_job_saved(user_id, job["id"])
+        # One query for all returned jobs instead of one per job
+        saved_ids = get_saved_job_ids(user_id, [job["id"] for job in ai_filtered_jobs])
+        for job in ai_filtered_jobs:
+            job["is_saved"] = job["id"] in saved_ids
     
     return {"jobs": ai_filtered_jobs, "count": len(ai_filtered_jobs)}
 
@@ -192,15 +200,18 @@ def filter_and_select_jobs_with_ai(user_criteria: Dict[str, Any],
     print(f"Prompting Ollama with {len(summarized_jobs_for_prompt)} summarized jobs for filtering.")
 
     try:
-        response = litellm.completion(
-            model="ollama/llama3.2", 
-            api_base="http://host.docker.internal:65201",
-            messages=[{"role": "user", "content": prompt}],
-            timeout=120 
+        messages = [{"role": "user", "content": prompt}]
+        content = llm_cache.get_or_compute(
+            "ollama/llama3.2",
+            messages,
+            lambda: litellm.completion(
+                model="ollama/llama3.2", 
+                api_base="http://host.docker.internal:65201",
+                messages=messages,
+                timeout=120 
+            ).choices[0].message.content
         )
         
-        content = response.choices[0].message.content
-        
         try:
             json_match = re.search(r'\[\s\S]*\]', content, re.DOTALL) 
             if json_match:
@@ -264,10 +275,21 @@ def get_job_details(job_id: str, user_id: str = None) -> Dict[str, Any]:
 
 def save_job(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
     """Save a job for a user."""
+    _ensure_job_id(job_data)
+    saved_job = save_job_for_user(user_id, job_data)
+    return _save_job_response(saved_job, job_data)
+
+async def save_job_async(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of save_job for FastAPI routes."""
+    _ensure_job_id(job_data)
+    saved_job = await save_job_for_user_async(user_id, job_data)
+    return _save_job_response(saved_job, job_data)
+
+def _ensure_job_id(job_data: Dict[str, Any]) -> None:
     if 'id' not in job_data or not job_data['id']:
         job_data['id'] = f"SAVED-{str(uuid.uuid4())[:8]}" 
-        
-    saved_job = save_job_for_user(user_id, job_data)
+
+def _save_job_response(saved_job: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "success": True if saved_job else False,
         "message": "Job saved successfully" if saved_job else "Failed to save job",
@@ -276,7 +298,13 @@ def save_job(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def unsave_job(user_id: str, job_id: str) -> Dict[str, Any]:
     """Remove a saved job for a user."""
-    success = unsave_job_for_user(user_id, job_id)
+    return _unsave_job_response(unsave_job_for_user(user_id, job_id), job_id)
+
+async def unsave_job_async(user_id: str, job_id: str) -> Dict[str, Any]:
+    """Async variant of unsave_job for FastAPI routes."""
+    return _unsave_job_response(await unsave_job_for_user_async(user_id, job_id), job_id)
+
+def _unsave_job_response(success: bool, job_id: str) -> Dict[str, Any]:
     return {
         "success": success,
         "message": "Job removed successfully" if success else "Job not found or failed to remove",
@@ -291,6 +319,14 @@ def get_saved_jobs(user_id: str) -> Dict[str, Any]:
         "count": len(saved_jobs_list)
     }
 
+async def get_saved_jobs_async(user_id: str) -> Dict[str, Any]:
+    """Async variant of get_saved_jobs for FastAPI routes."""
+    saved_jobs_list = await get_saved_jobs_for_user_async(user_id)
+    return {
+        "saved_jobs": saved_jobs_list,
+        "count": len(saved_jobs_list)
+    }
+
 def get_job_recommendations(user_id: str, limit: int = 3) -> Dict[str, Any]:
     """
     Get job recommendations based on user's saved jobs or search history.
@@ -323,7 +359,9 @@ def get_job_recommendations(user_id: str, limit: int = 3) -> Dict[str, Any]:
     for job in final_recommendations:
         if "id" not in job or not job["id"]:
             job["id"] = f"REC-{str(uuid.uuid4())[:8]}"
-        job["is_saved"] = is_job_saved(user_id, job["id"])
+    saved_ids = get_saved_job_ids(user_id, [job["id"] for job in final_recommendations])
+    for job in final_recommendations:
+        job["is_saved"] = job["id"] in saved_ids
     
     return {
         "recommendations": final_recommendations,
@@ -8,6 +8,7 @@ import json
 from typing import Dict, List, Any
 import litellm
 from crews.path_finder.search_path import get_job_details
+from services.llm_cache import llm_cache
 
 def analyze_job_requirements(job_id: str) -> Dict[str, Any]:
     """
@@ -52,17 +53,21 @@ def analyze_job_requirements(job_id: str) -> Dict[str, Any]:
     
     # KI-Anfrage stellen
     try:
-        response = litellm.completion(
-            model="ollama/llama3.2", 
-            api_base="http://host.docker.internal:65201",
-            messages=[{"role": "user", "content": prompt}],
+        messages = [{"role": "user", "content": prompt}]
+        ai_response = llm_cache.get_or_compute(
+            "ollama/llama3.2",
+            messages,
+            lambda: litellm.completion(
+                model="ollama/llama3.2", 
+                api_base="http://host.docker.internal:65201",
+                messages=messages,
+                temperature=0.1,
+                max_tokens=1000
+            ).choices[0].message.content,
             temperature=0.1,
             max_tokens=1000
         )
         
-        # Antwort extrahieren und als JSON parsen
-        ai_response = response.choices[0].message.content
-        
         # Versuchen, die Antwort als JSON zu parsen
         try:
             analysis = json.loads(ai_response)
@@ -139,17 +144,21 @@ def compare_skills_to_job(user_profile: Dict[str, Any], job_ids: List[str]) -> D
         
         # KI-Anfrage stellen
         try:
-            response = litellm.completion(
-                model="ollama/llama3.2", 
-                api_base="http://host.docker.internal:65201",
-                messages=[{"role": "user", "content": prompt}],
+            messages = [{"role": "user", "content": prompt}]
+            ai_response = llm_cache.get_or_compute(
+                "ollama/llama3.2",
+                messages,
+                lambda: litellm.completion(
+                    model="ollama/llama3.2", 
+                    api_base="http://host.docker.internal:65201",
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=1000
+                ).choices[0].message.content,
                 temperature=0.1,
                 max_tokens=1000
             )
             
-            # Antwort extrahieren und als JSON parsen
-            ai_response = response.choices[0].message.content
-            
             # Versuchen, die Antwort als JSON zu parsen
             try:
                 analysis = json.loads(ai_response)
@@ -1,3 +1,5 @@
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from crewai import Agent, Crew, Task
 from .parser_agent import ParserAgent
@@ -6,6 +8,8 @@ from .quality_agent import QualityAgent
 from .match_agent import MatchAgent
 from services.mongodb.mongodb_resume_utils import (
     save_parsed_resume,
+    update_parsed_data,
+    get_parsed_resume,
     save_resume_feedback,
     save_job_matching_results,
     get_saved_jobs_for_matching
@@ -17,12 +21,64 @@ class ResumeRefinerCrew:
     quality evaluation, and job matching.
     """
     
+    # Number of parsed resumes kept in memory
+    PARSE_CACHE_SIZE = 128
+    
     def __init__(self):
         """Initialize agents for resume processing"""
         self.parser = ParserAgent()
         self.layout_agent = LayoutAgent()
         self.quality_agent = QualityAgent()
         self.match_agent = MatchAgent()
+        
+        # upload_id -> (file_hash, parsed_data)
+        self._parse_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+    
+    def get_parsed_data(self, upload_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the parse_with_sections output for an upload, parsing the file at most once.
+        
+        Results are looked up in memory first, then in the user's resume document
+        in MongoDB. A cached result is only used while the file's content hash is
+        unchanged, otherwise the file is parsed again and the caches are refreshed.
+        
+        Args:
+            upload_id: ID of the uploaded file
+            user_id: Optional user ID whose MongoDB resume entry is used as persistent cache
+            
+        Returns:
+            Dictionary with full text, sections and keywords
+        """
+        file_hash = self.parser.file_hash(upload_id)
+        
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(upload_id)
+            if cached and cached[0] == file_hash:
+                self._parse_cache.move_to_end(upload_id)
+                return cached[1]
+        
+        parsed_data = None
+        if user_id:
+            resume_data = get_parsed_resume(user_id, upload_id)
+            if resume_data and resume_data.get("file_hash") == file_hash and resume_data.get("parsed_data"):
+                parsed_data = resume_data["parsed_data"]
+        
+        if parsed_data is None:
+            parsed_data = self.parser.parse_with_sections(upload_id)
+            if user_id:
+                update_parsed_data(user_id, upload_id, parsed_data, file_hash)
+        
+        self._remember_parsed_data(upload_id, file_hash, parsed_data)
+        return parsed_data
+    
+    def _remember_parsed_data(self, upload_id: str, file_hash: str, parsed_data: Dict[str, Any]) -> None:
+        """Put a parse result into the in-memory cache, evicting the oldest entries"""
+        with self._parse_cache_lock:
+            self._parse_cache[upload_id] = (file_hash, parsed_data)
+            self._parse_cache.move_to_end(upload_id)
+            while len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
     
     def parse_document(self, upload_file, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -40,10 +96,12 @@ class ResumeRefinerCrew:
         
         # Parse the document with sections
         parsed_data = self.parser.parse_with_sections(upload_id)
+        file_hash = self.parser.file_hash(upload_id)
+        self._remember_parsed_data(upload_id, file_hash, parsed_data)
         
         # Save to MongoDB if user_id is provided
         if user_id:
-            save_parsed_resume(user_id, upload_id, parsed_data)
+            save_parsed_resume(user_id, upload_id, parsed_data, file_hash)
         
         # Return the parsed data and upload_id
         return {
@@ -62,11 +120,8 @@ class ResumeRefinerCrew:
         Returns:
             Dictionary with layout analysis results
         """
-        # Get the parsed data
-        parsed_data = self.parser.parse_with_sections(upload_id)
-        
-        # Analyze the layout
-        layout_analysis = self.layout_agent.analyze_layout(parsed_data)
+        # Layout analysis works on the original file, not on the parsed text
+        layout_analysis = self.layout_agent.analyze_layout(upload_id)
         
         # Save to MongoDB if user_id is provided
         if user_id:
@@ -89,7 +144,7 @@ class ResumeRefinerCrew:
             Dictionary with quality evaluation results
         """
         # Get the parsed data
-        parsed_data = self.parser.parse_with_sections(upload_id)
+        parsed_data = self.get_parsed_data(upload_id, user_id)
         
         # Evaluate the quality
         quality_evaluation = self.quality_agent.evaluate_resume(parsed_data)
@@ -99,7 +154,6 @@ class ResumeRefinerCrew:
             # Get existing feedback if any
             feedback_data = {}
             if user_id:
-                from services.mongodb.mongodb_resume_utils import get_parsed_resume
                 resume_data = get_parsed_resume(user_id, upload_id)
                 if resume_data and "feedback" in resume_data:
                     feedback_data = resume_data["feedback"]
@@ -123,7 +177,7 @@ class ResumeRefinerCrew:
             List of job matches with similarity scores
         """
         # Get the parsed data
-        parsed_data = self.parser.parse_with_sections(upload_id)
+        parsed_data = self.get_parsed_data(upload_id, user_id)
         
         # Match against jobs
         job_matches = self.match_agent.match_jobs(parsed_data, job_descriptions)
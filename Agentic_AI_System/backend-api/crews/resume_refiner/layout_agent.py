@@ -4,6 +4,7 @@ import numpy as np
 import logging
 import traceback
 from typing import Dict, Any, Tuple, List
+from services.ocr_service import ocr_service, OCRBusyError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -194,7 +195,6 @@ class LayoutAgent:
             Dictionary with layout metrics
         """
         try:
-            import easyocr
             import numpy as np
             
             doc = fitz.open(path)
@@ -216,12 +216,10 @@ class LayoutAgent:
                 
                 logger.info(f"Converted PDF page to image for OCR analysis: {img_path}")
                 
-                # Initialize OCR reader
-                reader = easyocr.Reader(['en'])
                 logger.info(f"Running OCR on scanned PDF page")
                 
-                # Perform OCR with bounding box detection
-                results = reader.readtext(img_path)
+                # Perform OCR with bounding box detection (shared reader pool)
+                results = ocr_service.readtext(img_path)
                 logger.info(f"OCR completed with {len(results)} text blocks detected")
                 
                 # Clean up temporary image
@@ -373,6 +371,9 @@ class LayoutAgent:
             
             return metrics
             
+        except OCRBusyError:
+            # Let the API answer 503 instead of returning empty metrics
+            raise
         except Exception as e:
             logger.error(f"Error analyzing scanned PDF layout: {str(e)}")
             logger.error(traceback.format_exc())
@@ -404,14 +405,10 @@ class LayoutAgent:
             Dictionary with layout metrics
         """
         try:
-            import easyocr
             logger.info(f"Running OCR on image: {image_path}")
             
-            # Initialize OCR reader
-            reader = easyocr.Reader(['en'])
-            
-            # Run OCR to get text blocks with positions
-            result = reader.readtext(image_path)
+            # Run OCR to get text blocks with positions (shared reader pool)
+            result = ocr_service.readtext(image_path)
             
             # Extract text blocks with their positions
             blocks = []
@@ -513,6 +510,8 @@ class LayoutAgent:
                 
             return result
             
+        except OCRBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing HEIC image: {str(e)}")
             logger.error(traceback.format_exc())
@@ -1,9 +1,12 @@
 import re
-from typing import Dict, List, Any, Tuple
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple, Optional
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from litellm import completion
 import os
+from services.llm_cache import llm_cache
+from services.embedding_store import get_embedding_store
 
 class MatchAgent:
     """
@@ -14,8 +17,17 @@ class MatchAgent:
     # Model to use for embeddings
     MODEL_NAME = "all-MiniLM-L6-v2"
     
+    # Number of texts per encoder forward pass
+    ENCODE_BATCH_SIZE = 64
+    
+    # Job texts whose extracted skills are kept in memory
+    SKILL_CACHE_SIZE = 4096
+    
     def __init__(self):
         """Initialize the sentence transformer model"""
+        self.embedding_store = None
+        # Job descriptions recur across requests (and are warmed by the job prefetcher)
+        self._cached_skills = lru_cache(maxsize=self.SKILL_CACHE_SIZE)(self._find_skills)
         try:
             self.model = SentenceTransformer(self.MODEL_NAME)
             self.use_transformer = True
@@ -23,6 +35,15 @@ class MatchAgent:
             print(f"Warning: Could not load SentenceTransformer model: {e}")
             print("Falling back to LLM-only matching")
             self.use_transformer = False
+            return
+        
+        # Job vectors are persisted by content hash and reused across requests
+        try:
+            self.embedding_store = get_embedding_store(
+                self.MODEL_NAME, self.model.get_sentence_embedding_dimension()
+            )
+        except Exception as e:
+            print(f"Warning: Could not open embedding store: {e}")
     
     def match_jobs(self, resume_data: Dict[str, Any], job_descriptions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -38,10 +59,18 @@ class MatchAgent:
         # Extract resume text
         resume_text = self._prepare_resume_text(resume_data)
         
+        # Embed the resume once and all jobs in a single batch
+        if self.use_transformer:
+            transformer_scores = self._calculate_similarities(
+                resume_text, [job.get("description", "") for job in job_descriptions]
+            )
+        else:
+            transformer_scores = [0.0] * len(job_descriptions)
+        
         # Process each job
         results = []
-        for job in job_descriptions:
-            match_result = self.match_single_job(resume_text, job)
+        for job, transformer_score in zip(job_descriptions, transformer_scores):
+            match_result = self.match_single_job(resume_text, job, transformer_score)
             results.append(match_result)
             
         # Sort by overall match score
@@ -49,7 +78,8 @@ class MatchAgent:
         
         return results
     
-    def match_single_job(self, resume_text: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    def match_single_job(self, resume_text: str, job: Dict[str, Any],
+                         transformer_score: Optional[float] = None) -> Dict[str, Any]:
         """
         Match a resume against a single job description with improved matching.
         Uses both semantic similarity and LLM analysis for comprehensive evaluation.
@@ -57,6 +87,7 @@ class MatchAgent:
         Args:
             resume_text: Processed resume text
             job: Job description dictionary
+            transformer_score: Precomputed semantic similarity (computed here if omitted)
             
         Returns:
             Dictionary with match results
@@ -69,11 +100,12 @@ class MatchAgent:
         # Print debug info to help diagnose issues
         print(f"Processing job: ID={job_id}, Title={job_title}")
         
-        # Calculate overall similarity score
-        if self.use_transformer:
-            transformer_score = self._calculate_similarity(resume_text, job_text)
-        else:
-            transformer_score = 0
+        # Calculate overall similarity score unless match_jobs already did
+        if transformer_score is None:
+            if self.use_transformer:
+                transformer_score = self._calculate_similarity(resume_text, job_text)
+            else:
+                transformer_score = 0
         
         # Extract skills from resume and job
         resume_skills = self._extract_skills(resume_text)
@@ -186,6 +218,73 @@ class MatchAgent:
         
         return float(similarity)
     
+    def _calculate_similarities(self, resume_text: str, job_texts: List[str]) -> List[float]:
+        """
+        Calculate semantic similarity between a resume and many job texts with
+        one batched encode call and a single vectorized cosine computation.
+        Job vectors come from the persistent embedding store when available,
+        so only jobs that were never seen before are encoded.
+        
+        Args:
+            resume_text: Processed resume text
+            job_texts: Job description texts
+            
+        Returns:
+            Similarity score per job text (0 for empty texts)
+        """
+        scores = [0.0] * len(job_texts)
+        
+        # Handle empty texts
+        non_empty = [i for i, text in enumerate(job_texts) if text]
+        if not resume_text or not non_empty:
+            return scores
+        
+        non_empty_texts = [job_texts[i] for i in non_empty]
+        
+        if self.embedding_store is not None:
+            # Normalized vectors, so the dot product is the cosine
+            resume_embedding = self.model.encode(
+                resume_text, convert_to_numpy=True, normalize_embeddings=True
+            )
+            job_embeddings = self.embedding_store.encode(
+                self.model, non_empty_texts, batch_size=self.ENCODE_BATCH_SIZE
+            )
+            similarities = job_embeddings @ resume_embedding
+        else:
+            # Resume is row 0, jobs follow; normalized so the dot product is the cosine
+            embeddings = self.model.encode(
+                [resume_text] + non_empty_texts,
+                batch_size=self.ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            similarities = embeddings[1:] @ embeddings[0]
+        
+        for i, similarity in zip(non_empty, similarities):
+            scores[i] = float(similarity)
+        
+        return scores
+    
+    def precompute_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Embed and extract skills for job descriptions ahead of matching.
+        
+        Vectors go to the persistent embedding store and skills to the
+        in-memory cache, so later matches against these jobs skip that work.
+        
+        Args:
+            jobs: Job dictionaries with a description
+            
+        Returns:
+            Number of job descriptions processed
+        """
+        texts = list(dict.fromkeys(job.get("description", "") for job in jobs if job.get("description")))
+        if self.use_transformer and self.embedding_store is not None and texts:
+            self.embedding_store.encode(self.model, texts, batch_size=self.ENCODE_BATCH_SIZE)
+        for text in texts:
+            self._cached_skills(text)
+        return len(texts)
+    
     def _extract_skills(self, text: str) -> List[str]:
         """
         Extract potential skills from text using more comprehensive patterns.
@@ -196,6 +295,10 @@ class MatchAgent:
         Returns:
             List of potential skills
         """
+        return list(self._cached_skills(text))
+    
+    def _find_skills(self, text: str) -> Tuple[str, ...]:
+        """Uncached skill extraction behind _extract_skills"""
         # Common technical skills pattern
         tech_pattern = r'\b(?:Python|Java|JavaScript|TypeScript|React|Angular|Vue|Node\.js|Express|Django|Flask|SQL|MySQL|PostgreSQL|MongoDB|Redis|AWS|Azure|GCP|Docker|Kubernetes|CI/CD|Git|GitHub|REST|API|JSON|XML|HTML|CSS|SASS|LESS|Bootstrap|Tailwind|Redux|GraphQL|Webpack|Babel|Jest|Mocha|Cypress|Selenium|TDD|Agile|Scrum|Kanban|DevOps|Machine Learning|AI|NLP|Computer Vision|Data Science|Big Data|Hadoop|Spark|TensorFlow|PyTorch|Keras|scikit-learn|pandas|NumPy|R|Tableau|Power BI|Excel|VBA|C\+\+|C#|Ruby|PHP|Go|Rust|Swift|Kotlin|Objective-C|Unity|Unreal|Photoshop|Illustrator|Figma|Sketch|InDesign|After Effects|Premiere Pro|Final Cut|Logic Pro|Ableton|Pro Tools|Maya|Blender|3D Studio Max|ZBrush|AutoCAD|Revit|SketchUp)\b'
         
@@ -232,7 +335,7 @@ class MatchAgent:
                 seen.add(skill)
                 unique_skills.append(skill)
         
-        return unique_skills
+        return tuple(unique_skills)
         
     def _match_skills(self, resume_skills: List[str], job_skills: List[str]) -> Tuple[List[str], List[str], float]:
         """
@@ -408,12 +511,16 @@ Provide ONLY the JSON response with no additional text."""
             api_base = os.getenv("OLLAMA_BASE_URL") or os.getenv("OLLAMA_API_BASE")
             print(f"Using Ollama API base URL: {api_base}")
             
-            resp = completion(
-                model="ollama/llama3.2",
-                api_base=api_base,
-                messages=[{"role": "user", "content": prompt}]
+            messages = [{"role": "user", "content": prompt}]
+            return llm_cache.get_or_compute(
+                "ollama/llama3.2",
+                messages,
+                lambda: completion(
+                    model="ollama/llama3.2",
+                    api_base=api_base,
+                    messages=messages
+                ).choices[0].message.content.strip()
             )
-            return resp.choices[0].message.content.strip()
         except Exception as e:
             print(f"LLM call failed: {e}")
             return ""
@@ -1,22 +1,20 @@
 import os
 import uuid
 import re
+import hashlib
 import logging
 import mimetypes
 from typing import Dict, List, Any
 from pdfminer.high_level import extract_text
-import easyocr
 from fastapi import UploadFile
 from PIL import Image
 import pillow_heif
+from services.ocr_service import ocr_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize EasyOCR reader once
-_reader = easyocr.Reader(['en'], gpu=False)
-
 # Section headers for parsing
 SECTION_HEADERS = {
     "profile": r"(?:Profile|Summary|Profil|Zusammenfassung)",
@@ -96,30 +94,56 @@ class ParserAgent:
             logger.error(f"Error saving uploaded file: {str(e)}")
             raise
     
-    def parse(self, upload_id: str) -> str:
+    def find_file(self, upload_id: str) -> str:
         """
-        Extract plain text from a saved PDF or image file.
-        For PDFs: Uses pdfminer with OCR fallback.
-        For images: Uses OCR directly.
+        Locate the saved file for an upload_id.
         
         Args:
             upload_id: ID of the uploaded file
             
         Returns:
-            Extracted text from the file
+            Path to the saved PDF or image file
         """
         # Check for different possible file extensions
         possible_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.heic']
-        found_path = None
         
         for ext in possible_extensions:
             path = os.path.join(self.TMP_DIR, f"{upload_id}{ext}")
             if os.path.exists(path):
-                found_path = path
-                break
+                return path
                 
-        if not found_path:
-            raise FileNotFoundError(f"No file found for upload_id: {upload_id}")
+        raise FileNotFoundError(f"No file found for upload_id: {upload_id}")
+    
+    def file_hash(self, upload_id: str) -> str:
+        """
+        Compute a content hash of the saved file, used to detect when a cached
+        parse result is out of date.
+        
+        Args:
+            upload_id: ID of the uploaded file
+            
+        Returns:
+            SHA-256 hex digest of the file content
+        """
+        digest = hashlib.sha256()
+        with open(self.find_file(upload_id), "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def parse(self, upload_id: str) -> str:
+        """
+        Extract plain text from a saved PDF or image file.
+        For PDFs: Uses pdfminer with OCR fallback.
+        For images: Uses OCR directly.
+        
+        Args:
+            upload_id: ID of the uploaded file
+            
+        Returns:
+            Extracted text from the file
+        """
+        found_path = self.find_file(upload_id)
         
         # Get the file extension
         _, ext = os.path.splitext(found_path)
@@ -136,7 +160,7 @@ class ParserAgent:
             except Exception as e:
                 logger.info(f"PDF text extraction failed, falling back to OCR: {str(e)}")
                 # OCR fallback for PDF
-                result = _reader.readtext(found_path, detail=0)
+                result = ocr_service.readtext(found_path, detail=0)
                 return "\n".join(result)
         elif ext == '.heic':
             # Convert HEIC to JPEG first, then use OCR
@@ -154,7 +178,7 @@ class ParserAgent:
                 logger.info(f"Converted HEIC to JPEG for OCR: {temp_jpg_path}")
                 
                 # Use OCR on the converted image
-                result = _reader.readtext(temp_jpg_path, detail=0)
+                result = ocr_service.readtext(temp_jpg_path, detail=0)
                 
                 # Clean up temporary file
                 try:
@@ -170,7 +194,7 @@ class ParserAgent:
             logger.info(f"Processing image file with OCR: {found_path}")
             try:
                 # Use OCR directly for images
-                result = _reader.readtext(found_path, detail=0)
+                result = ocr_service.readtext(found_path, detail=0)
                 return "\n".join(result)
             except Exception as e:
                 logger.error(f"OCR processing failed: {str(e)}")
@@ -1,7 +1,12 @@
 import re
 import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Any
 from litellm import completion
+from services.llm_cache import llm_cache
+
+logger = logging.getLogger(__name__)
 
 class QualityAgent:
     """
@@ -17,8 +22,12 @@ class QualityAgent:
         "ergebnis_orientierung"
     ]
     
+    # Score used for a category whose evaluation did not finish in time
+    DEFAULT_SCORE = 50
+    
     def __init__(self):
-        pass
+        # Seconds to wait for each category evaluation
+        self.category_timeout = float(os.getenv("QUALITY_CATEGORY_TIMEOUT", "90"))
     
     def evaluate_resume(self, resume_data: Dict[str, Any], layout_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -40,9 +49,23 @@ class QualityAgent:
             "feedback": {}
         }
         
-        # Evaluate each category
-        for category in self.CATEGORIES:
-            score, feedback = self._evaluate_category(category, full_text, sections, layout_data)
+        # Evaluate all categories concurrently, they are independent LLM calls
+        executor = ThreadPoolExecutor(max_workers=len(self.CATEGORIES), thread_name_prefix="quality")
+        futures = {
+            category: executor.submit(self._evaluate_category, category, full_text, sections, layout_data)
+            for category in self.CATEGORIES
+        }
+        wait(futures.values(), timeout=self.category_timeout)
+        # Don't wait for categories that timed out
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        for category, future in futures.items():
+            if future.done():
+                score, feedback = future.result()
+            else:
+                logger.warning(f"Evaluation of {category} timed out after {self.category_timeout}s, "
+                               f"using default score {self.DEFAULT_SCORE}")
+                score, feedback = self.DEFAULT_SCORE, []
             results["scores"][category] = score
             results["feedback"][category] = feedback
         
@@ -253,12 +276,16 @@ Feedback:
         Returns:
             LLM response text
         """
-        resp = completion(
-            model="ollama/llama3.2",
-            api_base=os.getenv("OLLAMA_BASE_URL"),
-            messages=[{"role": "user", "content": prompt}]
+        messages = [{"role": "user", "content": prompt}]
+        return llm_cache.get_or_compute(
+            "ollama/llama3.2",
+            messages,
+            lambda: completion(
+                model="ollama/llama3.2",
+                api_base=os.getenv("OLLAMA_BASE_URL"),
+                messages=messages
+            ).choices[0].message.content.strip()
         )
-        return resp.choices[0].message.content.strip()
     
     def _extract_score(self, response: str) -> int:
         """Extract numerical score from LLM response"""
@@ -266,7 +293,7 @@ Feedback:
         if score_match:
             score = int(score_match.group(1))
             return max(0, min(100, score))  # Clamp between 0-100
-        return 50  # Default to middle score if parsing fails
+        return self.DEFAULT_SCORE  # Default to middle score if parsing fails
     
     def _extract_feedback(self, response: str) -> List[str]:
         """Extract feedback points from LLM response"""
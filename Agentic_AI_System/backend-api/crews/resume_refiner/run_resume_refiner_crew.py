@@ -25,6 +25,19 @@ def upload_and_parse_resume(upload_file: UploadFile, user_id: Optional[str] = No
     """
     return _crew.parse_document(upload_file, user_id)
 
+def get_parsed_resume_data(upload_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the parsed sections of an uploaded resume, reusing earlier parse results.
+    
+    Args:
+        upload_id: ID of the uploaded file
+        user_id: Optional user ID whose MongoDB resume entry is used as cache
+        
+    Returns:
+        Dictionary with full text, sections and keywords
+    """
+    return _crew.get_parsed_data(upload_id, user_id)
+
 def analyze_resume_layout(upload_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze the layout of a parsed resume, saving feedback to MongoDB if user_id is provided.
@@ -78,6 +91,18 @@ def match_resume_with_saved_jobs(upload_id: str, user_id: str) -> List[Dict[str,
     """
     return _crew.match_with_saved_jobs(upload_id, user_id)
 
+def precompute_job_matching(jobs: List[Dict[str, Any]]) -> int:
+    """
+    Precompute embeddings and skills of job descriptions for later matches.
+    
+    Args:
+        jobs: Job dictionaries with a description
+        
+    Returns:
+        Number of job descriptions processed
+    """
+    return _crew.match_agent.precompute_jobs(jobs)
+
 # Legacy functions for backward compatibility
 def upload_and_parse_pdf(upload_file):
     """Legacy function - use upload_and_parse_resume instead"""
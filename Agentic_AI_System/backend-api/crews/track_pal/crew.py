@@ -4,9 +4,13 @@ from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List, Dict, Any, Optional
 import os
 import json
+import asyncio
 from datetime import datetime, timedelta
 import litellm
 from services.mongodb.global_state_service import global_state
+from services.mongodb.async_global_state_service import async_global_state
+from services.mongodb.saved_jobs_service import saved_jobs_service, async_saved_jobs_service
+from services.llm_cache import llm_cache
 
 # Enable debug mode for litellm
 litellm._turn_on_debug()
@@ -31,43 +35,43 @@ class ApplicationManager:
             if not user_id or user_id == "test_user":
                 user_id = "default_user"
                 
-            # Get the global state for the user
-            state = global_state.get_state(user_id)
-            
-            # First check if there are applications in the old location (for backward compatibility)
-            applications = state.get('agent_knowledge', {}).get('applications', {})
+            # First check if there are applications in the old location (for backward compatibility);
+            # projected read of that field only
+            applications = global_state.get_field("agent_knowledge.applications", user_id, {})
             if applications:
                 # Convert old format to new format and move to saved_jobs
-                self._migrate_applications_to_saved_jobs(user_id, state, applications)
-                # Get the updated state after migration
-                state = global_state.get_state(user_id)
+                self._migrate_applications_to_saved_jobs(user_id, applications)
             
-            # Extract saved_jobs from agent_knowledge.job_search
-            saved_jobs = state.get('agent_knowledge', {}).get('job_search', {}).get('saved_jobs', [])
+            # Indexed query on the saved_jobs collection
+            return saved_jobs_service.list_jobs(user_id)
+                
+        except Exception as e:
+            print(f"Error loading saved jobs from MongoDB: {e}")
+            return []
+    
+    async def get_applications_async(self, user_id: str) -> List[Dict[str, Any]]:
+        """Async variant of get_applications for FastAPI routes"""
+        try:
+            if not user_id or user_id == "test_user":
+                user_id = "default_user"
+            
+            applications = await async_global_state.get_field("agent_knowledge.applications", user_id, {})
+            if applications:
+                # Rare one-time migration, run in a worker thread
+                await asyncio.to_thread(self._migrate_applications_to_saved_jobs, user_id, applications)
             
-            # Return the list of saved jobs
-            return saved_jobs
+            return await async_saved_jobs_service.list_jobs(user_id)
                 
         except Exception as e:
             print(f"Error loading saved jobs from MongoDB: {e}")
             return []
     
-    def _migrate_applications_to_saved_jobs(self, user_id: str, state: Dict[str, Any], applications: Dict[str, Any]) -> None:
+    def _migrate_applications_to_saved_jobs(self, user_id: str, applications: Dict[str, Any]) -> None:
         """Migrate applications from old format to new format"""
         # Use default_user if user_id is test_user or not provided
         if not user_id or user_id == "test_user":
             user_id = "default_user"
         try:
-            # Ensure agent_knowledge and job_search exist
-            if 'agent_knowledge' not in state:
-                state['agent_knowledge'] = {}
-            
-            if 'job_search' not in state['agent_knowledge']:
-                state['agent_knowledge']['job_search'] = {}
-                
-            if 'saved_jobs' not in state['agent_knowledge']['job_search']:
-                state['agent_knowledge']['job_search']['saved_jobs'] = []
-            
             # Convert each application to the new format and add to saved_jobs
             for app_id, app_data in applications.items():
                 # Format according to PathFinder schema
@@ -88,20 +92,10 @@ class ApplicationManager:
                 }
                 
                 # Add to saved_jobs if not already present
-                job_exists = False
-                for job in state['agent_knowledge']['job_search']['saved_jobs']:
-                    if job.get("id") == formatted_job["id"]:
-                        job_exists = True
-                        break
-                
-                if not job_exists:
-                    state['agent_knowledge']['job_search']['saved_jobs'].append(formatted_job)
+                saved_jobs_service.add(formatted_job, user_id)
             
             # Clear the old applications data
-            state['agent_knowledge']['applications'] = {}
-            
-            # Update the state
-            global_state.set_state(state, user_id)
+            global_state.update_fields({"agent_knowledge.applications": {}}, user_id)
             print(f"Successfully migrated {len(applications)} applications to saved_jobs for user {user_id}")
             
         except Exception as e:
@@ -114,57 +108,56 @@ class ApplicationManager:
             if not user_id or user_id == "test_user":
                 user_id = "default_user"
                 
-            # Get the current state
-            state = global_state.get_state(user_id)
-            
-            # Ensure agent_knowledge and job_search exist
-            if 'agent_knowledge' not in state:
-                state['agent_knowledge'] = {}
-            
-            if 'job_search' not in state['agent_knowledge']:
-                state['agent_knowledge']['job_search'] = {}
-                
-            if 'saved_jobs' not in state['agent_knowledge']['job_search']:
-                state['agent_knowledge']['job_search']['saved_jobs'] = []
+            formatted_job = self._format_application(application)
             
-            # Format the job data according to PathFinder schema
-            formatted_job = {
-                "id": application.get("id", f"app_{int(datetime.now().timestamp())}"),
-                "position": application.get("jobTitle", application.get("title", "Unknown Title")),
-                "company": application.get("company", "Unknown Company"),
-                "location": application.get("location", ""),
-                "description": application.get("description", ""),
-                "application_link": application.get("jobUrl", application.get("url", "")),
-                "match_score": application.get("match_score", 0),
-                "status": application.get("status", SAVED),
-                "notes": application.get("notes", ""),
-                "application_status": "not applied" if application.get("status") == SAVED else "applied",
-                "created_at": application.get("created_at", application.get("appliedDate", datetime.now().isoformat())),
-                "updated_at": datetime.now().isoformat(),
-                "source": "TrackPal"
-            }
+            # Atomic insert unless a job with this id is already saved
+            existing_job = saved_jobs_service.add(formatted_job, user_id)
+            if existing_job is not None:
+                # Job already exists, return it
+                return existing_job
             
-            # Check if job already exists
-            saved_jobs = state['agent_knowledge']['job_search']['saved_jobs']
-            for i, job in enumerate(saved_jobs):
-                if job.get("id") == formatted_job["id"]:
-                    # Job already exists, return it
-                    return job
+            # Return the job in the format expected by the frontend
+            return self._convert_to_frontend_format(formatted_job)
             
-            # Job doesn't exist, add it to saved_jobs
-            saved_jobs.append(formatted_job)
+        except Exception as e:
+            print(f"Error saving job to MongoDB: {e}")
+            return application  # Return the application anyway for client-side use
+    
+    async def save_application_async(self, user_id: str, application: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of save_application for FastAPI routes"""
+        try:
+            if not user_id or user_id == "test_user":
+                user_id = "default_user"
             
-            # Update the user state
-            state['agent_knowledge']['job_search']['saved_jobs'] = saved_jobs
-            global_state.set_state(state, user_id)
+            formatted_job = self._format_application(application)
+            existing_job = await async_saved_jobs_service.add(formatted_job, user_id)
+            if existing_job is not None:
+                return existing_job
             
-            # Return the job in the format expected by the frontend
             return self._convert_to_frontend_format(formatted_job)
             
         except Exception as e:
             print(f"Error saving job to MongoDB: {e}")
             return application  # Return the application anyway for client-side use
     
+    def _format_application(self, application: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a TrackPal application according to the PathFinder saved job schema"""
+        return {
+            "id": application.get("id", f"app_{int(datetime.now().timestamp())}"),
+            "position": application.get("jobTitle", application.get("title", "Unknown Title")),
+            "company": application.get("company", "Unknown Company"),
+            "location": application.get("location", ""),
+            "description": application.get("description", ""),
+            "application_link": application.get("jobUrl", application.get("url", "")),
+            "match_score": application.get("match_score", 0),
+            "status": application.get("status", SAVED),
+            "notes": application.get("notes", ""),
+            "application_status": "not applied" if application.get("status") == SAVED else "applied",
+            "created_at": application.get("created_at", application.get("appliedDate", datetime.now().isoformat())),
+            "updated_at": datetime.now().isoformat(),
+            "source": "TrackPal"
+        }
+    
     def update_application(self, user_id: str, app_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update an existing job application in MongoDB using saved_jobs collection"""
         try:
@@ -172,48 +165,41 @@ class ApplicationManager:
             if not user_id or user_id == "test_user":
                 user_id = "default_user"
                 
-            # Get the current state
-            state = global_state.get_state(user_id)
-            
-            # Check if saved_jobs exist
-            if 'agent_knowledge' not in state or 'job_search' not in state['agent_knowledge'] or 'saved_jobs' not in state['agent_knowledge']['job_search']:
+            saved_job = saved_jobs_service.update(app_id, self._map_update_fields(updates), user_id)
+            if saved_job is None:
                 return None
-                
-            saved_jobs = state['agent_knowledge']['job_search']['saved_jobs']
             
-            # Find the job to update
-            job_index = None
-            for i, job in enumerate(saved_jobs):
-                if job.get("id") == app_id:
-                    job_index = i
-                    break
-                    
-            if job_index is None:
-                return None
-                
-            # Update fields
-            for key, value in updates.items():
-                # Map TrackPal fields to PathFinder fields if needed
-                if key == "jobTitle":
-                    saved_jobs[job_index]["position"] = value
-                elif key == "jobUrl":
-                    saved_jobs[job_index]["application_link"] = value
-                else:
-                    saved_jobs[job_index][key] = value
+            # Return the job in the format expected by the frontend
+            return self._convert_to_frontend_format(saved_job)
             
-            # Update timestamp
-            saved_jobs[job_index]["updated_at"] = datetime.now().isoformat()
+        except Exception as e:
+            print(f"Error updating job in MongoDB: {e}")
+            return None
+    
+    async def update_application_async(self, user_id: str, app_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Async variant of update_application for FastAPI routes"""
+        try:
+            if not user_id or user_id == "test_user":
+                user_id = "default_user"
             
-            # Save updated state
-            state['agent_knowledge']['job_search']['saved_jobs'] = saved_jobs
-            global_state.set_state(state, user_id)
+            saved_job = await async_saved_jobs_service.update(app_id, self._map_update_fields(updates), user_id)
+            if saved_job is None:
+                return None
             
-            # Return the job in the format expected by the frontend
-            return self._convert_to_frontend_format(saved_jobs[job_index])
+            return self._convert_to_frontend_format(saved_job)
             
         except Exception as e:
             print(f"Error updating job in MongoDB: {e}")
             return None
+    
+    def _map_update_fields(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Map TrackPal fields to PathFinder fields and stamp updated_at"""
+        field_map = {"jobTitle": "position", "jobUrl": "application_link"}
+        fields = {field_map.get(key, key): value for key, value in updates.items()}
+        
+        # Update timestamp
+        fields["updated_at"] = datetime.now().isoformat()
+        return fields
             
     def _convert_to_frontend_format(self, saved_job: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a saved job from PathFinder format to TrackPal frontend format"""
@@ -546,11 +532,16 @@ def respond(message):
     # Use the same environment variable as the CrewAI LLM
     ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:11434")
     
-    response = litellm.completion(
-        model="ollama/llama3.2",
-        api_base=ollama_base_url,
-        messages=[{"role": "user", "content": formatted_message}],
-        temperature=0.5  # Lower temperature for more consistent outputs
+    messages = [{"role": "user", "content": formatted_message}]
+    raw_response = llm_cache.get_or_compute(
+        "ollama/llama3.2",
+        messages,
+        lambda: litellm.completion(
+            model="ollama/llama3.2",
+            api_base=ollama_base_url,
+            messages=messages,
+            temperature=0.5  # Lower temperature for more consistent outputs
+        ).choices[0].message.content,
+        temperature=0.5
     )
-    raw_response = response.choices[0].message.content
     return clean_ai_response(raw_response)
@@ -75,3 +75,16 @@ def update_application(user_id: str, app_id: str, updates: Dict[str, Any]) -> Op
         user_id = "default_user"
         
     return track_pal.application_manager.update_application(user_id, app_id, updates)
+
+# Async variants for FastAPI routes (non-blocking MongoDB access)
+async def get_applications_async(user_id: str) -> List[Dict[str, Any]]:
+    """Async variant of get_applications"""
+    return await track_pal.application_manager.get_applications_async(user_id)
+
+async def save_application_async(user_id: str, application: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of save_application"""
+    return await track_pal.application_manager.save_application_async(user_id, application)
+
+async def update_application_async(user_id: str, app_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Async variant of update_application"""
+    return await track_pal.application_manager.update_application_async(user_id, app_id, updates)
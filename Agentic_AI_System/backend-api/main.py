@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, Query, UploadFile, File
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 from pydantic import BaseModel
 from typing import Dict, Any
 import os
+import json
 from datetime import datetime
 from dotenv import load_dotenv
-from services.mongodb.client import mongo_client
+from services.mongodb.async_client import async_mongo_client
+from services.mongodb.async_global_state_service import async_global_state
+from services.ocr_service import ocr_service, OCRBusyError
+from services.dispatch import dispatcher
 import logging
 
 # Configure logging
@@ -16,17 +21,21 @@ logger = logging.getLogger(__name__)
 
 # Import crew functions
 from crews.mock_mate.run_mock_mate_crew import run_respond_to_answer, run_start_interview, run_review_interview, run_prepare_custom_interview
-from crews.track_pal.run_track_pal_crew import run_check_reminders, run_analyze_patterns, get_applications, save_application, update_application
+from crews.track_pal.run_track_pal_crew import run_check_reminders, run_analyze_patterns, get_applications_async, save_application_async, update_application_async
 from crews.track_pal.crew import respond
 #from crews.test.run_test_crew import run_test_crew
 from services.session_manager import add_message_to_history, get_conversation_history, set_session_metadata, get_session_metadata
 from crews.path_finder.run_path_finder_crew import run_path_finder_crew, run_path_finder_direct
-from crews.path_finder.search_path import get_job_details, get_job_recommendations, save_job, unsave_job, get_saved_jobs
+from crews.path_finder.search_path import get_job_details, get_job_recommendations, save_job_async, unsave_job_async, get_saved_jobs_async
+from crews.path_finder.adzuna_client import adzuna_client
+from services.job_search_cache import job_search_cache
+from services.job_prefetch import job_prefetcher
 from crews.resume_refiner.run_resume_refiner_crew import (
     upload_and_parse_resume as refiner_upload_and_parse,
     analyze_resume_layout as refiner_analyze_layout,
     evaluate_resume_quality as refiner_evaluate_quality,
-    match_resume_with_jobs as refiner_match_jobs
+    match_resume_with_jobs as refiner_match_jobs,
+    get_parsed_resume_data as refiner_get_parsed_data
 )
 
 # Load environment variables
@@ -60,10 +69,110 @@ class CommandRequest(BaseModel):
 class JobMatchRequest(BaseModel):
     job_descriptions: List[Dict[str, Any]]
 
+@app.middleware("http")
+async def global_state_unit_of_work(request: Request, call_next):
+    """
+    Read each user's global state at most once per request and flush changes together
+
+    Changes are only written if the handler succeeds. Routes turn their
+    errors into HTTPExceptions, which reach this middleware as 4xx/5xx
+    responses, so the unit of work is discarded for any status of 400 or
+    above as well as for unhandled exceptions. If the handler has succeeded
+    but the flush fails, the error is logged and the handler's response is
+    still returned, since its other work is already done.
+    Streaming response bodies and background tasks run after the flush;
+    their global state writes are not part of the request's unit of work and
+    go to MongoDB directly.
+    """
+    response = None
+    try:
+        async with async_global_state.unit_of_work() as unit:
+            response = await call_next(request)
+            if response.status_code >= 400:
+                unit.discard()
+    except Exception:
+        if response is None:
+            raise
+        # Only the flush failed; flush() has logged the error
+    return response
+
+def ocr_busy_error(e: OCRBusyError) -> HTTPException:
+    """Map a full OCR queue to 503 so clients back off and retry"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+@app.on_event("startup")
+def start_job_prefetch():
+    """Start warming job data for the most searched titles"""
+    job_prefetcher.start()
+
+@app.on_event("shutdown")
+def stop_job_prefetch():
+    """Stop the job prefetch worker"""
+    job_prefetcher.stop()
+
+@app.on_event("shutdown")
+def shutdown_ocr_workers():
+    """Stop the OCR worker processes with the API"""
+    ocr_service.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_dispatcher():
+    """Stop the workload thread pools with the API"""
+    dispatcher.shutdown()
+
+@app.on_event("shutdown")
+def close_adzuna_client():
+    """Close the pooled Adzuna connections and stop cache refreshes"""
+    adzuna_client.close()
+    job_search_cache.close()
+
+@app.on_event("shutdown")
+async def close_async_mongo_client():
+    """Close the async MongoDB connection pool"""
+    await async_mongo_client.close()
+
 @app.get("/healthcheck", tags=["System"])
 def is_healthy(test: str = Query("test", description="Enter any string as test parameter")):
     return {"message": f"Successfully extracted URL param from GET request: {test}."}
 
+@app.get("/llm-cache/stats", tags=["System"])
+def llm_cache_stats():
+    """Get hit/miss counters of the shared LLM response cache"""
+    from services.llm_cache import llm_cache
+    return llm_cache.stats()
+
+@app.get("/job-search-cache/stats", tags=["System"])
+def job_search_cache_stats():
+    """Get hit/miss counters of the shared Adzuna result cache"""
+    return job_search_cache.stats()
+
+@app.get("/job-catalog/stats", tags=["System"])
+def job_catalog_stats():
+    """Get size and counters of the local job catalog"""
+    from services.job_catalog import job_catalog
+    return job_catalog.stats()
+
+@app.get("/job-prefetch/stats", tags=["System"])
+def job_prefetch_stats():
+    """Get run counters of the popular job search prefetch worker"""
+    return job_prefetcher.stats()
+
+@app.get("/ocr/stats", tags=["System"])
+def ocr_stats():
+    """Get queue depth and latency metrics of the OCR worker pool"""
+    return ocr_service.stats()
+
+@app.get("/dispatch/stats", tags=["System"])
+def dispatch_stats():
+    """Get queue time and run time metrics of the llm/cpu/io workload pools"""
+    return dispatcher.stats()
+
+@app.get("/mock-mate/crew-pool/stats", tags=["System"])
+def mock_mate_crew_pool_stats():
+    """Get how many MockMate crews were built and reused"""
+    from crews.mock_mate.crew_pool import crew_pool
+    return crew_pool.stats()
+
 @app.post("/agents/track_pal/{action}", tags=["Agents", "TrackPal"])
 async def track_pal_endpoint(action: str, request: AgentRequest):
     """Route requests to the TrackPal agent based on the action"""
@@ -71,29 +180,29 @@ async def track_pal_endpoint(action: str, request: AgentRequest):
     try:
         if action == "check_reminders":
             # Pass applications data if provided in the request
-            result = run_check_reminders(
+            result = await dispatcher.run("llm", run_check_reminders,
                 user_id=data.get("user_id"),
                 applications=data.get("applications")
             )
             return {"response": result}
         elif action == "analyze_patterns":
             # Pass applications data if provided in the request
-            result = run_analyze_patterns(
+            result = await dispatcher.run("llm", run_analyze_patterns,
                 user_id=data.get("user_id"),
                 applications=data.get("applications")
             )
             return {"response": result}
         elif action == "get_applications":
-            applications = get_applications(user_id=data.get("user_id"))
+            applications = await get_applications_async(user_id=data.get("user_id"))
             return {"applications": applications}
         elif action == "save_application":
-            application = save_application(
+            application = await save_application_async(
                 user_id=data.get("user_id"),
                 application=data.get("application", {})
             )
             return {"application": application}
         elif action == "update_application":
-            updated = update_application(
+            updated = await update_application_async(
                 user_id=data.get("user_id"),
                 app_id=data.get("app_id"),
                 updates=data.get("updates", {})
@@ -111,6 +220,41 @@ async def track_pal_endpoint(action: str, request: AgentRequest):
         print(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
 
+@app.post("/agents/mock_mate/respond/stream", tags=["Agents", "MockMate"])
+async def mock_mate_respond_stream(request: AgentRequest):
+    """
+    Streaming variant of /agents/mock_mate/respond (Server-Sent Events)
+    
+    Sends one "token" event per chunk as the model generates it and a final
+    "done" event with the full response, which is also saved to the session
+    history.
+    """
+    from crews.mock_mate.streaming import stream_respond_to_answer
+    
+    data = request.data
+    session_id = data.get("session_id")
+    user_response = data.get("user_response")
+    if not session_id or not user_response:
+        raise HTTPException(status_code=400, detail="'session_id' and 'user_response' are required.")
+    
+    async def event_stream():
+        chunks = []
+        try:
+            async for token in stream_respond_to_answer(user_response, session_id):
+                chunks.append(token)
+                yield f"event: token\ndata: {json.dumps({'token': token})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'response': ''.join(chunks)})}\n\n"
+        except Exception as e:
+            print(f"Error in mock_mate_respond_stream: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies (e.g. ngrok, nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/agents/mock_mate/{action}", tags=["Agents", "MockMate"])
 async def mock_mate_endpoint(action: str, request: AgentRequest):
     """Route requests to the MockMate agent based on the action"""
@@ -126,16 +270,16 @@ async def mock_mate_endpoint(action: str, request: AgentRequest):
             
             # Add user message to history
             if session_id:
-                add_message_to_history(session_id, "user", user_response)
+                await dispatcher.run("io", add_message_to_history, session_id, "user", user_response)
             
-            result = run_respond_to_answer(
+            result = await dispatcher.run("llm", run_respond_to_answer,
                 user_response=user_response,  # Changed parameter name
                 session_id=session_id
             )
             
             # Add agent response to history
             if session_id:
-                add_message_to_history(session_id, "assistant", result)
+                await dispatcher.run("io", add_message_to_history, session_id, "assistant", result)
                 
             return {"response": result}
         elif action == "start_interview":
@@ -150,16 +294,16 @@ async def mock_mate_endpoint(action: str, request: AgentRequest):
             # Initialize session if provided
             if session_id:
                 # Store metadata in session
-                set_session_metadata(session_id, "job_title", job_title)
-                set_session_metadata(session_id, "experience_level", experience_level)
-                set_session_metadata(session_id, "interview_type", interview_type)
-                set_session_metadata(session_id, "company_culture", company_culture)
+                await dispatcher.run("io", set_session_metadata, session_id, "job_title", job_title)
+                await dispatcher.run("io", set_session_metadata, session_id, "experience_level", experience_level)
+                await dispatcher.run("io", set_session_metadata, session_id, "interview_type", interview_type)
+                await dispatcher.run("io", set_session_metadata, session_id, "company_culture", company_culture)
                 
                 # Add system message to conversation history
-                add_message_to_history(session_id, "system", 
+                await dispatcher.run("io", add_message_to_history, session_id, "system", 
                     f"This is a mock {interview_type.lower()} interview for a {job_title} position at {experience_level} experience level.")
             
-            result = run_start_interview(
+            result = await dispatcher.run("llm", run_start_interview,
                 job_title=job_title,
                 experience_level=experience_level,
                 interview_type=interview_type,
@@ -168,7 +312,7 @@ async def mock_mate_endpoint(action: str, request: AgentRequest):
             
             # Add agent response to history
             if session_id:
-                add_message_to_history(session_id, "assistant", result)
+                await dispatcher.run("io", add_message_to_history, session_id, "assistant", result)
                 
             return {"response": result}
         elif action == "review":
@@ -177,16 +321,16 @@ async def mock_mate_endpoint(action: str, request: AgentRequest):
                 raise HTTPException(status_code=400, detail="'session_id' is required.")
 
             # Get conversation history from session
-            interview_transcript = get_conversation_history(session_id)
+            interview_transcript = await dispatcher.run("io", get_conversation_history, session_id)
             
             # Get job requirements if available
-            metadata = get_session_metadata(session_id)
+            metadata = await dispatcher.run("io", get_session_metadata, session_id)
             job_title = metadata.get("job_title")
             job_requirements = data.get("job_requirements", {"job_title": job_title})
             
             print(f"DEBUG: Running review_interview for session_id={session_id}")
 
-            result = run_review_interview(
+            result = await dispatcher.run("llm", run_review_interview,
                 interview_transcript=interview_transcript,
                 job_requirements=job_requirements
             )
@@ -201,7 +345,7 @@ async def mock_mate_endpoint(action: str, request: AgentRequest):
             
             print(f"DEBUG: Running prepare_custom_interview")
             
-            result = run_prepare_custom_interview(
+            result = await dispatcher.run("llm", run_prepare_custom_interview,
                 job_description=job_description,
                 required_skills=required_skills,
                 candidate_background=candidate_background
@@ -265,7 +409,7 @@ async def path_finder_search_jobs(request: AgentRequest):
             raise HTTPException(status_code=400, detail="Mindestens ein Suchkriterium (Job-Titel, Abschluss oder Interessen) muss angegeben werden")
             
         # Rufe die crewAI-Suchfunktion mit allen Parametern auf
-        result = run_path_finder_direct(
+        result = await dispatcher.run("llm", run_path_finder_direct,
             job_title=job_title,
             degree=degree,
             hard_skills_rating=hard_skills_rating,
@@ -278,7 +422,7 @@ async def path_finder_search_jobs(request: AgentRequest):
         # Speichere die Suchergebnisse in der MongoDB
         try:
             # Hole die job_searches Collection
-            job_searches_collection = mongo_client.get_collection("job_searches")
+            job_searches_collection = async_mongo_client.get_collection("job_searches")
             
             # Erstelle ein Dokument für die Suche
             search_document = {
@@ -296,7 +440,7 @@ async def path_finder_search_jobs(request: AgentRequest):
             }
             
             # Füge das Dokument in die Collection ein
-            job_searches_collection.insert_one(search_document)
+            await job_searches_collection.insert_one(search_document)
             print(f"Suchergebnisse für User {user_id} in MongoDB gespeichert")
         except Exception as db_error:
             print(f"Fehler beim Speichern der Suchergebnisse in MongoDB: {str(db_error)}")
@@ -311,7 +455,7 @@ async def path_finder_search_jobs(request: AgentRequest):
 async def path_finder_get_job(job_id: str, user_id: str = "default_user"):
     """Get details of a specific job"""
     try:
-        result = get_job_details(job_id, user_id)
+        result = await dispatcher.run("io", get_job_details, job_id, user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving job details: {str(e)}")
@@ -322,7 +466,7 @@ async def path_finder_analyze_job(job_id: str):
     try:
         # Verwende die neue Path Finder Crew-Funktion
         job_data = {"job_id": job_id}
-        result = run_path_finder_direct(job_title="Analyze Job", education_level="", years_experience=0, location_radius=0, interest_points="", job_data=job_data)
+        result = await dispatcher.run("llm", run_path_finder_direct, job_title="Analyze Job", education_level="", years_experience=0, location_radius=0, interest_points="", job_data=job_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing job requirements: {str(e)}")
@@ -341,7 +485,7 @@ async def path_finder_compare_skills(request: AgentRequest):
             
         # Verwende die neue Path Finder Crew-Funktion
         job_data = {"user_profile": user_profile, "job_ids": job_ids}
-        result = run_path_finder_direct(job_title="Compare Skills", education_level="", years_experience=0, location_radius=0, interest_points="", job_data=job_data)
+        result = await dispatcher.run("llm", run_path_finder_direct, job_title="Compare Skills", education_level="", years_experience=0, location_radius=0, interest_points="", job_data=job_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error comparing skills to jobs: {str(e)}")
@@ -353,7 +497,7 @@ async def path_finder_recommend_jobs(request: AgentRequest):
         user_id = request.data.get("user_id", "default_user")
         limit = request.data.get("limit", 3)
         
-        result = get_job_recommendations(user_id, limit)
+        result = await dispatcher.run("llm", get_job_recommendations, user_id, limit)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
@@ -369,7 +513,7 @@ async def path_finder_save_job(request: AgentRequest):
         if not job_data:
             raise HTTPException(status_code=400, detail="Job data is required")
             
-        result = save_job(user_id, job_data)
+        result = await save_job_async(user_id, job_data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
@@ -385,7 +529,7 @@ async def path_finder_unsave_job(request: AgentRequest):
         if not job_id:
             raise HTTPException(status_code=400, detail="Job ID is required")
             
-        result = unsave_job(user_id, job_id)
+        result = await unsave_job_async(user_id, job_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
@@ -395,7 +539,7 @@ async def path_finder_unsave_job(request: AgentRequest):
 async def path_finder_get_saved_jobs(user_id: str = "default_user"):
     """Get saved jobs for a user"""
     try:
-        result = get_saved_jobs(user_id)
+        result = await get_saved_jobs_async(user_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
@@ -405,8 +549,10 @@ async def path_finder_get_saved_jobs(user_id: str = "default_user"):
 async def upload_resume(file: UploadFile, user_id: Optional[str] = None):
     """Upload and parse a resume document"""
     try:
-        result = refiner_upload_and_parse(file, user_id)
+        result = await dispatcher.run("cpu", refiner_upload_and_parse, file, user_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error uploading resume: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -415,8 +561,10 @@ async def upload_resume(file: UploadFile, user_id: Optional[str] = None):
 async def analyze_resume_layout(upload_id: str, user_id: Optional[str] = None):
     """Analyze the layout of a parsed resume"""
     try:
-        result = refiner_analyze_layout(upload_id, user_id)
+        result = await dispatcher.run("cpu", refiner_analyze_layout, upload_id, user_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error analyzing resume layout: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -425,8 +573,10 @@ async def analyze_resume_layout(upload_id: str, user_id: Optional[str] = None):
 async def evaluate_resume(upload_id: str, user_id: Optional[str] = None):
     """Evaluate the quality of a parsed resume"""
     try:
-        result = refiner_evaluate_quality(upload_id, user_id)
+        result = await dispatcher.run("llm", refiner_evaluate_quality, upload_id, user_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error evaluating resume: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -435,8 +585,10 @@ async def evaluate_resume(upload_id: str, user_id: Optional[str] = None):
 async def match_resume_with_jobs(upload_id: str, job_descriptions: List[Dict[str, Any]], user_id: Optional[str] = None):
     """Match a resume against job descriptions"""
     try:
-        result = refiner_match_jobs(upload_id, job_descriptions, user_id)
+        result = await dispatcher.run("llm", refiner_match_jobs, upload_id, job_descriptions, user_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error matching resume with jobs: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -450,15 +602,17 @@ async def match_resume_with_saved_jobs(upload_id: str, user_id: str):
     """Match a resume against user's saved jobs from MongoDB"""
     try:
         # Get saved jobs and extract the list from the dictionary
-        saved_jobs_result = get_saved_jobs(user_id)
+        saved_jobs_result = await get_saved_jobs_async(user_id)
         saved_jobs_list = saved_jobs_result.get("saved_jobs", [])
         
         # Log the number of saved jobs found
         logger.info(f"Found {len(saved_jobs_list)} saved jobs for user {user_id}")
         
         # Match the resume with the saved jobs list
-        result = refiner_match_jobs(upload_id, saved_jobs_list, user_id)
+        result = await dispatcher.run("llm", refiner_match_jobs, upload_id, saved_jobs_list, user_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error matching resume with saved jobs: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -467,8 +621,8 @@ async def match_resume_with_saved_jobs(upload_id: str, user_id: str):
 async def get_resume_data(user_id: str, upload_id: str):
     """Get a parsed resume from MongoDB"""
     try:
-        from services.mongodb.mongodb_resume_utils import get_parsed_resume
-        result = get_parsed_resume(user_id, upload_id)
+        from services.mongodb.mongodb_resume_utils import get_parsed_resume_async
+        result = await get_parsed_resume_async(user_id, upload_id)
         if result:
             return {"status": "success", "data": result}
         else:
@@ -481,8 +635,8 @@ async def get_resume_data(user_id: str, upload_id: str):
 async def get_resume_job_matches(user_id: str, upload_id: str, job_id: Optional[str] = None):
     """Get job matching results for a resume"""
     try:
-        from services.mongodb.mongodb_resume_utils import get_job_matching_results
-        result = get_job_matching_results(user_id, upload_id, job_id)
+        from services.mongodb.mongodb_resume_utils import get_job_matching_results_async
+        result = await get_job_matching_results_async(user_id, upload_id, job_id)
         return {"status": "success", "data": result}
     except Exception as e:
         logger.error(f"Error getting resume job matches: {str(e)}")
@@ -493,10 +647,10 @@ async def resume_refiner_get_saved_jobs(user_id: str = "default_user"):
     """Get saved jobs for a user in a format suitable for ResumeRefiner"""
     try:
         # Get saved jobs from MongoDB
-        from services.mongodb.mongodb_resume_utils import get_saved_jobs_for_matching
+        from services.mongodb.mongodb_resume_utils import get_saved_jobs_for_matching_async
         
         # Get formatted jobs for matching
-        saved_jobs = get_saved_jobs_for_matching(user_id)
+        saved_jobs = await get_saved_jobs_for_matching_async(user_id)
         
         return {
             "status": "success", 
@@ -528,8 +682,10 @@ async def legacy_upload_resume(file: UploadFile = File(...), user_id: Optional[s
         effective_user_id = user_id if user_id else "default_user"
         
         # Use our new implementation but format the response to match the old format
-        result = refiner_upload_and_parse(file, effective_user_id)
+        result = await dispatcher.run("cpu", refiner_upload_and_parse, file, effective_user_id)
         return {"upload_id": result["upload_id"]}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error in legacy_upload_resume: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
@@ -538,10 +694,12 @@ async def legacy_upload_resume(file: UploadFile = File(...), user_id: Optional[s
 async def legacy_analyze_layout(upload_id: str):
     """Legacy endpoint for analyzing the layout of a resume PDF"""
     try:
-        result = refiner_analyze_layout(upload_id)
+        result = await dispatcher.run("cpu", refiner_analyze_layout, upload_id)
         return {"response": result}
     except FileNotFoundError:
         raise HTTPException(404, f"Resume with ID {upload_id} not found")
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing layout: {str(e)}")
 
@@ -550,20 +708,21 @@ async def legacy_parse_resume(upload_id: str):
     """Legacy endpoint for parsing a resume PDF and extracting sections"""
     try:
         # Get the parsed data from our new implementation
-        from services.mongodb.mongodb_resume_utils import get_parsed_resume
+        from services.mongodb.mongodb_resume_utils import get_parsed_resume_async
         
         # First try to get it from MongoDB if it was saved there
-        result = get_parsed_resume("test_user", upload_id)
+        result = await get_parsed_resume_async("test_user", upload_id)
         
         # If not found in MongoDB, parse it directly
         if not result or "parsed_data" not in result:
-            # Get the parsed data directly from the parser
-            crew = ResumeRefinerCrew()
-            result = {"parsed_data": crew.parser.parse_with_sections(upload_id)}
+            # Get the parsed data from the parser (cached per upload)
+            result = {"parsed_data": await dispatcher.run("cpu", refiner_get_parsed_data, upload_id)}
             
         return {"response": result["parsed_data"]}
     except FileNotFoundError:
         raise HTTPException(404, f"Resume with ID {upload_id} not found")
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
@@ -571,10 +730,12 @@ async def legacy_parse_resume(upload_id: str):
 async def legacy_evaluate_quality(upload_id: str):
     """Legacy endpoint for evaluating the quality of a resume"""
     try:
-        result = refiner_evaluate_quality(upload_id)
+        result = await dispatcher.run("llm", refiner_evaluate_quality, upload_id)
         return {"response": result}
     except FileNotFoundError:
         raise HTTPException(404, f"Resume with ID {upload_id} not found")
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error evaluating resume: {str(e)}")
 
@@ -582,10 +743,12 @@ async def legacy_evaluate_quality(upload_id: str):
 async def legacy_match_with_jobs(upload_id: str, job_descriptions: List[Dict[str, Any]]):
     """Legacy endpoint for matching a resume with job descriptions"""
     try:
-        result = refiner_match_jobs(upload_id, job_descriptions)
+        result = await dispatcher.run("llm", refiner_match_jobs, upload_id, job_descriptions)
         return {"response": result}
     except FileNotFoundError:
         raise HTTPException(404, f"Resume with ID {upload_id} not found")
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error matching resume with jobs: {str(e)}")
 
@@ -594,8 +757,10 @@ async def legacy_match_with_jobs(upload_id: str, job_descriptions: List[Dict[str
 async def upload_pdf(file: UploadFile):
     """Legacy endpoint - use /resume/upload instead"""
     try:
-        result = refiner_upload_and_parse(file)
+        result = await dispatcher.run("cpu", refiner_upload_and_parse, file)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error uploading PDF: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -604,8 +769,10 @@ async def upload_pdf(file: UploadFile):
 async def analyze_pdf_layout(upload_id: str):
     """Legacy endpoint - use /resume/layout instead"""
     try:
-        result = refiner_analyze_layout(upload_id)
+        result = await dispatcher.run("cpu", refiner_analyze_layout, upload_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error analyzing PDF layout: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -614,8 +781,10 @@ async def analyze_pdf_layout(upload_id: str):
 async def evaluate_pdf(upload_id: str):
     """Legacy endpoint - use /resume/evaluate instead"""
     try:
-        result = refiner_evaluate_quality(upload_id)
+        result = await dispatcher.run("llm", refiner_evaluate_quality, upload_id)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error evaluating PDF: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -624,8 +793,10 @@ async def evaluate_pdf(upload_id: str):
 async def match_pdf(upload_id: str, job_descriptions: List[Dict[str, Any]]):
     """Legacy endpoint - use /resume/match instead"""
     try:
-        result = refiner_match_jobs(upload_id, job_descriptions)
+        result = await dispatcher.run("llm", refiner_match_jobs, upload_id, job_descriptions)
         return {"status": "success", "data": result}
+    except OCRBusyError as e:
+        raise ocr_busy_error(e)
     except Exception as e:
         logger.error(f"Error matching PDF: {str(e)}")
         return {"status": "error", "message": str(e)}
@@ -635,7 +806,7 @@ async def match_pdf(upload_id: str, job_descriptions: List[Dict[str, Any]]):
 async def get_global_state():
     """Get the global state"""
     from services.mongodb.sync_service import sync_service
-    result = sync_service.get_backend_state()
+    result = await sync_service.get_backend_state_async()
     if result["success"]:
         return result
     else:
@@ -653,7 +824,7 @@ class KnowledgeUpdateRequest(BaseModel):
 async def sync_global_state(request: GlobalStateRequest):
     """Sync the global state between frontend and backend"""
     from services.mongodb.sync_service import sync_service
-    result = sync_service.sync_from_frontend(request.state)
+    result = await sync_service.sync_from_frontend_async(request.state)
     if result["success"]:
         return result
     else:
@@ -663,7 +834,7 @@ async def sync_global_state(request: GlobalStateRequest):
 async def update_knowledge(request: KnowledgeUpdateRequest):
     """Update a specific knowledge item in the global state"""
     from services.mongodb.sync_service import sync_service
-    result = sync_service.update_knowledge(request.key, request.value)
+    result = await sync_service.update_knowledge_async(request.key, request.value)
     if result["success"]:
         return result
     else:
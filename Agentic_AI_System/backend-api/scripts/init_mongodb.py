@@ -16,11 +16,15 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.mongodb.client import mongo_client
 from services.mongodb.global_state_service import DEFAULT_STATE, global_state
+from services.mongodb.saved_jobs_service import saved_jobs_service
 
 def init_mongodb():
     """Initialize MongoDB with necessary collections and default data"""
     print("Initializing MongoDB database...")
     
+    # Wait for the connection check so an alternative URI is used if needed
+    mongo_client.wait_for_discovery()
+    
     # Get database name
     db_name = mongo_client.db.name
     print(f"Using database: {db_name}")
@@ -31,7 +35,8 @@ def init_mongodb():
         "uploads",       # For storing resume uploads
         "jobs",          # For storing job listings
         "applications",  # For storing job applications
-        "interviews"     # For storing interview sessions
+        "interviews",    # For storing interview sessions
+        "saved_jobs"     # For storing saved jobs (one document per user and job)
     ]
     
     existing_collections = mongo_client.db.list_collection_names()
@@ -59,6 +64,9 @@ def init_mongodb():
     mongo_client.db.jobs.create_index("job_id", unique=True)
     mongo_client.db.applications.create_index([("user_id", 1), ("job_id", 1)], unique=True)
     
+    # Saved jobs indexes and one-time migration out of global_state
+    saved_jobs_service.ensure_ready()
+    
     print("MongoDB initialization complete.")
     
     # Print summary
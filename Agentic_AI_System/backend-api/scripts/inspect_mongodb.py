@@ -19,6 +19,8 @@ from services.mongodb.client import mongo_client
 def inspect_mongodb():
     """Untersucht die MongoDB-Datenbank und zeigt die Struktur und Inhalte an"""
     print("\n=== MongoDB Verbindungsinformationen ===")
+    # Auf die Verbindungsprüfung warten, damit ggf. eine alternative URI genutzt wird
+    mongo_client.wait_for_discovery()
     db_name = mongo_client.db.name
     print(f"Verbunden mit Datenbank: {db_name}")
     
@@ -24,7 +24,7 @@ from services.mongodb.mongodb_pathfinder_utils import (
     get_saved_jobs_for_user,
     is_job_saved
 )
-from services.mongodb.global_state_service import global_state
+from services.mongodb.saved_jobs_service import saved_jobs_service
 
 # Testbenutzer-ID
 TEST_USER_ID = "test_user"
@@ -80,12 +80,10 @@ def test_save_job():
     else:
         print("\n6. Keine Jobs gespeichert!")
     
-    # 7. Überprüfen des global_state direkt
-    print("\n7. Überprüfe global_state direkt...")
-    state = global_state.get_state(TEST_USER_ID)
-    job_search_data = state.get("agent_knowledge", {}).get("job_search", {})
-    saved_jobs_in_state = job_search_data.get("saved_jobs", [])
-    print(f"Anzahl Jobs im global_state: {len(saved_jobs_in_state)}")
+    # 7. Überprüfen der saved_jobs Collection direkt
+    print("\n7. Überprüfe saved_jobs Collection direkt...")
+    count = saved_jobs_service.collection.count_documents({"user_id": TEST_USER_ID})
+    print(f"Anzahl Jobs in der saved_jobs Collection: {count}")
     
     return result.get("success", False)
 
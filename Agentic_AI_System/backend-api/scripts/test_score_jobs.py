@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test-Skript für die vektorisierte Job-Bewertung (score_jobs).
+
+Dieses Skript:
+1. Erzeugt zufällige Jobs und Suchkriterien, auch mit Leerzeichen am Ende und \\x00
+2. Bewertet sie mit score_jobs und mit der früheren Bewertung pro Job
+3. Prüft, dass beide Bewertungen exakt gleich sind
+"""
+
+import sys
+import os
+import random
+from typing import Dict, List, Any
+
+import numpy as np
+
+# Path-Setup für den Import von Funktionen aus dem Backend-API
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+from crews.path_finder.job_scraper import score_jobs, calculate_match_score
+
+SEED = 2024
+JOBS_PER_ROUND = 500
+ROUNDS = 40
+
+# Bausteine mit Groß-/Kleinschreibung, Leerzeichen am Ende und \x00
+WORDS = [
+    "python", "Java", "machine learning", "Data", "scientist", "Engineer", "berlin",
+    "Bachelor", "Master", "sql ", " sql", "c++", "C#", "ml\x00", "\x00", "a\x00b", "", " ",
+    "Straße", "ÄRZTIN", "dev\t", "ops\n"
+]
+EXPERIENCE = [0, 1, 2, 3, 5, 8, 2.5, -1, True, float("nan"), float("inf"), "n/a", None, "3"]
+EDUCATION = ["", "Bachelor", "Master", "bachelor ", "PhD\x00", "\x00"]
+
+
+def reference_match_score(job: Dict[str, Any], job_title: str, education_level: str,
+                          years_experience: int, interest_points: List[str]) -> float:
+    """Frühere Bewertung pro Job, unverändert als Referenz übernommen"""
+    score = 0.0
+    max_score = 100.0
+
+    # Title match (max 30 points)
+    if job_title.lower() in job.get("title", "").lower():
+        score += 30.0
+    elif any(word.lower() in job.get("title", "").lower() for word in job_title.lower().split()):
+        score += 15.0
+
+    # Experience match (max 20 points)
+    job_exp = job.get("experience_required", 0)
+    if isinstance(job_exp, (int, float)):
+        exp_diff = abs(job_exp - years_experience)
+        if exp_diff == 0:
+            score += 20.0
+        elif exp_diff <= 2:
+            score += 15.0
+        elif exp_diff <= 4:
+            score += 10.0
+        else:
+            score += 5.0
+
+    # Education match (max 15 points)
+    job_edu = job.get("education_required", "").lower()
+    if education_level.lower() in job_edu:
+        score += 15.0
+
+    # Interest points match (max 35 points)
+    if interest_points:
+        points_per_interest = 35.0 / len(interest_points)
+        for point in interest_points:
+            # Check if interest point is in job description or skills
+            if point.lower() in job.get("description", "").lower():
+                score += points_per_interest
+            elif any(point.lower() in skill.lower() for skill in job.get("skills", [])):
+                score += points_per_interest
+
+    # Normalize score to be between 0 and 100
+    return min(score, max_score)
+
+
+def random_text(rng: random.Random, max_words: int) -> str:
+    """Zufälliger Text aus den Bausteinen"""
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, max_words)))
+
+
+def random_job(rng: random.Random, index: int) -> Dict[str, Any]:
+    """Zufälliger Job im Format von job_scraper"""
+    return {
+        "id": f"job-{index}",
+        "title": random_text(rng, 4),
+        "description": random_text(rng, 12),
+        "experience_required": rng.choice(EXPERIENCE),
+        "education_required": rng.choice(EDUCATION),
+        "skills": [random_text(rng, 2) for _ in range(rng.randint(0, 4))]
+    }
+
+
+def test_score_jobs() -> bool:
+    """Vergleicht score_jobs mit der Referenzbewertung"""
+    rng = random.Random(SEED)
+    mismatches = 0
+    for round_index in range(ROUNDS):
+        jobs = [random_job(rng, i) for i in range(JOBS_PER_ROUND)]
+        job_title = random_text(rng, 3)
+        education_level = rng.choice(EDUCATION)
+        years_experience = rng.choice([0, 1, 3, 5, 10])
+        interest_points = [random_text(rng, 2) for _ in range(rng.randint(0, 5))]
+
+        expected = np.array([
+            reference_match_score(job, job_title, education_level, years_experience, interest_points)
+            for job in jobs
+        ])
+        actual = score_jobs(jobs, job_title, education_level, years_experience, interest_points)
+        if not np.array_equal(actual, expected):
+            differing = np.flatnonzero(actual != expected)
+            mismatches += len(differing)
+            first = int(differing[0])
+            print(f"Runde {round_index}: {len(differing)} Abweichungen, z.B. Job {first}: "
+                  f"{actual[first]} statt {expected[first]}")
+            print(f"  Kriterien: {job_title!r}, {education_level!r}, {years_experience!r}, {interest_points!r}")
+            print(f"  Job: {jobs[first]!r}")
+
+        # Die Einzelbewertung muss ebenfalls übereinstimmen
+        single = calculate_match_score(jobs[0], job_title, education_level, years_experience, interest_points)
+        if single != expected[0]:
+            mismatches += 1
+            print(f"Runde {round_index}: calculate_match_score {single} statt {expected[0]}")
+
+    print(f"{ROUNDS * JOBS_PER_ROUND} Jobs verglichen, {mismatches} Abweichungen")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    print("=== Test der vektorisierten Job-Bewertung ===")
+    success = test_score_jobs()
+    print("\nTest abgeschlossen.")
+    print(f"Ergebnis: {'ERFOLGREICH' if success else 'FEHLGESCHLAGEN'}")
+    sys.exit(0 if success else 1)
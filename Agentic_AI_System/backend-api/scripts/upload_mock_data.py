@@ -145,6 +145,8 @@ MOCK_INTERVIEWS = [
 def upload_mock_data():
     """Lädt Beispieldaten in die MongoDB-Datenbank"""
     print("\n=== Lade Beispieldaten in MongoDB ===")
+    # Auf die Verbindungsprüfung warten, damit ggf. eine alternative URI genutzt wird
+    mongo_client.wait_for_discovery()
     
     # Benutzer-ID
     user_id = "default_user"
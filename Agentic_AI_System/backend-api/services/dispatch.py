@@ -0,0 +1,142 @@
+"""
+Dispatch layer that keeps blocking work off the event loop.
+
+The FastAPI handlers are async, but crew kickoffs, LLM completions, OCR and
+embedding calls are synchronous and take seconds. Running them inline freezes
+every other request of the worker. Instead, handlers await dispatcher.run()
+with a workload name, and the call runs on a thread pool sized for that
+workload:
+
+- "llm": crew kickoffs and LLM calls, mostly waiting on Ollama (DISPATCH_LLM_WORKERS)
+- "cpu": OCR and embedding work (DISPATCH_CPU_WORKERS)
+- "io":  external HTTP APIs and other blocking I/O (DISPATCH_IO_WORKERS)
+
+Separate pools mean a burst of slow LLM work cannot starve OCR or I/O, and
+the event loop stays free for health checks and CRUD routes. The caller's
+context variables (e.g. the request's global state unit of work) are carried
+into the worker thread.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Workload name -> (environment variable, default worker count)
+WORKLOADS = {
+    "llm": ("DISPATCH_LLM_WORKERS", 4),
+    "cpu": ("DISPATCH_CPU_WORKERS", max(2, min(4, os.cpu_count() or 2))),
+    "io": ("DISPATCH_IO_WORKERS", 16),
+}
+
+
+class _Workload:
+    """One thread pool with queue and latency metrics"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"dispatch-{name}")
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0}
+        # Recent (queue wait, run time) durations
+        self.latencies = deque(maxlen=200)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            waits = sorted(wait for wait, _ in self.latencies)
+            runs = sorted(run for _, run in self.latencies)
+            return {
+                **self.counters,
+                "workers": self.workers,
+                "queued": self.queued,
+                "running": self.running,
+                "avg_queue_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p95_queue_seconds": round(waits[int(len(waits) * 0.95) - 1], 3) if waits else 0.0,
+                "avg_run_seconds": round(sum(runs) / len(runs), 3) if runs else 0.0,
+                "p95_run_seconds": round(runs[int(len(runs) * 0.95) - 1], 3) if runs else 0.0
+            }
+
+
+class WorkloadDispatcher:
+    """
+    Runs blocking calls on per-workload thread pools
+    """
+
+    def __init__(self, sizes: Dict[str, int] = None):
+        """
+        Initialize the pools. Threads are started on demand by the executors.
+
+        Args:
+            sizes: Worker count per workload; defaults to the DISPATCH_* variables
+        """
+        sizes = sizes or {}
+        self._workloads = {
+            name: _Workload(name, max(1, sizes.get(name) or int(os.getenv(env, str(default)))))
+            for name, (env, default) in WORKLOADS.items()
+        }
+
+    async def run(self, workload: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the pool of a workload and await its result
+
+        Args:
+            workload: "llm", "cpu" or "io"
+            fn: The blocking function
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            The return value of fn
+        """
+        pool = self._workloads[workload]
+        context = contextvars.copy_context()
+        call = partial(fn, *args, **kwargs)
+        submitted_at = time.time()
+
+        def timed_call():
+            started_at = time.time()
+            with pool.lock:
+                pool.queued -= 1
+                pool.running += 1
+            try:
+                return context.run(call)
+            finally:
+                with pool.lock:
+                    pool.running -= 1
+                    pool.latencies.append((started_at - submitted_at, time.time() - started_at))
+
+        with pool.lock:
+            pool.queued += 1
+            pool.counters["submitted"] += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(pool.executor, timed_call)
+        except Exception:
+            with pool.lock:
+                pool.counters["failed"] += 1
+            raise
+        with pool.lock:
+            pool.counters["completed"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return worker counts, queue depth and latency metrics per workload"""
+        return {name: pool.stats() for name, pool in self._workloads.items()}
+
+    def shutdown(self) -> None:
+        """Stop accepting work and let running calls finish in the background"""
+        for pool in self._workloads.values():
+            pool.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Create a singleton instance
+dispatcher = WorkloadDispatcher()
@@ -0,0 +1,191 @@
+"""
+Persistent store for job text embeddings.
+
+Vectors are keyed by a content hash of the embedded text and kept in an
+append-only float16 file that is memory-mapped for reads, so they survive
+restarts and are shared through the page cache instead of being loaded into
+every worker's heap. The hash -> row index is an append-only sidecar file.
+Appends from several worker processes are serialized with a file lock.
+"""
+
+import os
+import fcntl
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """
+    Memory-mapped float16 embedding matrix with a content-hash index
+    """
+
+    def __init__(self, model_name: str, dim: int, directory: str = None):
+        """
+        Open (or create) the store for one embedding model
+
+        Args:
+            model_name: Name of the embedding model, used to keep stores apart
+            dim: Embedding dimension of the model
+            directory: Storage directory (defaults to EMBEDDING_STORE_DIR)
+        """
+        self.model_name = model_name
+        self.dim = dim
+        self.directory = directory or os.getenv("EMBEDDING_STORE_DIR", "/tmp/embeddings")
+        os.makedirs(self.directory, exist_ok=True)
+
+        base = os.path.join(self.directory, model_name.replace("/", "_"))
+        self.vectors_path = f"{base}.f16"
+        self.index_path = f"{base}.index"
+        self.lock_path = f"{base}.lock"
+        for path in (self.vectors_path, self.index_path):
+            open(path, "ab").close()
+
+        self._row_bytes = dim * np.dtype(np.float16).itemsize
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Content hash used as the key of a text's embedding"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index)
+
+    def get_many(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up stored vectors
+
+        Args:
+            hashes: Content hashes to look up
+
+        Returns:
+            Mapping of hash to float32 vector for the hashes that are stored
+        """
+        with self._lock:
+            self._refresh_index()
+            rows = {h: self._index[h] for h in hashes if h in self._index}
+            if not rows:
+                return {}
+            matrix = self._get_matrix(max(rows.values()) + 1)
+            return {h: np.asarray(matrix[row], dtype=np.float32) for h, row in rows.items()}
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        """
+        Append vectors that are not stored yet
+
+        Args:
+            vectors: Mapping of content hash to (normalized) vector
+        """
+        if not vectors:
+            return
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            # Other workers may append concurrently, serialize on the lock file
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh_index()
+                new_items = [(h, v) for h, v in vectors.items() if h not in self._index]
+                if not new_items:
+                    return
+
+                next_row = os.path.getsize(self.vectors_path) // self._row_bytes
+                # Vectors are written (and flushed) before their index lines, so
+                # every indexed row is always present in the vectors file
+                with open(self.vectors_path, "ab") as f:
+                    f.truncate(next_row * self._row_bytes)  # drop a partial row left by a crash
+                    for _, vector in new_items:
+                        f.write(np.asarray(vector, dtype=np.float16).reshape(self.dim).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.index_path, "a") as f:
+                    for i, (text_hash, _) in enumerate(new_items):
+                        f.write(f"{text_hash}\t{next_row + i}\n")
+                self._refresh_index()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def encode(self, model, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Get normalized embeddings for texts, encoding only those not stored yet
+
+        Args:
+            model: SentenceTransformer used for texts missing from the store
+            texts: Texts to embed
+            batch_size: Encoder batch size for the missing texts
+
+        Returns:
+            float32 matrix with one normalized row per text
+        """
+        hashes = [self.text_hash(text) for text in texts]
+        found = self.get_many(list(set(hashes)))
+
+        missing = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in found and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            encoded = model.encode(list(missing.values()), batch_size=batch_size,
+                                   convert_to_numpy=True, normalize_embeddings=True)
+            new_vectors = dict(zip(missing.keys(), encoded))
+            try:
+                self.put_many(new_vectors)
+            except Exception as e:
+                logger.warning(f"Could not persist {len(new_vectors)} embeddings: {str(e)}")
+            found.update({h: np.asarray(v, dtype=np.float32) for h, v in new_vectors.items()})
+
+        logger.info(f"Embedding store: {len(texts) - len(missing)} cached, {len(missing)} encoded")
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([found[h] for h in hashes])
+
+    def _refresh_index(self) -> None:
+        """Read index lines appended since the last refresh (lock held)"""
+        with open(self.index_path, "r") as f:
+            f.seek(self._index_offset)
+            while True:
+                line = f.readline()
+                # Stop at a line another process is still writing
+                if not line.endswith("\n"):
+                    break
+                text_hash, row = line.rstrip("\n").split("\t")
+                self._index[text_hash] = int(row)
+                self._index_offset = f.tell()
+
+    def _get_matrix(self, min_rows: int) -> np.memmap:
+        """Return a read-only mapping that covers at least min_rows rows (lock held)"""
+        if self._matrix is None or self._matrix.shape[0] < min_rows:
+            rows = os.path.getsize(self.vectors_path) // self._row_bytes
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim))
+        return self._matrix
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model_name: str, dim: int) -> EmbeddingStore:
+    """
+    Get the shared store for an embedding model
+
+    Args:
+        model_name: Name of the embedding model
+        dim: Embedding dimension of the model
+
+    Returns:
+        The process-wide EmbeddingStore for the model
+    """
+    with _stores_lock:
+        if model_name not in _stores:
+            _stores[model_name] = EmbeddingStore(model_name, dim)
+        return _stores[model_name]
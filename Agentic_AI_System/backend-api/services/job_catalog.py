@@ -0,0 +1,260 @@
+"""
+Local catalog of known job listings with BM25 search.
+
+Every job fetched from Adzuna is added to an in-memory inverted index over
+title, skills and description, and on first use the catalog is seeded with
+the jobs stored in the job_searches history. Job searches are answered from
+this index first and only go to Adzuna when it has too few matches, which
+keeps search latency low and lets searches work while Adzuna is down. When
+the newest listing of a catalog answer is older than JOB_CACHE_TTL, the search
+is fetched again in the background, so new postings show up.
+
+Jobs that have not been seen for JOB_CATALOG_MAX_AGE seconds drop out, and
+the catalog holds at most JOB_CATALOG_MAX_JOBS listings (least recently seen
+are evicted first).
+"""
+
+import os
+import re
+import math
+import time
+import heapq
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# A title term counts like this many description terms
+FIELD_WEIGHTS = {"title": 3, "skills": 2, "description": 1}
+
+_TOKEN_RE = re.compile(r"[\w+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps terms like c++ and c#"""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class JobCatalog:
+    """
+    In-memory inverted index of job listings, ranked with BM25
+    """
+
+    def __init__(self, max_jobs: int = None, max_age_seconds: int = None, history_searches: int = None):
+        """
+        Initialize the catalog. Unset arguments are read from the environment.
+
+        Args:
+            max_jobs: Maximum number of listings (JOB_CATALOG_MAX_JOBS)
+            max_age_seconds: Seconds a listing stays after it was last seen (JOB_CATALOG_MAX_AGE)
+            history_searches: Number of recent job_searches documents to seed from (JOB_CATALOG_HISTORY_SEARCHES)
+        """
+        self.max_jobs = max_jobs if max_jobs is not None else int(os.getenv("JOB_CATALOG_MAX_JOBS", "50000"))
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else int(os.getenv("JOB_CATALOG_MAX_AGE", "259200"))
+        self.history_searches = history_searches if history_searches is not None else int(os.getenv("JOB_CATALOG_HISTORY_SEARCHES", "500"))
+
+        # job id -> {"job", "location", "terms", "length", "seen_at"}, least recently seen first
+        self._docs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # term -> {job id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        self._seeded = False
+        self._counters = {"searches": 0, "added": 0, "updated": 0, "evicted": 0}
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]], location: str = "de", seen_at: float = None) -> int:
+        """
+        Add or refresh job listings
+
+        Args:
+            jobs: Job dicts in the standardized job_scraper format
+            location: Adzuna country code the jobs were found in
+            seen_at: When the jobs were seen (defaults to now)
+
+        Returns:
+            Number of listings that were new to the catalog
+        """
+        seen_at = seen_at or time.time()
+        if seen_at < time.time() - self.max_age_seconds:
+            return 0
+        added = 0
+        with self._lock:
+            for job in jobs:
+                job_id = str(job.get("id") or "")
+                if not job_id:
+                    continue
+                job = {key: value for key, value in job.items() if key != "match_score"}
+                existing = self._docs.get(job_id)
+                if existing is not None and existing["job"].get("title") == job.get("title") \
+                        and existing["job"].get("description") == job.get("description"):
+                    # Same listing again, only refresh it
+                    existing["job"] = job
+                    existing["seen_at"] = max(existing["seen_at"], seen_at)
+                    self._docs.move_to_end(job_id)
+                    continue
+                if existing is not None:
+                    self._remove(job_id)
+                    self._counters["updated"] += 1
+                else:
+                    added += 1
+                self._insert(job_id, job, location, seen_at)
+            self._counters["added"] += added
+            self._prune()
+        return added
+
+    def search(self, query: str, location: str = "de", limit: int = 100, required: str = None) -> List[Dict[str, Any]]:
+        """
+        Rank catalog listings against a query with BM25
+
+        Args:
+            query: Search text (job title and keywords)
+            location: Only return jobs found in this Adzuna country
+            limit: Maximum number of listings to return
+            required: Text whose terms must all appear in a listing (e.g. the job title)
+
+        Returns:
+            Copies of the best matching job dicts, best first
+        """
+        self._seed_in_background()
+        terms = set(tokenize(query)) | set(tokenize(required))
+        required_terms = set(tokenize(required))
+        with self._lock:
+            self._counters["searches"] += 1
+            self._prune()
+            if not self._docs or not terms:
+                return []
+
+            candidates = None
+            if required_terms:
+                # Intersect the shortest posting lists first
+                for term in sorted(required_terms, key=lambda t: len(self._postings.get(t, ()))):
+                    postings = self._postings.get(term, {})
+                    candidates = set(postings) if candidates is None else candidates & postings.keys()
+                    if not candidates:
+                        return []
+
+            total = len(self._docs)
+            average_length = self._total_length / total
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for job_id, frequency in postings.items():
+                    if candidates is not None and job_id not in candidates:
+                        continue
+                    length = self._docs[job_id]["length"]
+                    norm = frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+                    scores[job_id] = scores.get(job_id, 0.0) + idf * norm
+
+            # Seeded history may be older than listings seen since, so check age here as well
+            expired_before = time.time() - self.max_age_seconds
+            matches = (
+                item for item in scores.items()
+                if self._docs[item[0]]["location"] == location and self._docs[item[0]]["seen_at"] >= expired_before
+            )
+            best = heapq.nlargest(limit, matches, key=lambda item: item[1])
+            return [dict(self._docs[job_id]["job"]) for job_id, _ in best]
+
+    def newest_seen_at(self, job_ids: Iterable[str]) -> float:
+        """
+        When the most recently seen of some listings was last seen
+
+        Args:
+            job_ids: IDs of catalog listings, e.g. of a search result
+
+        Returns:
+            Unix time, or 0 if none of the listings is in the catalog
+        """
+        with self._lock:
+            return max((self._docs[job_id]["seen_at"] for job_id in map(str, job_ids) if job_id in self._docs), default=0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return catalog size and counters"""
+        with self._lock:
+            return {
+                **self._counters,
+                "jobs": len(self._docs),
+                "terms": len(self._postings),
+                "max_jobs": self.max_jobs,
+                "max_age_seconds": self.max_age_seconds,
+                "seeded": self._seeded
+            }
+
+    def clear(self) -> None:
+        """Drop all listings"""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._total_length = 0
+
+    def _insert(self, job_id: str, job: Dict[str, Any], location: str, seen_at: float) -> None:
+        """Index a listing (lock held)"""
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = job.get(field)
+            text = " ".join(value) if isinstance(value, list) else str(value or "")
+            for token in tokenize(text):
+                terms[token] += weight
+        length = sum(terms.values())
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[job_id] = frequency
+        self._docs[job_id] = {"job": job, "location": location, "terms": list(terms), "length": length, "seen_at": seen_at}
+        self._total_length += length
+
+    def _remove(self, job_id: str) -> None:
+        """Remove a listing from the index (lock held)"""
+        doc = self._docs.pop(job_id)
+        for term in doc["terms"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= doc["length"]
+
+    def _prune(self) -> None:
+        """Evict listings that are too old or over capacity, least recently seen first (lock held)"""
+        expired_before = time.time() - self.max_age_seconds
+        while self._docs:
+            job_id, doc = next(iter(self._docs.items()))
+            if len(self._docs) <= self.max_jobs and doc["seen_at"] >= expired_before:
+                break
+            self._remove(job_id)
+            self._counters["evicted"] += 1
+
+    def _seed_in_background(self) -> None:
+        """Load the jobs of recent job_searches once, without blocking the first search"""
+        with self._lock:
+            if self._seeded:
+                return
+            self._seeded = True
+        threading.Thread(target=self._seed_from_history, name="job-catalog-seed", daemon=True).start()
+
+    def _seed_from_history(self) -> None:
+        """Add the result jobs stored in the job_searches collection"""
+        try:
+            from services.mongodb.client import mongo_client
+            cursor = mongo_client.get_collection("job_searches").find(
+                {}, {"results.top_jobs": 1, "results.jobs": 1, "timestamp": 1}
+            ).sort("timestamp", -1).limit(self.history_searches)
+            added = 0
+            for doc in cursor:
+                results = doc.get("results") or {}
+                timestamp = doc.get("timestamp")
+                seen_at = timestamp.timestamp() if hasattr(timestamp, "timestamp") else None
+                jobs = results.get("top_jobs") or results.get("jobs") or []
+                added += self.add_jobs((job for job in jobs if isinstance(job, dict)), seen_at=seen_at)
+            print(f"Job catalog seeded with {added} jobs from the search history")
+        except Exception as e:
+            logger.warning(f"Seeding the job catalog from job_searches failed: {str(e)}")
+
+
+# Create a singleton instance
+job_catalog = JobCatalog()
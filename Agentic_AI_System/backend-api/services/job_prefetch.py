@@ -0,0 +1,264 @@
+"""
+Background prefetching of popular job searches.
+
+The job_searches collection records every PathFinder search. A background
+thread periodically takes the most frequent (job title, interests)
+combinations of the last JOB_PREFETCH_LOOKBACK_DAYS days and fetches the
+Adzuna pages of the same queries an interactive search sends. That fills the
+job search cache under the keys those searches look up, and the local job
+catalog with normalized listings. Optionally it also precomputes the
+embeddings and extracted skills of their descriptions for resume matching.
+Interactive searches for popular criteria then find warm data instead of
+doing this work on the request path.
+
+Prefetching spends Adzuna quota, so it is off by default. When enabled, the
+API workers share a lease in MongoDB and only the holder runs. Only pages
+that are missing from the cache or stale are fetched, each exactly once and
+in the foreground, and each run fetches at most JOB_PREFETCH_MAX_PAGES pages.
+"""
+
+import os
+import sys
+import time
+import uuid
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobPrefetcher:
+    """
+    Periodic worker that warms job data for the most frequent searches
+    """
+
+    LOCK_COLLECTION = "job_prefetch_lock"
+
+    def __init__(self, enabled: bool = None, interval_seconds: int = None, top_searches: int = None,
+                 lookback_days: int = None, precompute: bool = None, max_pages: int = None):
+        """
+        Initialize the worker. Unset arguments are read from the environment.
+
+        Args:
+            enabled: Run the worker at all (JOB_PREFETCH_ENABLED)
+            interval_seconds: Seconds between runs (JOB_PREFETCH_INTERVAL)
+            top_searches: Number of most frequent searches to prefetch (JOB_PREFETCH_TOP_SEARCHES)
+            lookback_days: Days of search history to count (JOB_PREFETCH_LOOKBACK_DAYS)
+            precompute: Also precompute embeddings and skills (JOB_PREFETCH_EMBEDDINGS)
+            max_pages: Adzuna pages a run may fetch at most (JOB_PREFETCH_MAX_PAGES)
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("JOB_PREFETCH_ENABLED", "false").lower() == "true"
+        self.interval_seconds = interval_seconds if interval_seconds is not None else int(os.getenv("JOB_PREFETCH_INTERVAL", "1800"))
+        self.top_searches = top_searches if top_searches is not None else int(os.getenv("JOB_PREFETCH_TOP_SEARCHES", "20"))
+        self.lookback_days = lookback_days if lookback_days is not None else int(os.getenv("JOB_PREFETCH_LOOKBACK_DAYS", "7"))
+        self.precompute = precompute if precompute is not None else os.getenv("JOB_PREFETCH_EMBEDDINGS", "false").lower() == "true"
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv("JOB_PREFETCH_MAX_PAGES", "20"))
+        self.initial_delay = int(os.getenv("JOB_PREFETCH_INITIAL_DELAY", "30"))
+        # Identifies this worker in the shared lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counters = {"runs": 0, "failed_runs": 0, "skipped_runs": 0, "searches": 0, "fresh_searches": 0,
+                          "pages": 0, "jobs": 0, "precomputed": 0}
+        self._last_run: Dict[str, Any] = {}
+
+    def start(self) -> None:
+        """Start the background thread (no-op if disabled or already running)"""
+        with self._lock:
+            if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="job-prefetch", daemon=True)
+            self._thread.start()
+        print(f"Job prefetch worker started (every {self.interval_seconds}s, top {self.top_searches} searches)")
+
+    def stop(self) -> None:
+        """Ask the background thread to stop after the current search"""
+        self._stop.set()
+
+    def popular_searches(self) -> List[Tuple[str, List[str]]]:
+        """
+        Get the most frequent job searches
+
+        Searches are grouped by job title and interests, case-insensitively;
+        the most recent spelling is returned.
+
+        Returns:
+            (job title, interest points) tuples, most frequent first
+        """
+        from services.mongodb.client import mongo_client
+        since = datetime.now() - timedelta(days=self.lookback_days)
+        interests = {"$cond": [{"$eq": [{"$type": "$search_criteria.interests"}, "string"]}, "$search_criteria.interests", ""]}
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": since}, "search_criteria.job_title": {"$type": "string", "$ne": ""}}},
+            {"$sort": {"timestamp": -1}},
+            {"$group": {
+                "_id": {
+                    "job_title": {"$toLower": {"$trim": {"input": "$search_criteria.job_title"}}},
+                    "interests": {"$toLower": {"$trim": {"input": interests}}}
+                },
+                "job_title": {"$first": "$search_criteria.job_title"},
+                "interests": {"$first": interests},
+                "count": {"$sum": 1}
+            }},
+            {"$sort": {"count": -1}},
+            {"$limit": self.top_searches}
+        ]
+        collection = mongo_client.get_collection("job_searches")
+        searches = []
+        for doc in collection.aggregate(pipeline):
+            if not doc["_id"]["job_title"]:
+                continue
+            # Split like run_path_finder_direct does before searching
+            interest_points = [point.strip() for point in doc["interests"].split(",") if point.strip()]
+            searches.append((doc["job_title"].strip(), interest_points))
+        return searches
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Prefetch the popular searches once
+
+        For each search, the result pages of its Adzuna queries that are
+        missing from the job search cache or stale are fetched. Searches whose
+        pages are all fresh are skipped, and the run stops before a search
+        that would exceed the page budget.
+
+        Returns:
+            Summary of the run
+        """
+        from crews.path_finder.adzuna_client import adzuna_client
+        from crews.path_finder.job_scraper import adzuna_queries, refresh_adzuna_pages, CANDIDATE_POOL
+        from services.job_search_cache import job_search_cache
+
+        started_at = time.time()
+        searches = self.popular_searches()
+        prefetched: List[Dict[str, Any]] = []
+        seen = set()
+        fresh = 0
+        pages = 0
+        jobs_fetched = 0
+        precomputed = 0
+        for job_title, interest_points in searches:
+            if self._stop.is_set():
+                break
+            # The same queries and pages as search_jobs_online, so the cache keys match
+            queries = [job_search_cache.normalize_query(query) for query in adzuna_queries(job_title, interest_points)]
+            queries = [query for query in dict.fromkeys(queries) if query]
+            if not queries or tuple(queries) in seen:
+                continue
+            seen.add(tuple(queries))
+            pages_per_query = adzuna_client.pages_for(CANDIDATE_POOL, len(queries))
+            missing = [
+                (query, "de", page) for page in range(1, pages_per_query + 1) for query in queries
+                if not job_search_cache.is_fresh(query, "de", page)
+            ]
+            if not missing:
+                fresh += 1
+                continue
+            if pages + len(missing) > self.max_pages:
+                break
+            # Each missing page is fetched once and stored in the cache and the catalog
+            jobs = refresh_adzuna_pages(missing)
+            prefetched.append({"job_title": job_title, "interest_points": interest_points})
+            pages += len(missing)
+            jobs_fetched += len(jobs)
+            if self.precompute and jobs:
+                precomputed += self._precompute(jobs)
+
+        summary = {
+            "searches": prefetched,
+            "fresh_searches": fresh,
+            "pages": pages,
+            "jobs": jobs_fetched,
+            "precomputed": precomputed,
+            "duration_seconds": round(time.time() - started_at, 2),
+            "finished_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._counters["runs"] += 1
+            self._counters["searches"] += len(prefetched)
+            self._counters["fresh_searches"] += fresh
+            self._counters["pages"] += pages
+            self._counters["jobs"] += jobs_fetched
+            self._counters["precomputed"] += precomputed
+            self._last_run = summary
+        print(f"Job prefetch: {jobs_fetched} jobs from {pages} pages for {len(prefetched)} popular searches "
+              f"({fresh} already fresh) in {summary['duration_seconds']}s")
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        """Return run counters and the summary of the last run"""
+        with self._lock:
+            return {
+                **self._counters,
+                "enabled": self.enabled,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "interval_seconds": self.interval_seconds,
+                "top_searches": self.top_searches,
+                "max_pages": self.max_pages,
+                "last_run": self._last_run
+            }
+
+    def _precompute(self, jobs: List[Dict[str, Any]]) -> int:
+        """Embed and extract skills of the job descriptions for resume matching"""
+        # Importing the module builds the ResumeRefinerCrew and its sentence
+        # transformer, so only use it where the API has already loaded it
+        refiner = sys.modules.get("crews.resume_refiner.run_resume_refiner_crew")
+        if refiner is None:
+            logger.debug("Resume refiner not loaded in this process, skipping job precompute")
+            return 0
+        try:
+            return refiner.precompute_job_matching(jobs)
+        except Exception as e:
+            logger.warning(f"Precomputing job embeddings failed: {str(e)}")
+            return 0
+
+    def _acquire_lease(self) -> bool:
+        """
+        Take or renew the prefetch lease shared by all workers
+
+        The lease lasts one interval, so at most one worker prefetches per
+        interval; if the holder stops, another worker takes over once it expires.
+
+        Returns:
+            True if this worker holds the lease
+        """
+        from pymongo.errors import DuplicateKeyError
+        from services.mongodb.client import mongo_client
+        now = datetime.utcnow()
+        try:
+            mongo_client.get_collection(self.LOCK_COLLECTION).update_one(
+                {"_id": "leader", "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.interval_seconds)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # Another worker holds a lease that has not expired
+            return False
+
+    def _loop(self) -> None:
+        """Run until stopped; the first run waits for the API to finish starting"""
+        if self._stop.wait(self.initial_delay):
+            return
+        while not self._stop.is_set():
+            try:
+                if self._acquire_lease():
+                    self.run_once()
+                else:
+                    with self._lock:
+                        self._counters["skipped_runs"] += 1
+            except Exception as e:
+                with self._lock:
+                    self._counters["failed_runs"] += 1
+                logger.warning(f"Job prefetch run failed: {str(e)}")
+            self._stop.wait(self.interval_seconds)
+
+
+# Create a singleton instance
+job_prefetcher = JobPrefetcher()
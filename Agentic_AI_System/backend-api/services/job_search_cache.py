@@ -0,0 +1,295 @@
+"""
+Shared cache for Adzuna search result pages.
+
+Many users search for the same titles, so result pages are cached per
+normalized (query, location, page). An entry is fresh for JOB_CACHE_TTL
+seconds. After that it is still served for up to JOB_CACHE_STALE_TTL seconds
+while a background refresh fetches the page again (stale-while-revalidate),
+so popular searches never wait for the network. Entries live in an in-memory
+LRU tier and, optionally, in a MongoDB collection shared by all workers.
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Results = List[Dict[str, Any]]
+
+
+class JobSearchCache:
+    """
+    Two-tier (memory LRU + optional MongoDB) cache for Adzuna result pages
+    with TTL, stale-while-revalidate and hit/miss counters.
+    """
+
+    COLLECTION_NAME = "job_search_cache"
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None, stale_seconds: int = None,
+                 use_mongo: bool = None, enabled: bool = None):
+        """
+        Initialize the cache. Unset arguments are read from the environment.
+
+        Args:
+            max_entries: Maximum result pages in the memory tier (JOB_CACHE_SIZE)
+            ttl_seconds: Seconds a page is fresh (JOB_CACHE_TTL)
+            stale_seconds: Seconds a page may be served stale while it is refreshed (JOB_CACHE_STALE_TTL)
+            use_mongo: Enable the MongoDB tier (JOB_CACHE_MONGO)
+            enabled: Enable caching at all (JOB_CACHE_ENABLED)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("JOB_CACHE_SIZE", "256"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("JOB_CACHE_TTL", "3600"))
+        self.stale_seconds = stale_seconds if stale_seconds is not None else int(os.getenv("JOB_CACHE_STALE_TTL", "86400"))
+        self.use_mongo = use_mongo if use_mongo is not None else os.getenv("JOB_CACHE_MONGO", "false").lower() == "true"
+        self.enabled = enabled if enabled is not None else os.getenv("JOB_CACHE_ENABLED", "true").lower() == "true"
+
+        # key -> (results, fetched_at)
+        self._entries: "OrderedDict[str, Tuple[Results, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher = None
+        self._collection = None
+        self._counters = {"hits": 0, "stale_hits": 0, "mongo_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize a search query so equivalent searches share an entry
+
+        Adzuna matches all keywords regardless of order, so the query is
+        lowercased and its unique words are sorted.
+
+        Args:
+            query: Search query (job title and keywords)
+
+        Returns:
+            The normalized query
+        """
+        words = re.findall(r"[^\s,;]+", (query or "").lower())
+        return " ".join(sorted(set(words)))
+
+    @classmethod
+    def make_key(cls, query: str, location: str, page: int) -> str:
+        """
+        Build the cache key of a result page
+
+        Args:
+            query: Search query, normalized or not
+            location: Adzuna country code
+            page: Page number
+
+        Returns:
+            SHA-256 hex digest of the normalized search
+        """
+        payload = f"{cls.normalize_query(query)}|{(location or '').lower()}|{int(page)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_fetch(self, query: str, location: str, page: int, fetch: Callable[[], Results]) -> Results:
+        """
+        Return a cached result page, or run fetch() and cache it
+
+        A stale page is returned right away and refreshed in the background.
+        Empty results are returned but never cached, so failed calls are
+        retried next time.
+
+        Args:
+            query: Normalized search query
+            location: Adzuna country code
+            page: Page number
+            fetch: Function performing the actual API call
+
+        Returns:
+            The raw Adzuna results of the page
+        """
+        if not self.enabled:
+            return fetch()
+
+        key = self.make_key(query, location, page)
+        cached, tier = self._lookup(key)
+        if cached is not None:
+            results, fetched_at = cached
+            stale = time.time() - fetched_at > self.ttl_seconds
+            with self._lock:
+                self._counters["stale_hits" if stale else "mongo_hits" if tier == "mongo" else "hits"] += 1
+            if stale:
+                self._refresh_in_background(key, fetch)
+            return results
+
+        with self._lock:
+            self._counters["misses"] += 1
+        results = fetch()
+        if results:
+            self.set(key, results)
+        return results
+
+    def is_fresh(self, query: str, location: str, page: int) -> bool:
+        """
+        Check whether a result page is cached and still within its TTL
+
+        Unlike get_or_fetch, this does not count as a lookup and never fetches.
+
+        Args:
+            query: Search query, normalized or not
+            location: Adzuna country code
+            page: Page number
+
+        Returns:
+            True if the page would be served without a fetch or refresh
+        """
+        if not self.enabled:
+            return False
+        cached, _ = self._lookup(self.make_key(query, location, page))
+        return cached is not None and time.time() - cached[1] <= self.ttl_seconds
+
+    def set(self, key: str, results: Results, fetched_at: float = None) -> None:
+        """
+        Store a result page in every enabled tier
+
+        Args:
+            key: Key from make_key
+            results: The raw Adzuna results
+            fetched_at: When the page was fetched (defaults to now)
+        """
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._store(key, results, fetched_at)
+        self._mongo_set(key, results, fetched_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current memory tier size"""
+        with self._lock:
+            hits = self._counters["hits"] + self._counters["stale_hits"] + self._counters["mongo_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds,
+                "mongo_enabled": self.use_mongo
+            }
+
+    def clear(self) -> None:
+        """Drop all entries from the memory tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Stop the background refresh thread"""
+        with self._lock:
+            if self._refresher is not None:
+                self._refresher.shutdown(wait=False, cancel_futures=True)
+                self._refresher = None
+
+    def _lookup(self, key: str) -> Tuple[Optional[Tuple[Results, float]], str]:
+        """Find a fresh or stale entry in the memory tier, else in MongoDB; returns (entry, tier)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl_seconds + self.stale_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry, "memory"
+
+        # Another worker may already have refreshed a page that is stale here
+        stored = self._mongo_get(key)
+        with self._lock:
+            if stored is not None and (entry is None or stored[1] > entry[1]):
+                self._store(key, *stored)
+                return stored, "mongo"
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return entry, "memory"
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Results]) -> None:
+        """Fetch a stale page again, at most one refresh per key at a time"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-cache-refresh")
+            refresher = self._refresher
+
+        def refresh():
+            try:
+                results = fetch()
+                if results:
+                    self.set(key, results)
+                    with self._lock:
+                        self._counters["refreshes"] += 1
+            except Exception as e:
+                logger.warning(f"Job search cache refresh failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        try:
+            refresher.submit(refresh)
+        except RuntimeError:
+            # Refresher shut down, serve the stale page without refreshing
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: str, results: Results, fetched_at: float) -> None:
+        """Insert into the memory tier and evict the least recently used entries (lock held)"""
+        self._entries[key] = (results, fetched_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _get_collection(self):
+        """Lazily resolve the MongoDB collection and its TTL index"""
+        if self._collection is None:
+            from services.mongodb.client import mongo_client
+            collection = mongo_client.get_collection(self.COLLECTION_NAME)
+            # MongoDB removes documents once the stale window has passed
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._collection = collection
+        return self._collection
+
+    def _mongo_get(self, key: str) -> Optional[Tuple[Results, float]]:
+        """Read an entry from the MongoDB tier"""
+        if not self.use_mongo:
+            return None
+        try:
+            doc = self._get_collection().find_one({"_id": key})
+            # The TTL monitor only runs periodically, so check expiry ourselves
+            if doc and doc.get("expires_at") and doc["expires_at"] > datetime.utcnow():
+                return doc.get("results", []), doc.get("fetched_at", 0)
+        except Exception as e:
+            logger.warning(f"Job search cache MongoDB read failed: {str(e)}")
+        return None
+
+    def _mongo_set(self, key: str, results: Results, fetched_at: float) -> None:
+        """Write an entry to the MongoDB tier"""
+        if not self.use_mongo:
+            return
+        try:
+            self._get_collection().update_one(
+                {"_id": key},
+                {"$set": {
+                    "results": results,
+                    "fetched_at": fetched_at,
+                    "expires_at": datetime.utcfromtimestamp(fetched_at) + timedelta(seconds=self.ttl_seconds + self.stale_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Job search cache MongoDB write failed: {str(e)}")
+
+
+# Create a singleton instance
+job_search_cache = JobSearchCache()
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache for LLM responses.
+
+Responses are keyed on a hash of model, prompt and sampling parameters, so
+identical prompts (e.g. re-evaluating the same resume) are answered from the
+cache instead of running another generation. Entries live in an in-memory LRU
+tier and, optionally, in a MongoDB collection shared by all workers.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    Two-tier (memory LRU + optional MongoDB) cache for LLM responses with TTL
+    and hit/miss counters.
+    """
+
+    COLLECTION_NAME = "llm_cache"
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None,
+                 use_mongo: bool = None, enabled: bool = None):
+        """
+        Initialize the cache. Unset arguments are read from the environment.
+
+        Args:
+            max_entries: Maximum entries in the memory tier (LLM_CACHE_SIZE)
+            ttl_seconds: Lifetime of an entry in seconds (LLM_CACHE_TTL)
+            use_mongo: Enable the MongoDB tier (LLM_CACHE_MONGO)
+            enabled: Enable caching at all (LLM_CACHE_ENABLED)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("LLM_CACHE_SIZE", "1024"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("LLM_CACHE_TTL", "86400"))
+        self.use_mongo = use_mongo if use_mongo is not None else os.getenv("LLM_CACHE_MONGO", "false").lower() == "true"
+        self.enabled = enabled if enabled is not None else os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = None
+        self._counters = {"hits": 0, "mongo_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: Any, **params) -> str:
+        """
+        Build the cache key for a request
+
+        Args:
+            model: Model name
+            prompt: Prompt string or list of chat messages
+            **params: Sampling parameters that influence the output
+
+        Returns:
+            SHA-256 hex digest of the normalized request
+        """
+        payload = json.dumps({"model": model, "prompt": prompt, "params": params},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached response or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+                del self._entries[key]
+
+        value = self._mongo_get(key)
+        with self._lock:
+            if value is not None:
+                self._counters["mongo_hits"] += 1
+                self._store(key, value, now + self.ttl_seconds)
+            else:
+                self._counters["misses"] += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response in every enabled tier
+
+        Args:
+            key: Key from make_key
+            value: The response text
+        """
+        with self._lock:
+            self._store(key, value, time.time() + self.ttl_seconds)
+        self._mongo_set(key, value)
+
+    def get_or_compute(self, model: str, prompt: Any, compute: Callable[[], Optional[str]], **params) -> Optional[str]:
+        """
+        Return the cached response for a request, or run compute() and cache it
+
+        Empty or None results are returned but never cached, so failed calls
+        are retried next time.
+
+        Args:
+            model: Model name
+            prompt: Prompt string or list of chat messages
+            compute: Function performing the actual LLM call
+            **params: Sampling parameters that influence the output
+
+        Returns:
+            The response text
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.make_key(model, prompt, **params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        value = compute()
+        if value:
+            self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current memory tier size"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["mongo_hits"] + self._counters["misses"]
+            hit_rate = (self._counters["hits"] + self._counters["mongo_hits"]) / lookups if lookups else 0.0
+            return {
+                **self._counters,
+                "hit_rate": round(hit_rate, 3),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "mongo_enabled": self.use_mongo
+            }
+
+    def clear(self) -> None:
+        """Drop all entries from the memory tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into the memory tier and evict the least recently used entries (lock held)"""
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _get_collection(self):
+        """Lazily resolve the MongoDB collection and its TTL index"""
+        if self._collection is None:
+            from services.mongodb.client import mongo_client
+            collection = mongo_client.get_collection(self.COLLECTION_NAME)
+            # MongoDB removes documents once expires_at has passed
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._collection = collection
+        return self._collection
+
+    def _mongo_get(self, key: str) -> Optional[str]:
+        """Read an entry from the MongoDB tier"""
+        if not self.use_mongo:
+            return None
+        try:
+            doc = self._get_collection().find_one({"_id": key})
+            # The TTL monitor only runs periodically, so check expiry ourselves
+            if doc and doc.get("expires_at") and doc["expires_at"] > datetime.utcnow():
+                return doc.get("response")
+        except Exception as e:
+            logger.warning(f"LLM cache MongoDB read failed: {str(e)}")
+        return None
+
+    def _mongo_set(self, key: str, value: str) -> None:
+        """Write an entry to the MongoDB tier"""
+        if not self.use_mongo:
+            return
+        try:
+            self._get_collection().update_one(
+                {"_id": key},
+                {"$set": {
+                    "response": value,
+                    "created_at": datetime.utcnow(),
+                    "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"LLM cache MongoDB write failed: {str(e)}")
+
+
+# Create a singleton instance
+llm_cache = LLMCache()
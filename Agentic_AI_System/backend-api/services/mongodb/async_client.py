@@ -0,0 +1,74 @@
+"""
+Async MongoDB client for CareerMentor backend
+
+Uses the native asyncio API of PyMongo (AsyncMongoClient), the successor of
+Motor, so FastAPI routes can await database calls instead of blocking the
+event loop.
+"""
+
+import os
+from typing import Optional
+
+from pymongo import AsyncMongoClient
+
+from .client import LazyCollection, client_options, mongo_client
+
+
+class AsyncMongoDBClient:
+    """
+    Singleton async MongoDB client for CareerMentor
+
+    The client connects lazily on the first operation, so creating it never
+    blocks and it binds to the event loop that first uses it. It shares the
+    pool settings and the discovered URI of the sync client.
+    """
+    _instance: Optional['AsyncMongoDBClient'] = None
+
+    @classmethod
+    def get_instance(cls):
+        """Get the singleton instance"""
+        if cls._instance is None:
+            cls._instance = AsyncMongoDBClient()
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the async MongoDB client"""
+        self.db_name = os.getenv("MONGO_DB_NAME", "careermentor")
+        self._client = None
+        self._client_uri = None
+        # Clients replaced after the sync client found another URI, closed on shutdown
+        self._stale_clients = []
+
+    @property
+    def client(self) -> AsyncMongoClient:
+        """The AsyncMongoClient, created on first access"""
+        # Follow the URI found by the sync client's background discovery
+        mongo_client.start_discovery()
+        uri = mongo_client.active_uri
+        if self._client is None or self._client_uri != uri:
+            if self._client is not None:
+                self._stale_clients.append(self._client)
+            self._client = AsyncMongoClient(uri, **client_options())
+            self._client_uri = uri
+        return self._client
+
+    @property
+    def db(self):
+        """The CareerMentor database"""
+        return self.client[self.db_name]
+
+    def get_collection(self, collection_name):
+        """Get a collection from the database (resolved on first use)"""
+        return LazyCollection(self, collection_name)
+
+    async def close(self) -> None:
+        """Close the connection pools"""
+        clients = self._stale_clients + ([self._client] if self._client is not None else [])
+        self._client = None
+        self._stale_clients = []
+        for client in clients:
+            await client.close()
+
+
+# Create a singleton instance
+async_mongo_client = AsyncMongoDBClient.get_instance()
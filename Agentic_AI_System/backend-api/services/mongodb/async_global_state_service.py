@@ -0,0 +1,235 @@
+"""
+Async MongoDB Global State Service for CareerMentor
+
+Same API as GlobalStateService, but every database call is awaited on the
+async client so FastAPI routes don't block the event loop. Both services share
+the request-scoped unit of work: changes recorded by sync code that runs inside
+a request (e.g. crews) are flushed together with the async ones.
+"""
+
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List
+
+from .async_client import async_mongo_client
+from .global_state_service import (
+    StateUnitOfWork,
+    _current_unit,
+    _get_path,
+    new_default_state,
+    non_overlapping_paths,
+    prepare_state,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGlobalStateService:
+    """
+    Async MongoDB-backed Global State Service
+    """
+
+    def __init__(self):
+        """Initialize the collection handle (no connection is made yet)"""
+        self.global_state_collection = async_mongo_client.get_collection("global_state")
+
+    @asynccontextmanager
+    async def unit_of_work(self):
+        """
+        Scope in which every user's state is read at most once and all writes
+        are flushed together at the end
+
+        Nested scopes (sync or async) join the outer one. Changes are only
+        flushed when the scope exits without an exception and the unit was not
+        discarded; otherwise they are dropped.
+
+        Yields:
+            The active StateUnitOfWork
+        """
+        unit = _current_unit.get()
+        if unit is not None:
+            yield unit
+            return
+
+        unit = StateUnitOfWork()
+        token = _current_unit.set(unit)
+        try:
+            yield unit
+        except BaseException:
+            _current_unit.reset(token)
+            logger.warning("Discarding global state changes of a failed unit of work")
+            raise
+        _current_unit.reset(token)
+        if unit.discarded:
+            logger.info("Discarding global state changes of a discarded unit of work")
+            return
+        await self.flush(unit)
+
+    async def flush(self, unit: StateUnitOfWork) -> None:
+        """
+        Write the changes collected in a unit of work, one update_one per user
+
+        Args:
+            unit: The unit of work to flush
+        """
+        for user_id, update in unit.changes().items():
+            try:
+                await self.global_state_collection.update_one({"user.id": user_id}, update, upsert=True)
+            except Exception as e:
+                logger.error(f"Failed to flush global state for user {user_id}: {str(e)}")
+                raise
+            unit.mark_flushed(user_id)
+
+    async def get_state(self, user_id: str = "default_user") -> Dict[str, Any]:
+        """
+        Get the global state for a user
+
+        Args:
+            user_id: The user ID to get state for
+
+        Returns:
+            The global state as a dictionary
+        """
+        unit = _current_unit.get()
+        if unit is None:
+            return await self._load_state(user_id)
+
+        state = unit.loaded_state(user_id)
+        if state is not None:
+            return state
+        return unit.adopt_loaded(user_id, await self._load_state(user_id))
+
+    async def _load_state(self, user_id: str) -> Dict[str, Any]:
+        """Read the state document of a user, creating the default state if missing"""
+        state_doc = await self.global_state_collection.find_one({"user.id": user_id})
+
+        if not state_doc:
+            return await self._create_default_state(user_id)
+
+        state_doc.pop("_id", None)
+        return state_doc
+
+    async def _create_default_state(self, user_id: str) -> Dict[str, Any]:
+        """Create and store the default state for a new user"""
+        default_state = new_default_state(user_id)
+        await self.global_state_collection.insert_one(default_state)
+        default_state.pop("_id", None)
+        return default_state
+
+    async def get_fields(self, paths: List[str], user_id: str = "default_user") -> Dict[str, Any]:
+        """
+        Get only some fields of the global state with a projected read
+
+        Args:
+            paths: Dotted paths to fetch (e.g. "agent_knowledge.user_profile")
+            user_id: The user ID to get fields for
+
+        Returns:
+            Nested dict containing only the requested paths that exist
+        """
+        paths = non_overlapping_paths(paths)
+
+        unit = _current_unit.get()
+        if unit is not None:
+            result = unit.project(user_id, paths)
+            if result is not None:
+                return result
+
+        projection = {path: 1 for path in paths}
+        projection["_id"] = 0
+        result = await self.global_state_collection.find_one({"user.id": user_id}, projection) or {}
+
+        if unit is not None:
+            result = unit.overlay_pending(user_id, paths, result)
+        return result
+
+    async def get_field(self, path: str, user_id: str = "default_user", default: Any = None) -> Any:
+        """
+        Get a single field of the global state with a projected read
+
+        Args:
+            path: Dotted path to fetch
+            user_id: The user ID to get the field for
+            default: Value returned if the field does not exist
+
+        Returns:
+            The field value or default
+        """
+        return _get_path(await self.get_fields([path], user_id), path, default)
+
+    async def set_state(self, state: Dict[str, Any], user_id: str = "default_user") -> None:
+        """
+        Set the global state for a user
+
+        Args:
+            state: The state to set
+            user_id: The user ID to set state for
+        """
+        prepare_state(state, user_id)
+
+        unit = _current_unit.get()
+        if unit is not None:
+            await self.get_state(user_id)
+            unit.replace_state(user_id, state)
+            return
+
+        await self.global_state_collection.update_one(
+            {"user.id": user_id},
+            {"$set": state},
+            upsert=True
+        )
+
+    async def update_fields(self, updates: Dict[str, Any], user_id: str = "default_user") -> None:
+        """
+        Set individual fields of the global state without rewriting the document
+
+        Args:
+            updates: Mapping of dotted paths to values
+            user_id: The user ID to update state for
+        """
+        if not updates:
+            return
+
+        unit = _current_unit.get()
+        if unit is not None:
+            unit.record_fields(user_id, updates)
+            return
+
+        await self.global_state_collection.update_one(
+            {"user.id": user_id},
+            {"$set": {**updates, "last_updated": time.time()}},
+            upsert=True
+        )
+
+    async def get_user_profile(self, user_id: str = "default_user") -> Dict[str, Any]:
+        """Get the user profile from the global state"""
+        return await self.get_field("agent_knowledge.user_profile", user_id, {})
+
+    async def update_user_profile(self, profile_data: Dict[str, Any], user_id: str = "default_user") -> None:
+        """Update the user profile in the global state"""
+        await self.update_fields({"agent_knowledge.user_profile": profile_data}, user_id)
+
+    async def get_job_search_data(self, user_id: str = "default_user") -> Dict[str, Any]:
+        """Get the job search data from the global state"""
+        return await self.get_field("agent_knowledge.job_search", user_id, {})
+
+    async def update_job_search_data(self, job_search_data: Dict[str, Any], user_id: str = "default_user") -> None:
+        """Update the job search data in the global state"""
+        await self.update_fields({"agent_knowledge.job_search": job_search_data}, user_id)
+
+    async def get_interview_data(self, user_id: str = "default_user") -> Dict[str, Any]:
+        """Get the interview data from the global state"""
+        return await self.get_field("agent_knowledge.interview", user_id, {})
+
+    async def update_interview_data(self, interview_data: Dict[str, Any], user_id: str = "default_user") -> None:
+        """Update the interview data in the global state"""
+        await self.update_fields({"agent_knowledge.interview": interview_data}, user_id)
+
+    async def update_interview_session(self, user_id: str, session_id: str, session_data: Dict[str, Any]) -> None:
+        """Update a specific interview session in the global state"""
+        await self.update_fields({f"agent_knowledge.interview.history.{session_id}": session_data}, user_id)
+
+
+# Create a singleton instance
+async_global_state = AsyncGlobalStateService()
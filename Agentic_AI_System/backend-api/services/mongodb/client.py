@@ -1,69 +1,223 @@
 """
 MongoDB client for CareerMentor backend
+
+The client is created lazily on first use and never blocks at import time.
+PyMongo's MongoClient is itself a thread-safe connection pool, so one shared
+instance serves the whole process; pool size and timeouts are configurable
+via MONGO_* environment variables.
 """
 
 import os
+import logging
+import threading
 from pymongo import MongoClient
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Alternative URIs probed in the background if MONGO_URI is unreachable
+DEFAULT_ALTERNATIVE_URIS = [
+    "mongodb://host.docker.internal:27017",  # For Docker on Mac/Windows
+    "mongodb://172.17.0.1:27017",         # Common Docker bridge network
+    "mongodb://mongodb:27017",            # If using container name
+    "mongodb://career-mentor-mongodb:27017"  # Using consistent naming with your containers
+]
+
+
+def client_options() -> Dict[str, Any]:
+    """
+    Connection pool options shared by the sync and async clients
+
+    Returns:
+        Keyword arguments for MongoClient / AsyncMongoClient
+    """
+    options = {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    }
+    socket_timeout = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    if socket_timeout > 0:
+        options["socketTimeoutMS"] = socket_timeout
+    return options
+
+
+class LazyCollection:
+    """
+    Collection handle that resolves against the current client on every use
+
+    Services keep collection handles for their whole lifetime; this way they
+    follow the client when background discovery switches to another URI.
+    """
+
+    def __init__(self, owner, name: str):
+        self._owner = owner
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._owner.db[self._name], attribute)
+
+    def __getitem__(self, name):
+        return self._owner.db[self._name][name]
+
+    def __repr__(self):
+        return f"LazyCollection({self._name!r})"
+
 
 class MongoDBClient:
     """
     Singleton MongoDB client for CareerMentor
     """
     _instance: Optional['MongoDBClient'] = None
-    
+
     @classmethod
     def get_instance(cls):
         """Get the singleton instance"""
         if cls._instance is None:
             cls._instance = MongoDBClient()
         return cls._instance
-    
+
     def __init__(self):
-        """Initialize the MongoDB client"""
+        """Read the configuration; the connection pool is created on first use"""
         # Get MongoDB URI from environment variable or use default
         # In Docker, we need to use the container name or IP
         # For local development, we use localhost
         # For Docker, we can use host.docker.internal to access the host
-        mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-        
-        # Try to connect with a timeout to avoid hanging if MongoDB is not available
-        try:
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Force a connection to verify it works
-            self.client.server_info()
-            print("Successfully connected to MongoDB")
-        except Exception as e:
-            print(f"Failed to connect to MongoDB at {mongo_uri}: {e}")
-            print("Trying alternative connection methods...")
-            
-            # Try alternative connection methods for Docker
-            alternative_uris = [
-                "mongodb://host.docker.internal:27017",  # For Docker on Mac/Windows
-                "mongodb://172.17.0.1:27017",         # Common Docker bridge network
-                "mongodb://mongodb:27017",            # If using container name
-                "mongodb://career-mentor-mongodb:27017"  # Using consistent naming with your containers
-            ]
-            
-            for uri in alternative_uris:
-                try:
-                    print(f"Trying {uri}...")
-                    self.client = MongoClient(uri, serverSelectionTimeoutMS=3000)
-                    self.client.server_info()
-                    print(f"Successfully connected to MongoDB at {uri}")
-                    break
-                except Exception as e:
-                    print(f"Failed to connect to {uri}: {e}")
-            else:
-                # If all alternatives fail, use the original URI but don't verify connection
-                print("All connection attempts failed. Using original URI without verification.")
-                self.client = MongoClient(mongo_uri)
-        
-        self.db = self.client[os.getenv("MONGO_DB_NAME", "careermentor")]
-        
+        self.mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+        self.db_name = os.getenv("MONGO_DB_NAME", "careermentor")
+        alternatives = os.getenv("MONGO_ALTERNATIVE_URIS")
+        self.alternative_uris: List[str] = (
+            [uri.strip() for uri in alternatives.split(",") if uri.strip()]
+            if alternatives is not None else list(DEFAULT_ALTERNATIVE_URIS)
+        )
+        self.discovery_timeout_ms = int(os.getenv("MONGO_DISCOVERY_TIMEOUT_MS", "3000"))
+        # Seconds a replaced client stays open for operations still using it
+        self.close_grace_seconds = float(os.getenv("MONGO_CLOSE_GRACE_SECONDS", "60"))
+
+        # URI the shared client is connected to (may change after discovery)
+        self.active_uri = self.mongo_uri
+        self._client: Optional[MongoClient] = None
+        self._lock = threading.Lock()
+        self._discovery: Optional[threading.Thread] = None
+        # id of a client replaced by discovery -> (client, timer that closes it)
+        self._retired: Dict[int, Any] = {}
+
+    @property
+    def client(self) -> MongoClient:
+        """The shared pooled MongoClient, created on first access"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    # The constructor does not wait for the server; monitoring
+                    # runs in PyMongo's background threads
+                    self._client = MongoClient(self.active_uri, **client_options())
+        self.start_discovery()
+        return self._client
+
+    @property
+    def db(self):
+        """The CareerMentor database"""
+        return self.client[self.db_name]
+
     def get_collection(self, collection_name):
         """Get a collection from the database"""
-        return self.db[collection_name]
+        return LazyCollection(self, collection_name)
+
+    def wait_for_discovery(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the background connection check has finished (for scripts)
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the check has finished
+        """
+        self.client  # Creates the client and starts the check
+        discovery = self._discovery
+        if discovery is not None:
+            discovery.join(timeout)
+            return not discovery.is_alive()
+        return True
+
+    def close(self) -> None:
+        """Close the connection pool and any replaced clients that are still open"""
+        with self._lock:
+            client, self._client = self._client, None
+            retired, self._retired = self._retired, {}
+        for old_client, timer in retired.values():
+            timer.cancel()
+            old_client.close()
+        if client is not None:
+            client.close()
+
+    def start_discovery(self) -> None:
+        """Check the configured URI once in a background thread and fall back to alternatives"""
+        if self._discovery is not None:
+            return
+        with self._lock:
+            if self._discovery is None:
+                self._discovery = threading.Thread(target=self._discover, name="mongodb-discovery", daemon=True)
+                self._discovery.start()
+
+    def _discover(self) -> None:
+        """Ping MONGO_URI; if it is unreachable, probe the alternative URIs in turn"""
+        if self._ping(self.mongo_uri):
+            print("Successfully connected to MongoDB")
+            return
+
+        print(f"Failed to connect to MongoDB at {self.mongo_uri}")
+        print("Trying alternative connection methods...")
+        for uri in self.alternative_uris:
+            print(f"Trying {uri}...")
+            if self._ping(uri):
+                print(f"Successfully connected to MongoDB at {uri}")
+                self._switch_to(uri)
+                return
+
+        # If all alternatives fail, keep the original URI; PyMongo keeps retrying in the background
+        print("All connection attempts failed. Using original URI without verification.")
+
+    def _ping(self, uri: str) -> bool:
+        """Check whether a server answers on the URI"""
+        probe = MongoClient(uri, serverSelectionTimeoutMS=self.discovery_timeout_ms, connectTimeoutMS=self.discovery_timeout_ms)
+        try:
+            probe.admin.command("ping")
+            return True
+        except Exception as e:
+            logger.debug(f"MongoDB ping to {uri} failed: {e}")
+            return False
+        finally:
+            probe.close()
+
+    def _switch_to(self, uri: str) -> None:
+        """
+        Replace the shared client with one connected to uri
+
+        Requests that are running may still hold the old client, e.g. through
+        a cursor, so it is only closed after MONGO_CLOSE_GRACE_SECONDS.
+        """
+        with self._lock:
+            old_client = self._client
+            self.active_uri = uri
+            self._client = MongoClient(uri, **client_options())
+            if old_client is not None:
+                timer = threading.Timer(self.close_grace_seconds, self._close_retired, args=(old_client,))
+                timer.daemon = True
+                self._retired[id(old_client)] = (old_client, timer)
+                timer.start()
+
+    def _close_retired(self, old_client: MongoClient) -> None:
+        """Close a replaced client once its grace period has passed"""
+        with self._lock:
+            if self._retired.pop(id(old_client), None) is None:
+                return  # Already closed by close()
+        try:
+            old_client.close()
+        except Exception as e:
+            logger.debug(f"Closing the replaced MongoDB client failed: {e}")
 
 # Create a singleton instance
 mongo_client = MongoDBClient.get_instance()
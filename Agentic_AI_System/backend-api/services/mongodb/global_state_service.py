@@ -6,12 +6,23 @@ using MongoDB as the backend database.
 """
 
 import os
+import copy
 import json
 import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, Any, Optional, List
 import uuid
 
-from .client import MongoDBClient
+from .client import mongo_client
+
+# Path of the legacy saved jobs array inside a global_state document
+# (saved jobs now live in the saved_jobs collection, see saved_jobs_service)
+SAVED_JOBS_PATH = "agent_knowledge.job_search.saved_jobs"
+
+logger = logging.getLogger(__name__)
 
 # Default state 
 DEFAULT_STATE = {
@@ -77,6 +88,237 @@ DEFAULT_STATE = {
 }
 
 
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted path inside a nested dict, creating missing levels"""
+    parts = path.split(".")
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    target[parts[-1]] = value
+
+
+_MISSING = object()
+
+
+def _get_path(source: Dict[str, Any], path: str, default: Any = _MISSING) -> Any:
+    """Read a dotted path from a nested dict"""
+    value = source
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
+
+
+def _is_path_safe(obj: Dict[str, Any]) -> bool:
+    """Check that all keys of a dict can be used in a dotted update path"""
+    return all(isinstance(key, str) and key and "." not in key and not key.startswith("$") for key in obj)
+
+
+def _diff_paths(old: Dict[str, Any], new: Dict[str, Any], prefix: str,
+                sets: Dict[str, Any], unsets: List[str]) -> None:
+    """
+    Collect the dotted paths that changed between two versions of a state
+
+    Nested dicts are compared key by key; any other changed value (including
+    lists) is set as a whole. Keys removed below the top level are unset; keys
+    missing at the top level are left alone, like a plain $set of the state.
+    """
+    for key, value in new.items():
+        path = f"{prefix}{key}"
+        old_value = old.get(key)
+        if (isinstance(value, dict) and isinstance(old_value, dict) and value
+                and _is_path_safe(value) and _is_path_safe(old_value)):
+            _diff_paths(old_value, value, f"{path}.", sets, unsets)
+        elif key not in old or old_value != value:
+            sets[path] = value
+    if prefix:
+        unsets.extend(f"{prefix}{key}" for key in old if key not in new)
+
+
+class StateUnitOfWork:
+    """
+    Request-scoped snapshot of user states with batched writes
+
+    Each user's state is read at most once; writes are collected and flushed
+    as one update_one per user when the unit of work ends. This class only
+    does the bookkeeping, the services perform the I/O.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        # Set by discard(); the changes are then dropped instead of flushed
+        self.discarded = False
+
+    def discard(self) -> None:
+        """Drop the collected changes, e.g. because the request failed"""
+        with self.lock:
+            self.discarded = True
+
+    def entry(self, user_id: str) -> Dict[str, Any]:
+        """Get the bookkeeping entry of a user, creating it on first use"""
+        if user_id not in self.entries:
+            self.entries[user_id] = {
+                "state": None,      # Snapshot shared by all readers of the request
+                "original": None,   # Copy of the snapshot as loaded, for the diff
+                "dirty": False,     # set_state/update_fields touched the snapshot
+                "pending": {}       # Field updates made before the state was loaded
+            }
+        return self.entries[user_id]
+
+    def loaded_state(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot of a user if it is loaded"""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            return entry["state"] if entry else None
+
+    def adopt_loaded(self, user_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a state freshly read from the database
+
+        If another caller loaded the state in the meantime, that snapshot wins.
+
+        Returns:
+            The snapshot to hand out
+        """
+        with self.lock:
+            entry = self.entry(user_id)
+            if entry["state"] is None:
+                entry["original"] = copy.deepcopy(state)
+                # Field updates recorded before the load become part of the diff
+                for path, value in entry["pending"].items():
+                    _set_path(state, path, value)
+                entry["dirty"] = entry["dirty"] or bool(entry["pending"])
+                entry["pending"] = {}
+                entry["state"] = state
+            return entry["state"]
+
+    def replace_state(self, user_id: str, state: Dict[str, Any]) -> None:
+        """Adopt a state passed to set_state (the snapshot must be loaded)"""
+        with self.lock:
+            entry = self.entry(user_id)
+            entry["state"] = state
+            entry["dirty"] = True
+
+    def record_fields(self, user_id: str, updates: Dict[str, Any]) -> None:
+        """Record field updates on the snapshot, or as pending if it is not loaded"""
+        with self.lock:
+            entry = self.entry(user_id)
+            if entry["state"] is not None:
+                for path, value in updates.items():
+                    _set_path(entry["state"], path, value)
+                entry["dirty"] = True
+            else:
+                self._merge_pending(entry["pending"], updates)
+
+    def project(self, user_id: str, paths: List[str]) -> Optional[Dict[str, Any]]:
+        """Answer a projected read from the snapshot, or None if it is not loaded"""
+        with self.lock:
+            state = self.loaded_state(user_id)
+            if state is None:
+                return None
+            result: Dict[str, Any] = {}
+            for path in paths:
+                value = _get_path(state, path)
+                if value is not _MISSING:
+                    _set_path(result, path, value)
+            return result
+
+    def overlay_pending(self, user_id: str, paths: List[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply pending field updates that touch the requested paths to a projected read"""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            pending = dict(entry["pending"]) if entry else {}
+        for pending_path, value in pending.items():
+            if any(pending_path == p or pending_path.startswith(f"{p}.") or p.startswith(f"{pending_path}.") for p in paths):
+                _set_path(result, pending_path, value)
+        return result
+
+    def changes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the update documents for all users with changes
+
+        Returns:
+            Mapping of user ID to the update document for update_one
+        """
+        updates = {}
+        with self.lock:
+            for user_id, entry in self.entries.items():
+                sets: Dict[str, Any] = {}
+                unsets: List[str] = []
+                if entry["state"] is not None and entry["dirty"]:
+                    _diff_paths(entry["original"], entry["state"], "", sets, unsets)
+                sets.update(entry["pending"])
+                sets.pop("_id", None)
+                if not sets and not unsets:
+                    continue
+
+                sets["last_updated"] = time.time()
+                update = {"$set": sets}
+                if unsets:
+                    update["$unset"] = {path: "" for path in unsets}
+                updates[user_id] = update
+        return updates
+
+    def mark_flushed(self, user_id: str) -> None:
+        """Record that the changes of a user were written"""
+        with self.lock:
+            entry = self.entry(user_id)
+            # The snapshot now matches the database
+            entry["original"] = copy.deepcopy(entry["state"]) if entry["state"] is not None else None
+            entry["dirty"] = False
+            entry["pending"] = {}
+
+    @staticmethod
+    def _merge_pending(pending: Dict[str, Any], updates: Dict[str, Any]) -> None:
+        """Merge field updates so that no pending path is a prefix of another"""
+        for path, value in updates.items():
+            # A new parent value replaces everything set below it
+            for existing in [p for p in pending if p.startswith(f"{path}.")]:
+                del pending[existing]
+            parent = next((p for p in pending if path.startswith(f"{p}.")), None)
+            if parent is not None and isinstance(pending[parent], dict):
+                _set_path(pending[parent], path[len(parent) + 1:], value)
+            else:
+                pending[path] = value
+
+
+# Unit of work of the current request (None outside of a request scope)
+_current_unit: ContextVar[Optional[StateUnitOfWork]] = ContextVar("global_state_unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[StateUnitOfWork]:
+    """Return the unit of work of the current request, if any"""
+    return _current_unit.get()
+
+
+def prepare_state(state: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """Stamp last_updated and the user ID on a state before it is written"""
+    state["last_updated"] = time.time()
+    
+    # Ensure user ID is set correctly
+    if "user" not in state:
+        state["user"] = {"id": user_id}
+    else:
+        state["user"]["id"] = user_id
+    return state
+
+
+def non_overlapping_paths(paths: List[str]) -> List[str]:
+    """Drop paths whose parent is also requested (MongoDB rejects such projections)"""
+    return [p for p in paths if not any(p.startswith(f"{other}.") for other in paths)]
+
+
+def new_default_state(user_id: str) -> Dict[str, Any]:
+    """Build a fresh default state document for a user"""
+    default_state = copy.deepcopy(DEFAULT_STATE)
+    default_state["user"]["id"] = user_id
+    default_state["last_updated"] = time.time()
+    return default_state
+
+
 class GlobalStateService:
     """
     MongoDB-backed Global State Service
@@ -96,19 +338,82 @@ class GlobalStateService:
     
     def _initialize(self):
         """Initialize the MongoDB connection and collections"""
-        self.mongo_client = MongoDBClient()
+        # Reuse the shared pooled client instead of opening a second one
+        self.mongo_client = mongo_client
         self.global_state_collection = self.mongo_client.get_collection("global_state")
         
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Scope in which every user's state is read at most once and all writes
+        are flushed together at the end
+        
+        Inside the scope get_state returns the same snapshot to every caller,
+        and set_state/update_fields only record changes. Nested scopes join
+        the outer one. Changes are only flushed when the scope exits without
+        an exception and the unit was not discarded; otherwise they are dropped.
+        
+        Yields:
+            The active StateUnitOfWork
+        """
+        unit = _current_unit.get()
+        if unit is not None:
+            yield unit
+            return
+        
+        unit = StateUnitOfWork()
+        token = _current_unit.set(unit)
+        try:
+            yield unit
+        except BaseException:
+            _current_unit.reset(token)
+            logger.warning("Discarding global state changes of a failed unit of work")
+            raise
+        _current_unit.reset(token)
+        if unit.discarded:
+            logger.info("Discarding global state changes of a discarded unit of work")
+            return
+        self.flush(unit)
+    
+    def flush(self, unit: StateUnitOfWork) -> None:
+        """
+        Write the changes collected in a unit of work, one update_one per user
+        
+        Args:
+            unit: The unit of work to flush
+        """
+        for user_id, update in unit.changes().items():
+            try:
+                self.global_state_collection.update_one({"user.id": user_id}, update, upsert=True)
+            except Exception as e:
+                logger.error(f"Failed to flush global state for user {user_id}: {str(e)}")
+                raise
+            unit.mark_flushed(user_id)
+    
     def get_state(self, user_id: str = "default_user") -> Dict[str, Any]:
         """
         Get the global state for a user
         
+        Inside a unit of work the state is loaded once and the same snapshot
+        is returned to every caller.
+        
         Args:
             user_id: The user ID to get state for
             
         Returns:
             The global state as a dictionary
         """
+        unit = _current_unit.get()
+        if unit is None:
+            return self._load_state(user_id)
+        
+        state = unit.loaded_state(user_id)
+        if state is not None:
+            return state
+        return unit.adopt_loaded(user_id, self._load_state(user_id))
+    
+    def _load_state(self, user_id: str) -> Dict[str, Any]:
+        """Read the state document of a user, creating the default state if missing"""
         # Find the state document for the user
         state_doc = self.global_state_collection.find_one({"user.id": user_id})
         
@@ -123,22 +428,71 @@ class GlobalStateService:
             
         return state_doc
     
+    def get_fields(self, paths: List[str], user_id: str = "default_user") -> Dict[str, Any]:
+        """
+        Get only some fields of the global state
+        
+        Uses a MongoDB projection, so large subtrees that are not requested
+        (e.g. parsed resumes) are not transferred. Inside a unit of work the
+        request snapshot is used if it is already loaded, and pending field
+        updates are applied on top.
+        
+        Args:
+            paths: Dotted paths to fetch (e.g. "agent_knowledge.user_profile")
+            user_id: The user ID to get fields for
+            
+        Returns:
+            Nested dict containing only the requested paths that exist
+        """
+        paths = non_overlapping_paths(paths)
+        
+        unit = _current_unit.get()
+        if unit is not None:
+            result = unit.project(user_id, paths)
+            if result is not None:
+                return result
+        
+        projection = {path: 1 for path in paths}
+        projection["_id"] = 0
+        result = self.global_state_collection.find_one({"user.id": user_id}, projection) or {}
+        
+        if unit is not None:
+            result = unit.overlay_pending(user_id, paths, result)
+        return result
+    
+    def get_field(self, path: str, user_id: str = "default_user", default: Any = None) -> Any:
+        """
+        Get a single field of the global state with a projected read
+        
+        Args:
+            path: Dotted path to fetch (e.g. "agent_knowledge.resume.current_resume_id")
+            user_id: The user ID to get the field for
+            default: Value returned if the field does not exist
+            
+        Returns:
+            The field value or default
+        """
+        return _get_path(self.get_fields([path], user_id), path, default)
+    
     def set_state(self, state: Dict[str, Any], user_id: str = "default_user") -> None:
         """
         Set the global state for a user
         
+        Inside a unit of work only the changed paths are written when the
+        unit is flushed.
+        
         Args:
             state: The state to set
             user_id: The user ID to set state for
         """
-        # Add timestamp
-        state["last_updated"] = time.time()
+        prepare_state(state, user_id)
         
-        # Ensure user ID is set correctly
-        if "user" not in state:
-            state["user"] = {"id": user_id}
-        else:
-            state["user"]["id"] = user_id
+        unit = _current_unit.get()
+        if unit is not None:
+            # Load the snapshot to diff against, then adopt the new state
+            self.get_state(user_id)
+            unit.replace_state(user_id, state)
+            return
             
         # Upsert the state document
         self.global_state_collection.update_one(
@@ -147,6 +501,28 @@ class GlobalStateService:
             upsert=True
         )
     
+    def update_fields(self, updates: Dict[str, Any], user_id: str = "default_user") -> None:
+        """
+        Set individual fields of the global state without rewriting the document
+        
+        Args:
+            updates: Mapping of dotted paths (e.g. "agent_knowledge.resume.current_resume_id") to values
+            user_id: The user ID to update state for
+        """
+        if not updates:
+            return
+        
+        unit = _current_unit.get()
+        if unit is not None:
+            unit.record_fields(user_id, updates)
+            return
+        
+        self.global_state_collection.update_one(
+            {"user.id": user_id},
+            {"$set": {**updates, "last_updated": time.time()}},
+            upsert=True
+        )
+    
     def _create_default_state(self, user_id: str) -> Dict[str, Any]:
         """
         Create default state for a new user
@@ -157,12 +533,11 @@ class GlobalStateService:
         Returns:
             The default state
         """
-        default_state = DEFAULT_STATE.copy()
-        default_state["user"]["id"] = user_id
-        default_state["last_updated"] = time.time()
+        default_state = new_default_state(user_id)
         
-        # Save to MongoDB
+        # Save to MongoDB (insert_one adds the _id to the dict)
         self.global_state_collection.insert_one(default_state)
+        default_state.pop("_id", None)
         
         return default_state
     
@@ -176,8 +551,7 @@ class GlobalStateService:
         Returns:
             The user profile
         """
-        state = self.get_state(user_id)
-        return state.get("agent_knowledge", {}).get("user_profile", {})
+        return self.get_field("agent_knowledge.user_profile", user_id, {})
     
     def update_user_profile(self, profile_data: Dict[str, Any], user_id: str = "default_user") -> None:
         """
@@ -187,11 +561,7 @@ class GlobalStateService:
             profile_data: The profile data to update
             user_id: The user ID to update profile for
         """
-        self.global_state_collection.update_one(
-            {"user.id": user_id},
-            {"$set": {"agent_knowledge.user_profile": profile_data}},
-            upsert=True
-        )
+        self.update_fields({"agent_knowledge.user_profile": profile_data}, user_id)
     
     def get_job_search_data(self, user_id: str = "default_user") -> Dict[str, Any]:
         """
@@ -203,8 +573,7 @@ class GlobalStateService:
         Returns:
             The job search data
         """
-        state = self.get_state(user_id)
-        return state.get("agent_knowledge", {}).get("job_search", {})
+        return self.get_field("agent_knowledge.job_search", user_id, {})
     
     def update_job_search_data(self, job_search_data: Dict[str, Any], user_id: str = "default_user") -> None:
         """
@@ -214,11 +583,7 @@ class GlobalStateService:
             job_search_data: The job search data to update
             user_id: The user ID to update data for
         """
-        self.global_state_collection.update_one(
-            {"user.id": user_id},
-            {"$set": {"agent_knowledge.job_search": job_search_data}},
-            upsert=True
-        )
+        self.update_fields({"agent_knowledge.job_search": job_search_data}, user_id)
     
     def get_interview_data(self, user_id: str = "default_user") -> Dict[str, Any]:
         """
@@ -230,8 +595,7 @@ class GlobalStateService:
         Returns:
             The interview data
         """
-        state = self.get_state(user_id)
-        return state.get("agent_knowledge", {}).get("interview", {})
+        return self.get_field("agent_knowledge.interview", user_id, {})
     
     def update_interview_data(self, interview_data: Dict[str, Any], user_id: str = "default_user") -> None:
         """
@@ -241,11 +605,7 @@ class GlobalStateService:
             interview_data: The interview data to update
             user_id: The user ID to update data for
         """
-        self.global_state_collection.update_one(
-            {"user.id": user_id},
-            {"$set": {"agent_knowledge.interview": interview_data}},
-            upsert=True
-        )
+        self.update_fields({"agent_knowledge.interview": interview_data}, user_id)
     
     def update_interview_session(self, user_id: str, session_id: str, session_data: Dict[str, Any]) -> None:
         """
@@ -256,11 +616,7 @@ class GlobalStateService:
             session_id: The session ID to update
             session_data: The session data to update
         """
-        self.global_state_collection.update_one(
-            {"user.id": user_id},
-            {"$set": {f"agent_knowledge.interview.history.{session_id}": session_data}},
-            upsert=True
-        )
+        self.update_fields({f"agent_knowledge.interview.history.{session_id}": session_data}, user_id)
     
     def add_mock_resume(self, user_id: str = "default_user") -> Dict[str, Any]:
         """
@@ -340,16 +696,10 @@ class GlobalStateService:
         }
         
         # Update the global state with the mock resume
-        self.global_state_collection.update_one(
-            {"user.id": user_id},
-            {
-                "$set": {
-                    "agent_knowledge.resume.current_resume_id": resume_id,
-                    f"agent_knowledge.resume.resumes.{resume_id}": mock_resume
-                }
-            },
-            upsert=True
-        )
+        self.update_fields({
+            "agent_knowledge.resume.current_resume_id": resume_id,
+            f"agent_knowledge.resume.resumes.{resume_id}": mock_resume
+        }, user_id)
         
         # Also update the user profile with information from the resume
         user_profile = {
@@ -13,17 +13,17 @@ from pymongo.database import Database
 from pymongo.collection import Collection
 
 from services.mongodb.global_state_service import global_state
+from services.mongodb.saved_jobs_service import saved_jobs_service, async_saved_jobs_service
 
-def save_job_for_user(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+def _format_saved_job(job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Save a job for a user in MongoDB
+    Format job data according to the saved job schema
     
     Args:
-        user_id: The user ID
-        job_data: The job data to save
+        job_data: The job data to format
         
     Returns:
-        The saved job data
+        The formatted job
     """
     # Format the job data according to our schema
     # Ensure we have a valid created_at date
@@ -52,27 +52,30 @@ def save_job_for_user(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
         "created_at": job_data.get("created_at", current_time),  # Use provided date or current time
         "updated_at": current_time
     }
+    return formatted_job
+
+def save_job_for_user(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Save a job for a user in MongoDB
     
-    # Check if the job is already saved
-    user_state = global_state.get_state(user_id)
-    
-    # Find the job in saved_jobs if it exists
-    saved_jobs = user_state.get("agent_knowledge", {}).get("job_search", {}).get("saved_jobs", [])
-    
-    # Check if job already exists
-    for i, job in enumerate(saved_jobs):
-        if job.get("id") == formatted_job["id"]:
-            # Job already exists, return it
-            return job
-    
-    # Job doesn't exist, add it to saved_jobs
-    saved_jobs.append(formatted_job)
-    
-    # Update the user state
-    user_state["agent_knowledge"]["job_search"]["saved_jobs"] = saved_jobs
-    global_state.set_state(user_state, user_id)
+    Args:
+        user_id: The user ID
+        job_data: The job data to save
+        
+    Returns:
+        The saved job data
+    """
+    formatted_job = _format_saved_job(job_data)
     
-    return formatted_job
+    # Atomic insert unless the job is already saved; returns the existing job if there is one
+    existing_job = saved_jobs_service.add(formatted_job, user_id)
+    return existing_job if existing_job is not None else formatted_job
+
+async def save_job_for_user_async(user_id: str, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of save_job_for_user for FastAPI routes"""
+    formatted_job = _format_saved_job(job_data)
+    existing_job = await async_saved_jobs_service.add(formatted_job, user_id)
+    return existing_job if existing_job is not None else formatted_job
 
 def unsave_job_for_user(user_id: str, job_id: str) -> bool:
     """
@@ -85,31 +88,11 @@ def unsave_job_for_user(user_id: str, job_id: str) -> bool:
     Returns:
         True if the job was removed, False otherwise
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Get saved jobs
-    saved_jobs = user_state.get("agent_knowledge", {}).get("job_search", {}).get("saved_jobs", [])
-    
-    # Find the job index
-    job_index = None
-    for i, job in enumerate(saved_jobs):
-        if job.get("id") == job_id:
-            job_index = i
-            break
-    
-    # If job not found, return False
-    if job_index is None:
-        return False
-    
-    # Remove the job
-    saved_jobs.pop(job_index)
-    
-    # Update the user state
-    user_state["agent_knowledge"]["job_search"]["saved_jobs"] = saved_jobs
-    global_state.set_state(user_state, user_id)
-    
-    return True
+    return saved_jobs_service.remove(job_id, user_id)
+
+async def unsave_job_for_user_async(user_id: str, job_id: str) -> bool:
+    """Async variant of unsave_job_for_user for FastAPI routes"""
+    return await async_saved_jobs_service.remove(job_id, user_id)
 
 def get_saved_jobs_for_user(user_id: str) -> List[Dict[str, Any]]:
     """
@@ -121,13 +104,12 @@ def get_saved_jobs_for_user(user_id: str) -> List[Dict[str, Any]]:
     Returns:
         List of saved job data
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Get saved jobs
-    saved_jobs = user_state.get("agent_knowledge", {}).get("job_search", {}).get("saved_jobs", [])
-    
-    return saved_jobs
+    # Indexed query on the saved_jobs collection
+    return saved_jobs_service.list_jobs(user_id)
+
+async def get_saved_jobs_for_user_async(user_id: str) -> List[Dict[str, Any]]:
+    """Async variant of get_saved_jobs_for_user for FastAPI routes"""
+    return await async_saved_jobs_service.list_jobs(user_id)
 
 def add_search_history(user_id: str, query: str) -> Dict[str, Any]:
     """
@@ -140,11 +122,8 @@ def add_search_history(user_id: str, query: str) -> Dict[str, Any]:
     Returns:
         The search history entry
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Get search history
-    search_history = user_state.get("agent_knowledge", {}).get("job_search", {}).get("search_history", [])
+    # Get search history (projected read)
+    search_history = global_state.get_field("agent_knowledge.job_search.search_history", user_id, [])
     
     # Create a new search history entry
     search_entry = {
@@ -156,9 +135,8 @@ def add_search_history(user_id: str, query: str) -> Dict[str, Any]:
     # Add to search history
     search_history.append(search_entry)
     
-    # Update the user state
-    user_state["agent_knowledge"]["job_search"]["search_history"] = search_history
-    global_state.set_state(user_state, user_id)
+    # Update only this field of the user state
+    global_state.update_fields({"agent_knowledge.job_search.search_history": search_history}, user_id)
     
     return search_entry
 
@@ -199,11 +177,8 @@ def add_recent_search(user_id: str, search_params: Dict[str, Any]) -> Dict[str,
     Returns:
         The recent search entry
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Get recent searches
-    recent_searches = user_state.get("agent_knowledge", {}).get("job_search", {}).get("recent_searches", [])
+    # Get recent searches (projected read)
+    recent_searches = global_state.get_field("agent_knowledge.job_search.recent_searches", user_id, [])
     
     # Create a new recent search entry
     search_entry = {
@@ -219,9 +194,8 @@ def add_recent_search(user_id: str, search_params: Dict[str, Any]) -> Dict[str,
     if len(recent_searches) > 10:
         recent_searches = sorted(recent_searches, key=lambda x: x.get("timestamp", ""), reverse=True)[:10]
     
-    # Update the user state
-    user_state["agent_knowledge"]["job_search"]["recent_searches"] = recent_searches
-    global_state.set_state(user_state, user_id)
+    # Update only this field of the user state
+    global_state.update_fields({"agent_knowledge.job_search.recent_searches": recent_searches}, user_id)
     
     return search_entry
 
@@ -259,12 +233,25 @@ def is_job_saved(user_id: str, job_id: str) -> bool:
     Returns:
         True if the job is saved, False otherwise
     """
-    # Get saved jobs
-    saved_jobs = get_saved_jobs_for_user(user_id)
-    
-    # Check if job exists
-    for job in saved_jobs:
-        if job.get("id") == job_id:
-            return True
+    return saved_jobs_service.exists(job_id, user_id)
+
+async def is_job_saved_async(user_id: str, job_id: str) -> bool:
+    """Async variant of is_job_saved for FastAPI routes"""
+    return await async_saved_jobs_service.exists(job_id, user_id)
+
+def get_saved_job_ids(user_id: str, job_ids: List[str]) -> set:
+    """
+    Check which of several jobs are saved by a user, with a single query
     
-    return False
+    Args:
+        user_id: The user ID
+        job_ids: The job IDs to check
+        
+    Returns:
+        Set of the job IDs that are saved
+    """
+    return saved_jobs_service.saved_ids(job_ids, user_id)
+
+async def get_saved_job_ids_async(user_id: str, job_ids: List[str]) -> set:
+    """Async variant of get_saved_job_ids for FastAPI routes"""
+    return await async_saved_jobs_service.saved_ids(job_ids, user_id)
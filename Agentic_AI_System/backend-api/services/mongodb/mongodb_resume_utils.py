@@ -11,8 +11,10 @@ from datetime import datetime
 import uuid
 
 from services.mongodb.global_state_service import global_state
+from services.mongodb.async_global_state_service import async_global_state
 
-def save_parsed_resume(user_id: str, upload_id: str, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+def save_parsed_resume(user_id: str, upload_id: str, resume_data: Dict[str, Any],
+                       file_hash: Optional[str] = None) -> Dict[str, Any]:
     """
     Save a parsed resume to MongoDB
     
@@ -20,6 +22,7 @@ def save_parsed_resume(user_id: str, upload_id: str, resume_data: Dict[str, Any]
         user_id: The user ID
         upload_id: The upload ID of the resume
         resume_data: The parsed resume data
+        file_hash: Optional content hash of the uploaded file the data was parsed from
         
     Returns:
         The saved resume data
@@ -31,6 +34,7 @@ def save_parsed_resume(user_id: str, upload_id: str, resume_data: Dict[str, Any]
     formatted_resume = {
         "upload_id": upload_id,
         "parsed_data": resume_data,
+        "file_hash": file_hash,
         "created_at": datetime.now().isoformat(),
         "updated_at": datetime.now().isoformat()
     }
@@ -67,17 +71,30 @@ def get_parsed_resume(user_id: str, upload_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         The parsed resume data or None if not found
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Check if resume exists
-    if "agent_knowledge" in user_state and \
-       "resume" in user_state["agent_knowledge"] and \
-       "resumes" in user_state["agent_knowledge"]["resume"] and \
-       upload_id in user_state["agent_knowledge"]["resume"]["resumes"]:
-        return user_state["agent_knowledge"]["resume"]["resumes"][upload_id]
+    # Projected read of this resume only
+    return global_state.get_field(f"agent_knowledge.resume.resumes.{upload_id}", user_id)
+
+async def get_parsed_resume_async(user_id: str, upload_id: str) -> Optional[Dict[str, Any]]:
+    """Async variant of get_parsed_resume for FastAPI routes"""
+    return await async_global_state.get_field(f"agent_knowledge.resume.resumes.{upload_id}", user_id)
+
+def update_parsed_data(user_id: str, upload_id: str, parsed_data: Dict[str, Any], file_hash: str) -> None:
+    """
+    Store re-parsed data on an existing resume entry, keeping its feedback and job matches
     
-    return None
+    Args:
+        user_id: The user ID
+        upload_id: The upload ID of the resume
+        parsed_data: The parsed resume data
+        file_hash: Content hash of the file the data was parsed from
+    """
+    prefix = f"agent_knowledge.resume.resumes.{upload_id}"
+    global_state.update_fields({
+        f"{prefix}.upload_id": upload_id,
+        f"{prefix}.parsed_data": parsed_data,
+        f"{prefix}.file_hash": file_hash,
+        f"{prefix}.updated_at": datetime.now().isoformat()
+    }, user_id)
 
 def save_resume_feedback(user_id: str, upload_id: str, feedback_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -199,20 +216,21 @@ def get_job_matching_results(user_id: str, upload_id: str, job_id: Optional[str]
     Returns:
         Dictionary of job matching results
     """
-    # Get the user state
-    user_state = global_state.get_state(user_id)
-    
-    # Check if resume exists
-    if "agent_knowledge" not in user_state or \
-       "resume" not in user_state["agent_knowledge"] or \
-       "resumes" not in user_state["agent_knowledge"]["resume"] or \
-       upload_id not in user_state["agent_knowledge"]["resume"]["resumes"] or \
-       "job_matches" not in user_state["agent_knowledge"]["resume"]["resumes"][upload_id]:
+    # Projected read of the job matches of this resume only
+    job_matches = global_state.get_field(f"agent_knowledge.resume.resumes.{upload_id}.job_matches", user_id)
+    return _select_job_matches(job_matches, job_id)
+
+async def get_job_matching_results_async(user_id: str, upload_id: str, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of get_job_matching_results for FastAPI routes"""
+    job_matches = await async_global_state.get_field(f"agent_knowledge.resume.resumes.{upload_id}.job_matches", user_id)
+    return _select_job_matches(job_matches, job_id)
+
+def _select_job_matches(job_matches: Optional[Dict[str, Any]], job_id: Optional[str]) -> Dict[str, Any]:
+    """Return all job matches or only the one for job_id"""
+    if job_matches is None:
         return {}
     
     # Get all job matches or specific job match
-    job_matches = user_state["agent_knowledge"]["resume"]["resumes"][upload_id]["job_matches"]
-    
     if job_id:
         return {job_id: job_matches.get(job_id, {})}
     
@@ -232,7 +250,16 @@ def get_saved_jobs_for_matching(user_id: str) -> List[Dict[str, Any]]:
     
     # Get saved jobs
     saved_jobs = get_saved_jobs_for_user(user_id)
+    return _format_jobs_for_matching(saved_jobs)
+
+async def get_saved_jobs_for_matching_async(user_id: str) -> List[Dict[str, Any]]:
+    """Async variant of get_saved_jobs_for_matching for FastAPI routes"""
+    from services.mongodb.mongodb_pathfinder_utils import get_saved_jobs_for_user_async
     
+    return _format_jobs_for_matching(await get_saved_jobs_for_user_async(user_id))
+
+def _format_jobs_for_matching(saved_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Format saved jobs for job matching"""
     # Format jobs for matching
     formatted_jobs = []
     for job in saved_jobs:
@@ -0,0 +1,368 @@
+"""
+MongoDB-backed Saved Jobs Service for CareerMentor
+
+Saved jobs live in their own collection, one document per (user_id, id),
+instead of an ever-growing array inside the user's global_state document.
+Listing or checking a single job is an indexed query and never loads the
+rest of the user state.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional, List
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+
+from .client import mongo_client
+from .async_client import async_mongo_client
+from .global_state_service import SAVED_JOBS_PATH
+
+logger = logging.getLogger(__name__)
+
+# Fields stored only for indexing and never returned to callers
+_HIDDEN_FIELDS = {"_id": 0, "user_id": 0}
+
+
+def _updatable_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the key fields stable and reject operator/dotted names"""
+    return {
+        key: value for key, value in fields.items()
+        if key not in ("_id", "id", "user_id") and "." not in key and not key.startswith("$")
+    }
+
+
+def _job_ids(jobs: List[Dict[str, Any]]) -> List[Any]:
+    """IDs of the jobs that _upsert_operations writes"""
+    return [job["id"] for job in jobs if isinstance(job, dict) and job.get("id")]
+
+
+def _upsert_operations(jobs: List[Dict[str, Any]], user_id: str) -> List[UpdateOne]:
+    """Bulk upserts that set the job fields and keep the key fields stable"""
+    operations = []
+    for job in jobs:
+        if not (isinstance(job, dict) and job.get("id")):
+            continue
+        update = {"$setOnInsert": {"id": job["id"], "user_id": user_id}}
+        fields = _updatable_fields(job)
+        if fields:
+            update["$set"] = fields
+        operations.append(UpdateOne({"user_id": user_id, "id": job["id"]}, update, upsert=True))
+    return operations
+
+
+class SavedJobsService:
+    """
+    Saved jobs collection with compound indexes and a one-time migration
+    from global_state.agent_knowledge.job_search.saved_jobs
+    """
+
+    COLLECTION_NAME = "saved_jobs"
+
+    def __init__(self):
+        self.collection = mongo_client.get_collection(self.COLLECTION_NAME)
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def ensure_ready(self) -> None:
+        """Create the indexes and migrate legacy saved jobs once per process"""
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            self.collection.create_index([("user_id", ASCENDING), ("id", ASCENDING)], unique=True)
+            self.collection.create_index([("user_id", ASCENDING), ("status", ASCENDING), ("updated_at", DESCENDING)])
+            self.migrate_from_global_state()
+            self._ready = True
+
+    def add(self, job: Dict[str, Any], user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """
+        Save a job unless a job with the same id is already saved for the user
+
+        Args:
+            job: The formatted job (must contain "id")
+            user_id: The user ID to save the job for
+
+        Returns:
+            The already saved job, or None if the job was newly inserted
+        """
+        self.ensure_ready()
+        # Upsert with $setOnInsert leaves an existing job untouched; the unique
+        # index makes concurrent saves of the same job safe
+        return self.collection.find_one_and_update(
+            {"user_id": user_id, "id": job["id"]},
+            {"$setOnInsert": {**job, "user_id": user_id}},
+            upsert=True,
+            projection=_HIDDEN_FIELDS,
+            return_document=ReturnDocument.BEFORE
+        )
+
+    def remove(self, job_id: str, user_id: str = "default_user") -> bool:
+        """
+        Remove a saved job
+
+        Args:
+            job_id: The job ID to remove
+            user_id: The user ID to remove the job for
+
+        Returns:
+            True if the job was removed, False if it was not saved
+        """
+        self.ensure_ready()
+        return self.collection.delete_one({"user_id": user_id, "id": job_id}).deleted_count > 0
+
+    def update(self, job_id: str, fields: Dict[str, Any], user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """
+        Set fields of one saved job
+
+        Args:
+            job_id: The job ID to update
+            fields: Mapping of job field names to new values
+            user_id: The user ID to update the job for
+
+        Returns:
+            The updated job, or None if it is not saved
+        """
+        self.ensure_ready()
+        updates = _updatable_fields(fields)
+        if not updates:
+            return self.get(job_id, user_id)
+
+        return self.collection.find_one_and_update(
+            {"user_id": user_id, "id": job_id},
+            {"$set": updates},
+            projection=_HIDDEN_FIELDS,
+            return_document=ReturnDocument.AFTER
+        )
+
+    def upsert_many(self, jobs: List[Dict[str, Any]], user_id: str = "default_user") -> int:
+        """
+        Insert or update many saved jobs, e.g. the list synced from the client
+
+        Args:
+            jobs: Saved jobs (entries without "id" are skipped)
+            user_id: The user ID to save the jobs for
+
+        Returns:
+            Number of jobs written
+        """
+        self.ensure_ready()
+        operations = _upsert_operations(jobs, user_id)
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def replace_all(self, jobs: List[Dict[str, Any]], user_id: str = "default_user") -> int:
+        """
+        Make the saved jobs of a user exactly the given list
+
+        Jobs in the list are upserted, saved jobs missing from it are deleted.
+
+        Args:
+            jobs: The complete list of saved jobs (entries without "id" are skipped)
+            user_id: The user ID to replace the saved jobs of
+
+        Returns:
+            Number of jobs written
+        """
+        written = self.upsert_many(jobs, user_id)
+        self.collection.delete_many({"user_id": user_id, "id": {"$nin": _job_ids(jobs)}})
+        return written
+
+    def get(self, job_id: str, user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """
+        Get a single saved job
+
+        Args:
+            job_id: The job ID to look up
+            user_id: The user ID to look up the job for
+
+        Returns:
+            The saved job, or None if it is not saved
+        """
+        self.ensure_ready()
+        return self.collection.find_one({"user_id": user_id, "id": job_id}, _HIDDEN_FIELDS)
+
+    def exists(self, job_id: str, user_id: str = "default_user") -> bool:
+        """Check whether a job is saved, answered from the (user_id, id) index"""
+        self.ensure_ready()
+        return self.collection.find_one({"user_id": user_id, "id": job_id}, {"_id": 1}) is not None
+
+    def saved_ids(self, job_ids: List[str], user_id: str = "default_user") -> set:
+        """
+        Check many jobs at once
+
+        Args:
+            job_ids: Job IDs to check
+            user_id: The user ID to check the jobs for
+
+        Returns:
+            The subset of job_ids that are saved
+        """
+        self.ensure_ready()
+        if not job_ids:
+            return set()
+        cursor = self.collection.find({"user_id": user_id, "id": {"$in": list(job_ids)}}, {"_id": 0, "id": 1})
+        return {doc["id"] for doc in cursor}
+
+    def list_jobs(self, user_id: str = "default_user", status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List the saved jobs of a user
+
+        Args:
+            user_id: The user ID to list jobs for
+            status: Only return jobs with this status (newest update first)
+
+        Returns:
+            List of saved jobs, in the order they were saved unless filtered by status
+        """
+        self.ensure_ready()
+        if status is not None:
+            cursor = self.collection.find({"user_id": user_id, "status": status}, _HIDDEN_FIELDS).sort("updated_at", DESCENDING)
+        else:
+            cursor = self.collection.find({"user_id": user_id}, _HIDDEN_FIELDS).sort("_id", ASCENDING)
+        return list(cursor)
+
+    def migrate_from_global_state(self) -> int:
+        """
+        Move saved jobs from global_state documents into the collection
+
+        Idempotent: jobs that already exist are left untouched and migrated
+        entries are removed from the legacy array, so later runs find nothing to do.
+
+        Returns:
+            Number of jobs migrated
+        """
+        global_state_collection = mongo_client.get_collection("global_state")
+        legacy_docs = global_state_collection.find(
+            {f"{SAVED_JOBS_PATH}.0": {"$exists": True}},
+            {"user.id": 1, SAVED_JOBS_PATH: 1}
+        )
+
+        migrated = 0
+        for doc in legacy_docs:
+            user_id = doc.get("user", {}).get("id", "default_user")
+            saved_jobs = doc.get("agent_knowledge", {}).get("job_search", {}).get("saved_jobs", [])
+            # Very old documents stored plain job ids instead of job objects
+            operations = [
+                UpdateOne(
+                    {"user_id": user_id, "id": job["id"]},
+                    {"$setOnInsert": {**job, "user_id": user_id}},
+                    upsert=True
+                )
+                for job in saved_jobs if isinstance(job, dict) and job.get("id")
+            ]
+            if operations:
+                self.collection.bulk_write(operations, ordered=True)
+                logger.info(f"Migrated {len(operations)} saved jobs of user {user_id} to the {self.COLLECTION_NAME} collection")
+            # Keep only entries that could not be migrated
+            remaining = [job for job in saved_jobs if not (isinstance(job, dict) and job.get("id"))]
+            global_state_collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {SAVED_JOBS_PATH: remaining, "last_updated": time.time()}}
+            )
+            migrated += len(operations)
+
+        return migrated
+
+
+class AsyncSavedJobsService:
+    """
+    Async variant of SavedJobsService for FastAPI routes
+
+    Index creation and the legacy migration are one-time startup work and are
+    delegated to the sync service in a worker thread.
+    """
+
+    def __init__(self, sync_service: SavedJobsService):
+        self.collection = async_mongo_client.get_collection(SavedJobsService.COLLECTION_NAME)
+        self._sync_service = sync_service
+
+    async def ensure_ready(self) -> None:
+        """Create the indexes and migrate legacy saved jobs once per process"""
+        if not self._sync_service._ready:
+            await asyncio.to_thread(self._sync_service.ensure_ready)
+
+    async def add(self, job: Dict[str, Any], user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """
+        Save a job unless a job with the same id is already saved for the user
+
+        Returns:
+            The already saved job, or None if the job was newly inserted
+        """
+        await self.ensure_ready()
+        return await self.collection.find_one_and_update(
+            {"user_id": user_id, "id": job["id"]},
+            {"$setOnInsert": {**job, "user_id": user_id}},
+            upsert=True,
+            projection=_HIDDEN_FIELDS,
+            return_document=ReturnDocument.BEFORE
+        )
+
+    async def remove(self, job_id: str, user_id: str = "default_user") -> bool:
+        """Remove a saved job; returns False if it was not saved"""
+        await self.ensure_ready()
+        result = await self.collection.delete_one({"user_id": user_id, "id": job_id})
+        return result.deleted_count > 0
+
+    async def update(self, job_id: str, fields: Dict[str, Any], user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """Set fields of one saved job; returns the updated job or None if it is not saved"""
+        await self.ensure_ready()
+        updates = _updatable_fields(fields)
+        if not updates:
+            return await self.get(job_id, user_id)
+
+        return await self.collection.find_one_and_update(
+            {"user_id": user_id, "id": job_id},
+            {"$set": updates},
+            projection=_HIDDEN_FIELDS,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def upsert_many(self, jobs: List[Dict[str, Any]], user_id: str = "default_user") -> int:
+        """Insert or update many saved jobs; returns the number of jobs written"""
+        await self.ensure_ready()
+        operations = _upsert_operations(jobs, user_id)
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def replace_all(self, jobs: List[Dict[str, Any]], user_id: str = "default_user") -> int:
+        """Make the saved jobs of a user exactly the given list; returns the number of jobs written"""
+        written = await self.upsert_many(jobs, user_id)
+        await self.collection.delete_many({"user_id": user_id, "id": {"$nin": _job_ids(jobs)}})
+        return written
+
+    async def get(self, job_id: str, user_id: str = "default_user") -> Optional[Dict[str, Any]]:
+        """Get a single saved job, or None if it is not saved"""
+        await self.ensure_ready()
+        return await self.collection.find_one({"user_id": user_id, "id": job_id}, _HIDDEN_FIELDS)
+
+    async def exists(self, job_id: str, user_id: str = "default_user") -> bool:
+        """Check whether a job is saved"""
+        await self.ensure_ready()
+        return await self.collection.find_one({"user_id": user_id, "id": job_id}, {"_id": 1}) is not None
+
+    async def saved_ids(self, job_ids: List[str], user_id: str = "default_user") -> set:
+        """Return the subset of job_ids that are saved, with a single query"""
+        await self.ensure_ready()
+        if not job_ids:
+            return set()
+        cursor = self.collection.find({"user_id": user_id, "id": {"$in": list(job_ids)}}, {"_id": 0, "id": 1})
+        return {doc["id"] async for doc in cursor}
+
+    async def list_jobs(self, user_id: str = "default_user", status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List the saved jobs of a user (see SavedJobsService.list_jobs)"""
+        await self.ensure_ready()
+        if status is not None:
+            cursor = self.collection.find({"user_id": user_id, "status": status}, _HIDDEN_FIELDS).sort("updated_at", DESCENDING)
+        else:
+            cursor = self.collection.find({"user_id": user_id}, _HIDDEN_FIELDS).sort("_id", ASCENDING)
+        return await cursor.to_list()
+
+
+# Create singleton instances
+saved_jobs_service = SavedJobsService()
+async_saved_jobs_service = AsyncSavedJobsService(saved_jobs_service)
@@ -4,8 +4,10 @@ MongoDB Sync Service for CareerMentor
 This service provides endpoints for syncing the global state between the frontend and backend.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .global_state_service import global_state
+from .async_global_state_service import async_global_state
+from .saved_jobs_service import saved_jobs_service, async_saved_jobs_service
 import json
 from datetime import datetime
 
@@ -33,59 +35,24 @@ class SyncService:
             # Get the current backend state
             backend_state = global_state.get_state(user_id)
             
-            # Convert frontend camelCase to backend snake_case
-            converted_state = SyncService._convert_to_snake_case(frontend_state)
-            
-            # Check if the frontend state is newer than the backend state
-            frontend_last_updated = converted_state.get("last_updated")
-            backend_last_updated = backend_state.get("last_updated")
-            
-            # If frontend state is newer or no backend timestamp, update backend
-            if not backend_last_updated or (frontend_last_updated and frontend_last_updated > backend_last_updated):
-                # Update user data
-                if "user" in converted_state:
-                    if "id" in converted_state["user"]:
-                        global_state.set_user_id(converted_state["user"]["id"])
-                    
-                    if "preferences" in converted_state["user"]:
-                        backend_state["user"]["preferences"] = converted_state["user"]["preferences"]
-                
-                # Update agent knowledge
-                if "agent_knowledge" in converted_state:
-                    agent_knowledge = converted_state["agent_knowledge"]
-                    
-                    # Update user profile
-                    if "user_profile" in agent_knowledge:
-                        global_state.update_user_profile(lambda _: agent_knowledge["user_profile"], user_id)
-                    
-                    # Update interview data
-                    if "interview" in agent_knowledge:
-                        interview_data = agent_knowledge["interview"]
-                        global_state.update_interview_data(lambda _: interview_data, user_id)
-                    
-                    # Update resume data
-                    if "resume" in agent_knowledge:
-                        resume_data = agent_knowledge["resume"]
-                        backend_state["agent_knowledge"]["resume"] = resume_data
-                    
-                    # Update job search data
-                    if "job_search" in agent_knowledge:
-                        job_search_data = agent_knowledge["job_search"]
-                        global_state.update_job_search_data(lambda _: job_search_data, user_id)
-                    
-                    # Update applications
-                    if "applications" in agent_knowledge:
-                        applications = agent_knowledge["applications"]
-                        backend_state["agent_knowledge"]["applications"] = applications
-            
-                # Save the updated state
+            merged, saved_jobs = SyncService._merge_frontend_state(backend_state, frontend_state)
+            if merged:
+                if saved_jobs is not None:
+                    # Saved jobs live in their own collection; the synced list
+                    # replaces the stored one. This also migrates legacy saved
+                    # jobs before job_search is replaced below
+                    saved_jobs_service.replace_all(saved_jobs, user_id)
+                # Save the updated state; within a unit of work only the
+                # changed paths are written, once, at the end of the request
                 global_state.set_state(backend_state, user_id)
             
             # Return the updated backend state (converted to camelCase)
             return {
                 "success": True,
                 "message": "Sync successful",
-                "state": SyncService._convert_to_camel_case(global_state.get_state(user_id))
+                "state": SyncService._convert_to_camel_case(
+                    SyncService._with_saved_jobs(backend_state, saved_jobs_service.list_jobs(user_id))
+                )
             }
             
         except Exception as e:
@@ -94,6 +61,90 @@ class SyncService:
                 "message": f"Sync failed: {str(e)}"
             }
     
+    @staticmethod
+    async def sync_from_frontend_async(frontend_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of sync_from_frontend for FastAPI routes"""
+        try:
+            user_id = frontend_state.get("user", {}).get("id", "default_user")
+            backend_state = await async_global_state.get_state(user_id)
+            
+            merged, saved_jobs = SyncService._merge_frontend_state(backend_state, frontend_state)
+            if merged:
+                if saved_jobs is not None:
+                    await async_saved_jobs_service.replace_all(saved_jobs, user_id)
+                await async_global_state.set_state(backend_state, user_id)
+            
+            return {
+                "success": True,
+                "message": "Sync successful",
+                "state": SyncService._convert_to_camel_case(
+                    SyncService._with_saved_jobs(backend_state, await async_saved_jobs_service.list_jobs(user_id))
+                )
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Sync failed: {str(e)}"
+            }
+    
+    @staticmethod
+    def _merge_frontend_state(backend_state: Dict[str, Any], frontend_state: Dict[str, Any]) -> Tuple[bool, Optional[List[Dict[str, Any]]]]:
+        """
+        Copy the synced sections of the frontend state into the backend state
+        
+        Saved jobs are not copied, since they live in the saved_jobs collection;
+        they are returned for the caller to replace the stored list with. Like
+        the other job_search fields, they are only synced if the frontend state
+        has a job_search section.
+        
+        Args:
+            backend_state: The current backend state (modified in place)
+            frontend_state: The state from the frontend
+            
+        Returns:
+            Tuple of (True if the frontend state was newer and has been merged,
+            the saved jobs of the frontend state or None if it has no job_search)
+        """
+        # Convert frontend camelCase to backend snake_case
+        converted_state = SyncService._convert_to_snake_case(frontend_state)
+        
+        # Check if the frontend state is newer than the backend state
+        frontend_last_updated = converted_state.get("last_updated")
+        backend_last_updated = backend_state.get("last_updated")
+        
+        # If frontend state is newer or no backend timestamp, update backend
+        if backend_last_updated and not (frontend_last_updated and frontend_last_updated > backend_last_updated):
+            return False, None
+        
+        # Update user data
+        if "user" in converted_state and "preferences" in converted_state["user"]:
+            backend_state.setdefault("user", {})["preferences"] = converted_state["user"]["preferences"]
+        
+        # Update agent knowledge (user_profile, interview, resume, job_search, applications)
+        saved_jobs = None
+        if "agent_knowledge" in converted_state:
+            agent_knowledge = converted_state["agent_knowledge"]
+            backend_knowledge = backend_state.setdefault("agent_knowledge", {})
+            if isinstance(agent_knowledge.get("job_search"), dict):
+                saved_jobs = agent_knowledge["job_search"].pop("saved_jobs", None) or []
+            for section in ("user_profile", "interview", "resume", "job_search", "applications"):
+                if section in agent_knowledge:
+                    backend_knowledge[section] = agent_knowledge[section]
+        return True, saved_jobs
+    
+    @staticmethod
+    def _with_saved_jobs(state: Dict[str, Any], saved_jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Copy of the state with the saved jobs from the collection filled back in
+        
+        The state itself is not modified, so the unit of work does not write
+        the saved jobs back into global_state.
+        """
+        agent_knowledge = state.get("agent_knowledge", {})
+        job_search = {**agent_knowledge.get("job_search", {}), "saved_jobs": saved_jobs}
+        return {**state, "agent_knowledge": {**agent_knowledge, "job_search": job_search}}
+    
     @staticmethod
     def get_backend_state(user_id: str = "default_user") -> Dict[str, Any]:
         """
@@ -104,9 +155,26 @@ class SyncService:
         """
         try:
             state = global_state.get_state(user_id)
+            saved_jobs = saved_jobs_service.list_jobs(user_id)
+            return {
+                "success": True,
+                "state": SyncService._convert_to_camel_case(SyncService._with_saved_jobs(state, saved_jobs))
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to get state: {str(e)}"
+            }
+    
+    @staticmethod
+    async def get_backend_state_async(user_id: str = "default_user") -> Dict[str, Any]:
+        """Async variant of get_backend_state for FastAPI routes"""
+        try:
+            state = await async_global_state.get_state(user_id)
+            saved_jobs = await async_saved_jobs_service.list_jobs(user_id)
             return {
                 "success": True,
-                "state": SyncService._convert_to_camel_case(state)
+                "state": SyncService._convert_to_camel_case(SyncService._with_saved_jobs(state, saved_jobs))
             }
         except Exception as e:
             return {
@@ -132,17 +200,7 @@ class SyncService:
             state = global_state.get_state(user_id)
             
             # Update the knowledge item
-            parts = key.split('.')
-            current = state
-            
-            # Navigate to the nested object
-            for i, part in enumerate(parts[:-1]):
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-            
-            # Set the value
-            current[parts[-1]] = value
+            SyncService._set_nested(state, key, value)
             
             # Save the updated state
             global_state.set_state(state, user_id)
@@ -157,6 +215,39 @@ class SyncService:
                 "message": f"Failed to update knowledge item: {str(e)}"
             }
     
+    @staticmethod
+    async def update_knowledge_async(key: str, value: Any, user_id: str = "default_user") -> Dict[str, Any]:
+        """Async variant of update_knowledge for FastAPI routes"""
+        try:
+            state = await async_global_state.get_state(user_id)
+            SyncService._set_nested(state, key, value)
+            await async_global_state.set_state(state, user_id)
+            
+            return {
+                "success": True,
+                "message": f"Knowledge item {key} updated successfully"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to update knowledge item: {str(e)}"
+            }
+    
+    @staticmethod
+    def _set_nested(state: Dict[str, Any], key: str, value: Any) -> None:
+        """Set a dotted key in a nested dict, creating missing levels"""
+        parts = key.split('.')
+        current = state
+        
+        # Navigate to the nested object
+        for part in parts[:-1]:
+            if part not in current:
+                current[part] = {}
+            current = current[part]
+        
+        # Set the value
+        current[parts[-1]] = value
+    
     @staticmethod
     def _convert_to_snake_case(obj: Any) -> Any:
         """
@@ -0,0 +1,207 @@
+"""
+Shared OCR service backed by a pool of EasyOCR worker processes.
+
+OCR is CPU bound and holds the GIL for long stretches, so it runs in dedicated
+worker processes instead of inside the API process. Each worker lazily builds
+one EasyOCR reader and keeps it warm for later jobs. At most OCR_WORKERS jobs
+run and OCR_QUEUE_SIZE more may wait; beyond that new jobs are rejected with
+OCRBusyError so the API can answer 503 instead of piling up work.
+
+Only the file path goes to the worker and only plain Python results come back
+(strings, or bounding boxes as float lists), so no image data is copied
+between processes.
+"""
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class OCRBusyError(Exception):
+    """Raised when the OCR queue is full and a job cannot be accepted"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Reader of the current worker process, created on its first job
+_worker_reader = None
+_worker_config: Dict[str, Any] = {}
+
+
+def _init_worker(languages: List[str], gpu: bool) -> None:
+    """Store the reader configuration in a freshly started worker process"""
+    _worker_config["languages"] = languages
+    _worker_config["gpu"] = gpu
+
+
+def _run_readtext(image_path: str, kwargs: Dict[str, Any]):
+    """
+    Run OCR inside a worker process
+
+    Returns:
+        Tuple of (compact result, start time, end time)
+    """
+    global _worker_reader
+    started_at = time.time()
+    if _worker_reader is None:
+        import easyocr
+        _worker_reader = easyocr.Reader(_worker_config["languages"], gpu=_worker_config["gpu"])
+
+    result = _worker_reader.readtext(image_path, **kwargs)
+    if kwargs.get("detail", 1) != 0:
+        # Replace numpy types with plain Python values to keep the pickle small
+        result = [
+            ([[float(x), float(y)] for x, y in bbox], text, float(confidence))
+            for bbox, text, confidence in result
+        ]
+    return result, started_at, time.time()
+
+
+class OCRService:
+    """
+    Bounded pool of OCR worker processes with queue and latency metrics
+    """
+
+    def __init__(self, workers: int = None, queue_size: int = None, languages: List[str] = None,
+                 gpu: bool = None, timeout: float = None):
+        """
+        Initialize the service. Worker processes are started on the first OCR call.
+
+        Args:
+            workers: Number of worker processes (OCR_WORKERS)
+            queue_size: Jobs allowed to wait for a free worker (OCR_QUEUE_SIZE)
+            languages: EasyOCR language codes (OCR_LANGUAGES, comma separated)
+            gpu: Run readers on the GPU (OCR_GPU)
+            timeout: Seconds to wait for a single OCR job (OCR_TIMEOUT)
+        """
+        self.workers = max(1, workers if workers is not None else int(os.getenv("OCR_WORKERS", "2")))
+        self.queue_size = max(0, queue_size if queue_size is not None else int(os.getenv("OCR_QUEUE_SIZE", "8")))
+        self.languages = languages or [lang.strip() for lang in os.getenv("OCR_LANGUAGES", "en").split(",")]
+        self.gpu = gpu if gpu is not None else os.getenv("OCR_GPU", "false").lower() == "true"
+        self.timeout = timeout if timeout is not None else float(os.getenv("OCR_TIMEOUT", "180"))
+
+        self._executor = None
+        self._lock = threading.Lock()
+        # One slot per running or waiting job
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._in_flight = 0
+        self._counters = {"requests": 0, "rejected": 0, "errors": 0, "timeouts": 0}
+        # Recent (wait, run) durations for latency metrics
+        self._latencies = deque(maxlen=200)
+
+    def readtext(self, image_path: str, **kwargs) -> List[Any]:
+        """
+        Run EasyOCR readtext in a worker process
+
+        Args:
+            image_path: Path of the image file
+            **kwargs: Passed through to Reader.readtext (e.g. detail=0)
+
+        Returns:
+            The EasyOCR result list
+
+        Raises:
+            OCRBusyError: If all workers are busy and the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters["rejected"] += 1
+            raise OCRBusyError("OCR queue is full, please retry later", retry_after=self._retry_after())
+
+        queued_at = time.time()
+        with self._lock:
+            self._in_flight += 1
+            self._counters["requests"] += 1
+        release_now = True
+        try:
+            future = self._get_executor().submit(_run_readtext, image_path, kwargs)
+            result, started_at, finished_at = future.result(timeout=self.timeout)
+            with self._lock:
+                self._latencies.append((started_at - queued_at, finished_at - started_at))
+            return result
+        except TimeoutError:
+            with self._lock:
+                self._counters["timeouts"] += 1
+            # The job keeps a worker busy until it finishes, so it keeps its slot until then
+            release_now = False
+            future.add_done_callback(lambda _: self._release_slot())
+            raise
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            with self._lock:
+                self._counters["errors"] += 1
+                self._executor = None
+            raise
+        except Exception:
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            if release_now:
+                self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Give back the queue slot of a finished job"""
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return worker count, queue depth and latency metrics"""
+        with self._lock:
+            waits = sorted(wait for wait, _ in self._latencies)
+            runs = sorted(run for _, run in self._latencies)
+            return {
+                **self._counters,
+                "workers": self.workers,
+                "workers_started": self._executor is not None,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p95_wait_seconds": round(waits[int(len(waits) * 0.95) - 1], 3) if waits else 0.0,
+                "avg_ocr_seconds": round(sum(runs) / len(runs), 3) if runs else 0.0,
+                "p95_ocr_seconds": round(runs[int(len(runs) * 0.95) - 1], 3) if runs else 0.0
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                # spawn, so workers don't inherit the API process (threads, open sockets)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.languages, self.gpu)
+                )
+                logger.info(f"Started OCR worker pool with {self.workers} processes")
+            return self._executor
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up"""
+        with self._lock:
+            runs = [run for _, run in self._latencies]
+        average = sum(runs) / len(runs) if runs else 10.0
+        return max(1, int(average * (self.queue_size + self.workers) / self.workers))
+
+
+# Create a singleton instance
+ocr_service = OCRService()
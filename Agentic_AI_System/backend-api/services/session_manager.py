@@ -1,36 +1,266 @@
-"""Add commentMore actions
+"""
 Session management module for maintaining conversation context.
+
+Sessions live in a pluggable store selected with SESSION_STORE:
+- "memory" (default): per-process store; sessions are kept in access order,
+  so expired ones are evicted from the front in amortized O(1).
+- "mongo": shared "sessions" collection with a TTL index, for several uvicorn
+  workers or sessions that survive a restart.
 """
+from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import os
 import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Session expiration time (in seconds, sliding on every access)
+SESSION_EXPIRY = int(os.getenv("SESSION_EXPIRY", "3600"))  # 1 hour
+
+
+def _new_session(now: float) -> Dict[str, Any]:
+    return {
+        "created_at": now,
+        "last_accessed": now,
+        "conversation_history": [],
+        "metadata": {}
+    }
+
+
+class SessionStore(ABC):
+    """
+    Interface of a session store
+
+    Every operation refreshes the session's expiry and creates the session if
+    it does not exist yet.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Dict[str, Any]:
+        """Get a session"""
+
+    @abstractmethod
+    def save_history(self, session_id: str, history: List[Dict[str, str]]) -> None:
+        """Replace the conversation history of a session"""
+
+    @abstractmethod
+    def append_message(self, session_id: str, message: Dict[str, str]) -> None:
+        """Append one message to the conversation history"""
+
+    @abstractmethod
+    def set_metadata(self, session_id: str, key: str, value: Any) -> None:
+        """Store one metadata value"""
 
-# In-memory storage for session data
-# In a production environment, consider using Redis or a database
-sessions: Dict[str, Dict[str, Any]] = {}
+    @abstractmethod
+    def cleanup(self) -> int:
+        """Remove expired sessions and return how many were removed"""
 
-# Session expiration time (in seconds)
-SESSION_EXPIRY = 3600  # 1 hour
+
+class InMemorySessionStore(SessionStore):
+    """
+    Per-process session store
+
+    Sessions are kept in an OrderedDict in order of last access. Expired
+    sessions are therefore always at the front and are evicted in amortized
+    O(1) per operation, instead of scanning all sessions on every access.
+    """
+
+    def __init__(self, expiry: int = SESSION_EXPIRY):
+        self.expiry = expiry
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._touch(session_id)
+
+    def save_history(self, session_id: str, history: List[Dict[str, str]]) -> None:
+        with self._lock:
+            self._touch(session_id)["conversation_history"] = history
+
+    def append_message(self, session_id: str, message: Dict[str, str]) -> None:
+        with self._lock:
+            self._touch(session_id)["conversation_history"].append(message)
+
+    def set_metadata(self, session_id: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._touch(session_id).setdefault("metadata", {})[key] = value
+
+    def cleanup(self) -> int:
+        with self._lock:
+            return self._evict_expired(time.time())
+
+    def _touch(self, session_id: str) -> Dict[str, Any]:
+        """Get or create a session and move it to the end of the access order (lock held)"""
+        now = time.time()
+        self._evict_expired(now)
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = _new_session(now)
+        else:
+            session["last_accessed"] = now
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def _evict_expired(self, now: float) -> int:
+        """Pop expired sessions from the front of the access order (lock held)"""
+        removed = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session["last_accessed"] <= self.expiry:
+                break
+            self.sessions.popitem(last=False)
+            removed += 1
+        return removed
+
+
+class MongoSessionStore(SessionStore):
+    """
+    Session store shared by all workers, backed by a MongoDB collection
+
+    MongoDB removes documents once expires_at has passed (TTL index). Every
+    operation is a single atomic upsert that also slides the expiry.
+    """
+
+    COLLECTION_NAME = "sessions"
+
+    def __init__(self, expiry: int = SESSION_EXPIRY):
+        self.expiry = expiry
+        self._collection = None
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        from pymongo import ReturnDocument
+        now = time.time()
+        doc = self._get_collection().find_one_and_update(
+            {"_id": session_id},
+            self._touch_update(now),
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        if doc is None:
+            # Newly inserted
+            return _new_session(now)
+        # The TTL monitor only runs periodically, so check expiry ourselves
+        if now - doc.get("last_accessed", now) > self.expiry:
+            session = _new_session(now)
+            self._get_collection().replace_one(
+                {"_id": session_id},
+                {**session, "expires_at": self._expires_at()}
+            )
+            return session
+        session = self._to_session(doc)
+        session["last_accessed"] = now
+        return session
+
+    def save_history(self, session_id: str, history: List[Dict[str, str]]) -> None:
+        self._update(session_id, {"$set": {"conversation_history": history}}, "conversation_history")
+
+    def append_message(self, session_id: str, message: Dict[str, str]) -> None:
+        self._update(session_id, {"$push": {"conversation_history": message}}, "conversation_history")
+
+    def set_metadata(self, session_id: str, key: str, value: Any) -> None:
+        self._update(session_id, {"$set": {f"metadata.{key}": value}}, "metadata")
+
+    def cleanup(self) -> int:
+        # Expired sessions are removed by the TTL index
+        return 0
+
+    def _update(self, session_id: str, update: Dict[str, Any], field: str) -> None:
+        """
+        Apply an update and slide the expiry in one upsert
+
+        A session that has expired but was not yet removed by the TTL monitor
+        is reset first, so like in the in-memory store the update starts a
+        fresh session instead of reviving the old history.
+
+        Args:
+            session_id: The session to update
+            update: Update operators that touch one top-level field
+            field: That field (it must not be initialized by $setOnInsert as well)
+        """
+        from pymongo.errors import DuplicateKeyError
+        now = time.time()
+        for operator, fields in self._touch_update(now, exclude=field).items():
+            update.setdefault(operator, {}).update(fields)
+        collection = self._get_collection()
+        result = collection.update_one({"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}}, update)
+        if result.matched_count:
+            return
+        try:
+            # Only replaces an expired session; a missing one is inserted
+            collection.replace_one(
+                {"_id": session_id, "expires_at": {"$lte": datetime.utcnow()}},
+                {**_new_session(now), "expires_at": self._expires_at()},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Another request has just created or refreshed the session
+            pass
+        collection.update_one({"_id": session_id}, update, upsert=True)
+
+    def _touch_update(self, now: float, exclude: Optional[str] = None) -> Dict[str, Any]:
+        """Update document that refreshes the expiry and initializes new sessions"""
+        on_insert = {key: value for key, value in _new_session(now).items() if key not in ("last_accessed", exclude)}
+        return {
+            "$set": {"last_accessed": now, "expires_at": self._expires_at()},
+            "$setOnInsert": on_insert
+        }
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.expiry)
+
+    def _to_session(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "created_at": doc.get("created_at"),
+            "last_accessed": doc.get("last_accessed"),
+            "conversation_history": doc.get("conversation_history", []),
+            "metadata": doc.get("metadata", {})
+        }
+
+    def _get_collection(self):
+        """Lazily resolve the MongoDB collection and its TTL index"""
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    from services.mongodb.client import mongo_client
+                    collection = mongo_client.get_collection(self.COLLECTION_NAME)
+                    collection.create_index("expires_at", expireAfterSeconds=0)
+                    self._collection = collection
+        return self._collection
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    """
+    Create the session store configured by SESSION_STORE
+
+    Args:
+        backend: "memory" or "mongo" (defaults to SESSION_STORE)
+
+    Returns:
+        The session store
+    """
+    backend = (backend or os.getenv("SESSION_STORE", "memory")).lower()
+    if backend == "mongo":
+        return MongoSessionStore()
+    if backend != "memory":
+        logger.warning(f"Unknown SESSION_STORE '{backend}', using the in-memory store")
+    return InMemorySessionStore()
+
+
+# Shared session store of this process
+session_store = create_session_store()
 
 
 def get_session(session_id: str) -> Dict[str, Any]:
     """
     Retrieve a session by ID or create a new one if it doesn't exist.
     """
-    # Clean up expired sessions periodically
-    cleanup_expired_sessions()
-    
-    if session_id not in sessions:
-        sessions[session_id] = {
-            "created_at": time.time(),
-            "last_accessed": time.time(),
-            "conversation_history": [],
-            "metadata": {}
-        }
-    else:
-        # Update last accessed time
-        sessions[session_id]["last_accessed"] = time.time()
-        
-    return sessions[session_id]
+    return session_store.get(session_id)
 
 
 def get_conversation_history(session_id: str) -> List[Dict[str, str]]:
@@ -45,29 +275,21 @@ def save_conversation_history(session_id: str, history: List[Dict[str, str]]) ->
     """
     Save conversation history for a specific session.
     """
-    session = get_session(session_id)
-    session["conversation_history"] = history
-    session["last_accessed"] = time.time()
+    session_store.save_history(session_id, history)
 
 
 def add_message_to_history(session_id: str, role: str, content: str) -> None:
     """
     Add a message to the conversation history.
     """
-    history = get_conversation_history(session_id)
-    history.append({"role": role, "content": content})
-    save_conversation_history(session_id, history)
+    session_store.append_message(session_id, {"role": role, "content": content})
 
 
 def set_session_metadata(session_id: str, key: str, value: Any) -> None:
     """
     Store metadata in the session.
     """
-    session = get_session(session_id)
-    if "metadata" not in session:
-        session["metadata"] = {}
-    session["metadata"][key] = value
-    session["last_accessed"] = time.time()
+    session_store.set_metadata(session_id, key, value)
 
 
 def get_session_metadata(session_id: str, key: str = None, default: Any = None) -> Any:
@@ -85,11 +307,4 @@ def cleanup_expired_sessions() -> None:
     """
     Remove expired sessions to prevent memory leaks.
     """
-    current_time = time.time()
-    expired_sessions = [
-        session_id for session_id, session in sessions.items()
-        if current_time - session["last_accessed"] > SESSION_EXPIRY
-    ]
-    
-    for session_id in expired_sessions:
-        del sessions[session_id]
\ No newline at end of file
+    session_store.cleanup()